@@ -0,0 +1,83 @@
+"""
+Compare la lecture de 'planes.html' par pd.read_html (arbre HTML complet puis conversion au schéma) et
+par le lecteur en continu de data_loader (_lire_table_html), sur des flottes synthétiques de tailles
+croissantes. Chaque mesure tourne dans un processus séparé pour isoler son pic de mémoire ; les deux
+lecteurs doivent rendre le même DataFrame (valeurs, types et index). Sur les plus grands fichiers, read_html
+échoue (limite de l'évaluation XPath de lxml, ou mémoire épuisée) : seul le lecteur en continu est alors mesuré.
+
+Usage : python -m benchmarks.bench_avions [nb_avions ...]
+"""
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+from benchmarks.donnees_synthetiques import ecrire_avions_html
+from src.data_loader import _lire_table_html
+from src.schemas import SCHEMA_AVIONS, appliquer_schema
+
+LECTEURS = {
+    'read_html': lambda fichier: appliquer_schema(pd.read_html(fichier, index_col=0)[0], SCHEMA_AVIONS),
+    'continu': lambda fichier: _lire_table_html(fichier, SCHEMA_AVIONS),
+}
+
+
+def _memoire_ko(cle):
+    with open('/proc/self/status') as f:
+        return int(next(ligne for ligne in f if ligne.startswith(cle)).split()[1])
+
+
+def mesurer(lecteur, fichier):
+    """Exécuté dans le processus fils : temps, hausse du pic de mémoire (VmHWM remis à zéro) et empreinte du résultat."""
+    with open('/proc/self/clear_refs', 'w') as f:
+        f.write('5')  # remet VmHWM au niveau de la mémoire actuelle
+    avant = _memoire_ko('VmRSS')
+    debut = time.perf_counter()
+    try:
+        df = LECTEURS[lecteur](fichier)
+    except Exception as erreur:  # read_html abandonne sur les très grands tableaux (XPathEvalError de lxml)
+        print(f"échec {type(erreur).__name__}")
+        return
+    duree = time.perf_counter() - debut
+    print(f"{duree} {(_memoire_ko('VmHWM') - avant) / 1e3}")
+    empreinte = int(pd.util.hash_pandas_object(df).sum())
+    print(f"{len(df)} {empreinte} {type(df.index).__name__} {dict(df.dtypes.astype(str))}")
+
+
+def main(tailles=(100_000, 300_000, 1_000_000, 2_000_000)):
+    dossier = tempfile.mkdtemp(prefix='bench_avions_')
+    try:
+        print(f"{'avions':>12}{'fichier (Mo)':>14}{'lecteur':>12}{'durée (s)':>11}{'pic mémoire (Mo)':>18}")
+        for nb_avions in tailles:
+            fichier = os.path.join(dossier, 'planes.html')
+            ecrire_avions_html(fichier, nb_avions)
+            taille_mo = os.path.getsize(fichier) / 1e6
+            resultats = {}
+            for lecteur in LECTEURS:
+                processus = subprocess.run([sys.executable, '-m', 'benchmarks.bench_avions', '--mesurer', lecteur,
+                                            fichier], capture_output=True, text=True)
+                sortie = processus.stdout.splitlines()
+                if processus.returncode != 0:  # tué faute de mémoire, par exemple
+                    sortie = [f"échec code {processus.returncode}"]
+                if sortie[-1].startswith('échec'):
+                    print(f"{nb_avions:>12}{taille_mo:>14.0f}{lecteur:>12}  {sortie[-1]}")
+                    continue
+                duree, pic = map(float, sortie[-2].split())
+                resultats[lecteur] = sortie[-1]
+                print(f"{nb_avions:>12}{taille_mo:>14.0f}{lecteur:>12}{duree:>11.2f}{pic:>18.0f}")
+            assert 'continu' in resultats, "le lecteur en continu a échoué"
+            if 'read_html' in resultats:
+                assert resultats['read_html'] == resultats['continu'], "les deux lecteurs ne rendent pas le même DataFrame"
+    finally:
+        shutil.rmtree(dossier, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    if sys.argv[1:2] == ['--mesurer']:
+        mesurer(sys.argv[2], sys.argv[3])
+    else:
+        main([int(n) for n in sys.argv[1:]] or (100_000, 300_000, 1_000_000, 2_000_000))
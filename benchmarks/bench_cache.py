@@ -0,0 +1,64 @@
+"""
+Compare le chargement à froid (analyse des fichiers sources) et à chaud (instantané Parquet)
+des fonctions charger_*.
+
+Usage : python -m benchmarks.bench_cache [nb_vols]
+"""
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+from benchmarks.donnees_synthetiques import generer_vols_depuis_referentiels
+from src.data_loader import (NOM_DOSSIER_CACHE, charger_aeroports, charger_avions,
+                             charger_compagnies, charger_vols)
+
+
+def _chronometrer(fonction, fichier):
+    debut = time.perf_counter()
+    fonction(fichier)
+    return time.perf_counter() - debut
+
+
+def main(nb_vols=336_776):
+    dossier = tempfile.mkdtemp(prefix='bench_cache_')
+    try:
+        for nom in ('airports.csv', 'airlines.json', 'planes.html'):
+            shutil.copy(os.path.join('data', nom), dossier)
+
+        df_vols = generer_vols_depuis_referentiels(
+            nb_vols,
+            charger_aeroports(os.path.join(dossier, 'airports.csv'), utiliser_cache=False),
+            charger_compagnies(os.path.join(dossier, 'airlines.json'), utiliser_cache=False),
+            charger_avions(os.path.join(dossier, 'planes.html'), utiliser_cache=False),
+        )
+        df_vols.to_csv(os.path.join(dossier, 'flights.csv'), index=False, encoding='latin1')
+
+        chargeurs = [
+            (charger_aeroports, 'airports.csv'),
+            (charger_vols, 'flights.csv'),
+            (charger_compagnies, 'airlines.json'),
+            (charger_avions, 'planes.html'),
+        ]
+        resultats = []
+        for fonction, nom in chargeurs:
+            fichier = os.path.join(dossier, nom)
+            shutil.rmtree(os.path.join(dossier, NOM_DOSSIER_CACHE), ignore_errors=True)
+            froid = _chronometrer(fonction, fichier)
+            chaud = _chronometrer(fonction, fichier)
+            resultats.append((nom, froid, chaud))
+
+        print("\n--- Chargement à froid vs à chaud ---")
+        print(f"{'fichier':<15}{'froid (s)':>12}{'chaud (s)':>12}{'gain':>8}")
+        for nom, froid, chaud in resultats:
+            print(f"{nom:<15}{froid:>12.3f}{chaud:>12.3f}{froid / chaud:>7.1f}x")
+        total_froid = sum(r[1] for r in resultats)
+        total_chaud = sum(r[2] for r in resultats)
+        print(f"{'total':<15}{total_froid:>12.3f}{total_chaud:>12.3f}{total_froid / total_chaud:>7.1f}x")
+    finally:
+        shutil.rmtree(dossier, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 336_776)
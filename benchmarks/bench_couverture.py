@@ -0,0 +1,84 @@
+"""
+Compare les boucles par compagnie d'origine de couverture_compagnies / destinations_exclusives
+avec la matrice d'incidence construite en une passe par incidence_compagnies.
+
+Usage : python -m benchmarks.bench_couverture [nb_vols]
+"""
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from src.contexte import incidence_compagnies
+
+
+def generer_codes(nb_vols, nb_compagnies, nb_aeroports, graine=0):
+    """Table de vols réduite aux colonnes carrier / origin / dest, en catégoriels comme après charger_vols."""
+    rng = np.random.default_rng(graine)
+    compagnies = np.array([f'C{i:04d}' for i in range(nb_compagnies)])
+    aeroports = np.array([f'A{i:04d}' for i in range(nb_aeroports)])
+    poids = 1.0 / np.arange(1, nb_aeroports + 1)
+    poids /= poids.sum()
+    return pd.DataFrame({
+        'carrier': pd.Categorical.from_codes(rng.integers(0, nb_compagnies, nb_vols), compagnies),
+        'origin': pd.Categorical.from_codes(rng.integers(0, min(3, nb_aeroports), nb_vols), aeroports),
+        'dest': pd.Categorical.from_codes(rng.choice(nb_aeroports, nb_vols, p=poids), aeroports),
+    })
+
+
+def boucles_par_compagnie(df_vols):
+    """Reprise des anciens calculs de Q6 et Q7 : deux boucles qui filtrent toute la table pour chaque compagnie."""
+    tous_aeroports_origine = set(df_vols['origin'].unique())
+    toutes_destinations = set(df_vols['dest'].unique())
+    couverture = {}
+    for carrier in df_vols['carrier'].unique():
+        vols_compagnie = df_vols[df_vols['carrier'] == carrier]
+        origines = set(vols_compagnie['origin'].unique())
+        destinations = set(vols_compagnie['dest'].unique())
+        couverture[carrier] = (len(origines), len(destinations),
+                               len(origines) == len(tous_aeroports_origine),
+                               len(destinations) == len(toutes_destinations))
+
+    compagnies_par_destination = {}
+    for carrier in df_vols['carrier'].unique():
+        vols_compagnie = df_vols[df_vols['carrier'] == carrier]
+        for dest in set(vols_compagnie['dest'].unique()):
+            compagnies_par_destination.setdefault(dest, []).append(carrier)
+    exclusives = {dest for dest, compagnies in compagnies_par_destination.items() if len(compagnies) == 1}
+    return couverture, exclusives
+
+
+def matrice_incidence(df_vols):
+    """Mêmes réponses à partir des matrices d'incidence construites une seule fois."""
+    incidence = incidence_compagnies(df_vols)
+    origines, destinations = incidence['origin'], incidence['dest']
+    couverture = dict(zip(origines.index, zip(origines.sum(axis=1).tolist(), destinations.sum(axis=1).tolist(),
+                                              origines.all(axis=1).tolist(), destinations.all(axis=1).tolist())))
+    nb_compagnies = destinations.sum(axis=0)
+    return couverture, set(nb_compagnies.index[nb_compagnies == 1])
+
+
+def chronometrer(fonction, df_vols):
+    debut = time.perf_counter()
+    resultat = fonction(df_vols)
+    return time.perf_counter() - debut, resultat
+
+
+def main(nb_vols=10_000_000):
+    scenarios = [
+        (nb_vols, 16, 105),
+        (nb_vols, 1000, 3000),
+        (nb_vols // 10, 3000, 5000),
+    ]
+    print(f"{'vols':>12}{'compagnies':>12}{'aéroports':>11}{'boucle (s)':>12}{'matrice (s)':>13}{'gain':>8}")
+    for n, nb_compagnies, nb_aeroports in scenarios:
+        df_vols = generer_codes(n, nb_compagnies, nb_aeroports)
+        t_boucle, attendu = chronometrer(boucles_par_compagnie, df_vols)
+        t_matrice, obtenu = chronometrer(matrice_incidence, df_vols)
+        assert attendu == obtenu, "les deux calculs ne donnent pas les mêmes réponses"
+        print(f"{n:>12}{nb_compagnies:>12}{nb_aeroports:>11}{t_boucle:>12.2f}{t_matrice:>13.2f}{t_boucle / t_matrice:>7.1f}x")
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10_000_000)
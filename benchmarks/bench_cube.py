@@ -0,0 +1,97 @@
+"""
+Mesure le cube des retards (CubeVols) sur des vols synthétiques : construction en une passe, mise à jour
+incrémentale par un nouveau bloc de vols, puis cumuls (taux de ponctualité par compagnie et par mois, retard
+moyen par route, taux d'annulation par mois) comparés aux mêmes calculs par groupby sur tous les vols.
+Vérifie que le cube donne les mêmes réponses que les vols.
+
+Usage : python -m benchmarks.bench_cube [nb_vols] [taille_bloc]
+"""
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.donnees_synthetiques import ORIGINES_NYC, generer_aeroports, generer_compagnies, generer_vols
+from src.cube import COLONNES_CUBE, SEUIL_PONCTUALITE, CubeVols
+from src.schemas import SCHEMA_VOLS, appliquer_schema, memoire_mo
+
+
+def blocs_vols(nb_vols, taille_bloc, graine=0):
+    """Vols synthétiques par blocs, réduits aux colonnes du cube et aux types de charger_vols."""
+    compagnies = generer_compagnies(16, graine)['carrier'].to_numpy()
+    aeroports = generer_aeroports(1500, graine)['faa'].to_numpy()
+    destinations = np.setdiff1d(aeroports, ORIGINES_NYC)[:105]
+    avions = np.array([f'N{i:05d}' for i in range(4000)])
+    schema = {col: SCHEMA_VOLS[col] for col in COLONNES_CUBE}
+    for numero, debut in enumerate(range(0, nb_vols, taille_bloc)):
+        bloc = generer_vols(min(taille_bloc, nb_vols - debut), compagnies, destinations, avions,
+                            graine=graine + numero, graine_poids=graine)
+        yield appliquer_schema(bloc[COLONNES_CUBE], schema)
+
+
+def chronometrer(fonction, *args):
+    debut = time.perf_counter()
+    resultat = fonction(*args)
+    return (time.perf_counter() - debut) * 1e3, resultat
+
+
+def ponctualite_brute(df_vols):
+    groupes = df_vols.assign(a_l_heure=df_vols['arr_delay'] <= SEUIL_PONCTUALITE).groupby(
+        ['carrier', 'year', 'month'], observed=True)
+    return groupes['a_l_heure'].sum() / groupes['arr_delay'].count()
+
+
+def retard_route_brut(df_vols):
+    return df_vols.groupby(['origin', 'dest'], observed=True)['arr_delay'].mean().sort_values(ascending=False)
+
+
+def annulation_brute(df_vols):
+    return df_vols['dep_time'].isna().groupby([df_vols['year'], df_vols['month']]).mean()
+
+
+def comparer(brut, cube):
+    """Mêmes groupes et mêmes valeurs (aux arrondis des sommes près)."""
+    cube = cube.reindex(brut.index)
+    assert len(brut) == len(cube) and np.allclose(brut.to_numpy(float), cube.to_numpy(float), rtol=1e-6,
+                                                  equal_nan=True), "le cube ne donne pas les mêmes réponses"
+
+
+def main(nb_vols=5_000_000, taille_bloc=1_000_000):
+    blocs = list(blocs_vols(nb_vols, taille_bloc))
+    df_vols = pd.concat(blocs, ignore_index=True)
+    for cle in ('carrier', 'origin', 'dest'):
+        df_vols[cle] = df_vols[cle].astype('category')
+
+    t_construction, cube = chronometrer(CubeVols.construire, df_vols)
+    partiel = CubeVols.construire(pd.concat(blocs[:-1], ignore_index=True)) if len(blocs) > 1 else None
+    if partiel is not None:
+        t_ajout, _ = chronometrer(partiel.ajouter, blocs[-1])
+        assert partiel.cumul(['carrier', 'month']).equals(cube.cumul(['carrier', 'month'])), \
+            "le cube mis à jour diffère du cube construit en une fois"
+    del blocs
+
+    print(f" Vols : {len(df_vols)} ({memoire_mo(df_vols):.0f} Mo) ; cube : {len(cube)} cellules "
+          f"({cube.memoire_mo():.0f} Mo)")
+    print(f" Construction du cube : {t_construction:.0f} ms")
+    if partiel is not None:
+        print(f" Ajout d'un bloc de {taille_bloc} vols au cube des {len(df_vols) - taille_bloc} premiers : "
+              f"{t_ajout:.0f} ms")
+
+    print(f"\n{'cumul':>26}{'groupby vols (ms)':>19}{'cube 1er (ms)':>15}{'cube suivant (ms)':>19}")
+    for nom, brut, par_cube in (
+            ('ponctualité compagnie/mois', ponctualite_brute, lambda: cube.taux_ponctualite()),
+            ('retard moyen par route', retard_route_brut, lambda: cube.retard_moyen_par_route()),
+            ('annulations par mois', annulation_brute, lambda: cube.taux_annulation(('year', 'month')))):
+        t_brut, attendu = chronometrer(brut, df_vols)
+        cube._groupes.clear()  # premier cumul : numéros de groupe à calculer
+        t_premier, obtenu = chronometrer(par_cube)
+        t_suivant, _ = chronometrer(par_cube)
+        comparer(attendu, obtenu)
+        print(f"{nom:>26}{t_brut:>19.1f}{t_premier:>15.1f}{t_suivant:>19.1f}")
+    print(" Vérifications OK : le cube donne les mêmes réponses que les vols.")
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5_000_000,
+         int(sys.argv[2]) if len(sys.argv) > 2 else 1_000_000)
@@ -0,0 +1,66 @@
+"""
+Mesure le démarrage à froid de la Mission 1 : temps entre le lancement de l'interpréteur et le premier
+résultat affiché (« --- 1. Statistiques de base --- »), sur un jeu synthétique.
+Compare l'ancien démarrage (couche base importée d'emblée, fichiers lus l'un après l'autre) au nouveau
+(imports de la base différés, fichiers lus en parallèle par SessionDonnees.precharger), avec et sans
+le cache Parquet. Chaque mesure tourne dans un nouvel interpréteur.
+
+Usage : python -m benchmarks.bench_demarrage [nb_vols] [nb_repetitions]
+"""
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.donnees_synthetiques import ecrire_jeu
+
+PREMIERE_SORTIE = '--- 1. Statistiques de base ---'
+
+SCRIPT = """
+import sys
+if {ancien}:
+    import dotenv, sqlalchemy, src.analyse_sql, src.database
+    from src.session import SessionDonnees
+    SessionDonnees.precharger = lambda self, *args, **kwargs: {{}}
+from src.main import run_analysis_mission
+from src.session import SessionDonnees
+run_analysis_mission(1, session=SessionDonnees({dossier!r}, utiliser_cache={cache}))
+"""
+
+
+def demarrage(dossier, ancien, cache):
+    """Secondes entre le lancement du processus et la première ligne de résultat."""
+    script = SCRIPT.format(ancien=ancien, dossier=dossier, cache=cache)
+    debut = time.perf_counter()
+    processus = subprocess.Popen([sys.executable, '-c', script], stdout=subprocess.PIPE, text=True,
+                                 cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    duree = None
+    for ligne in processus.stdout:
+        if duree is None and ligne.startswith(PREMIERE_SORTIE):
+            duree = time.perf_counter() - debut
+    processus.wait()
+    assert duree is not None, "la Mission 1 n'a affiché aucun résultat"
+    return duree
+
+
+def main(nb_vols=336_776, nb_repetitions=3):
+    dossier = tempfile.mkdtemp(prefix='bench_demarrage_')
+    try:
+        ecrire_jeu(dossier, nb_vols)
+        demarrage(dossier, ancien=False, cache=True)  # écrit le cache Parquet
+
+        print(f"{'vols':>12}{'cache':>8}{'démarrage':>12}{'meilleur (s)':>14}")
+        for cache in (True, False):
+            for ancien in (True, False):
+                meilleur = min(demarrage(dossier, ancien, cache) for _ in range(nb_repetitions))
+                print(f"{nb_vols:>12}{'oui' if cache else 'non':>8}{'ancien' if ancien else 'nouveau':>12}"
+                      f"{meilleur:>14.2f}")
+    finally:
+        shutil.rmtree(dossier, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 336_776,
+         int(sys.argv[2]) if len(sys.argv) > 2 else 3)
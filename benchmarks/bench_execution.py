@@ -0,0 +1,54 @@
+"""
+Compare l'exécution des questions Q1 à Q8 sur un seul processus et sur un pool de processus
+(un par lot de LOTS_PARALLELES, DataFrames relus depuis des fichiers Arrow projetés en mémoire),
+sur des vols synthétiques. Le gain dépend du nombre de cœurs disponibles (os.cpu_count()).
+
+Usage : python -m benchmarks.bench_execution [nb_vols] [nb_processus]
+"""
+import contextlib
+import io
+import os
+import sys
+import time
+
+from benchmarks.donnees_synthetiques import generer_vols_depuis_referentiels
+from src.data_loader import charger_aeroports, charger_avions, charger_compagnies
+from src.execution import LOTS_PARALLELES, executer_analyses
+from src.schemas import SCHEMA_VOLS, appliquer_schema
+
+
+def chronometrer(donnees, nb_processus):
+    sortie = io.StringIO()
+    debut = time.perf_counter()
+    with contextlib.redirect_stdout(sortie):
+        _, durees = executer_analyses(donnees, nb_processus)
+    return time.perf_counter() - debut, durees, sortie.getvalue()
+
+
+def sans_compteurs(sortie):
+    """Sortie des questions seule : les compteurs d'agrégats et les temps dépendent du nombre de processus."""
+    return sortie.split("\n--- Agrégats calculés pendant la mission ---")[0]
+
+
+def main(nb_vols=3_000_000, nb_processus=None):
+    nb_processus = nb_processus or len(LOTS_PARALLELES)
+    df_aeroports = charger_aeroports()
+    df_compagnies = charger_compagnies()
+    df_avions = charger_avions()
+    df_vols = appliquer_schema(generer_vols_depuis_referentiels(nb_vols, df_aeroports, df_compagnies, df_avions),
+                               SCHEMA_VOLS)
+    donnees = {'vols': df_vols, 'aeroports': df_aeroports, 'compagnies': df_compagnies, 'avions': df_avions}
+
+    t_seq, durees_seq, sortie_seq = chronometrer(donnees, 1)
+    t_par, durees_par, sortie_par = chronometrer(donnees, nb_processus)
+    assert sans_compteurs(sortie_seq) == sans_compteurs(sortie_par), "les sorties des questions diffèrent"
+
+    print(f"\n{nb_vols} vols, {os.cpu_count()} cœur(s) disponibles")
+    print(f"{'question':>12}{'1 processus (s)':>17}{f'{nb_processus} processus (s)':>18}")
+    for libelle in durees_seq:
+        print(f"{libelle:>12}{durees_seq[libelle]:>17.2f}{durees_par[libelle]:>18.2f}")
+    print(f"{'total':>12}{t_seq:>17.2f}{t_par:>18.2f}   gain {t_seq / t_par:.2f}x")
+
+
+if __name__ == '__main__':
+    main(*(int(arg) for arg in sys.argv[1:3]))
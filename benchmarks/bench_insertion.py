@@ -0,0 +1,74 @@
+"""
+Compare l'insertion par DataFrame.to_sql(chunksize=10000) et par inserer_table
+(COPY FROM STDIN sur PostgreSQL, executemany ailleurs).
+
+Par défaut, la base est un fichier SQLite temporaire : c'est le chemin executemany.
+Pour mesurer le chemin COPY, définir BENCH_DB_URL vers une base PostgreSQL locale jetable ;
+les tables du benchmark y sont créées avec le préfixe 'bench_' puis supprimées.
+
+Usage : python -m benchmarks.bench_insertion [nb_vols]
+"""
+import os
+import sys
+import tempfile
+import time
+
+from sqlalchemy import create_engine, text
+
+from benchmarks.donnees_synthetiques import generer_vols_depuis_referentiels
+from src.data_loader import charger_aeroports, charger_avions, charger_compagnies
+from src.database import inserer_table
+from src.schemas import SCHEMA_VOLS, appliquer_schema
+
+
+def _recreer(engine, df, nom_table):
+    with engine.begin() as connexion:
+        connexion.execute(text(f'DROP TABLE IF EXISTS "{nom_table}"'))
+    df.head(0).to_sql(nom_table, engine, index=False)
+
+
+def main(nb_vols=336_776):
+    url = os.getenv('BENCH_DB_URL')
+    dossier = None
+    if not url:
+        dossier = tempfile.mkdtemp(prefix='bench_insertion_')
+        url = f"sqlite:///{os.path.join(dossier, 'bench.db')}"
+    engine = create_engine(url)
+
+    df_aeroports = charger_aeroports()
+    df_compagnies = charger_compagnies()
+    df_avions = charger_avions()
+    df_vols = appliquer_schema(
+        generer_vols_depuis_referentiels(nb_vols, df_aeroports, df_compagnies, df_avions), SCHEMA_VOLS)
+    tables = [('airlines', df_compagnies), ('airports', df_aeroports), ('planes', df_avions), ('flights', df_vols)]
+
+    print(f"\n--- Insertion sur {engine.dialect.name} ---")
+    resultats = []
+    for nom, df in tables:
+        nom_table = f'bench_{nom}'
+        _recreer(engine, df, nom_table)
+        debut = time.perf_counter()
+        df.to_sql(nom_table, engine, if_exists='append', index=False, chunksize=10000)
+        t_to_sql = time.perf_counter() - debut
+
+        _recreer(engine, df, nom_table)
+        debut = time.perf_counter()
+        inserer_table(df, nom_table, engine)
+        t_bulk = time.perf_counter() - debut
+        with engine.connect() as connexion:
+            assert connexion.execute(text(f'SELECT COUNT(*) FROM "{nom_table}"')).scalar() == len(df)
+            connexion.execute(text(f'DROP TABLE "{nom_table}"'))
+            connexion.commit()
+        resultats.append((nom, len(df), t_to_sql, t_bulk))
+
+    print(f"\n{'table':<10}{'lignes':>9}{'to_sql (s)':>12}{'bulk (s)':>10}{'lignes/s bulk':>15}{'gain':>7}")
+    for nom, n, t_to_sql, t_bulk in resultats:
+        print(f"{nom:<10}{n:>9}{t_to_sql:>12.2f}{t_bulk:>10.2f}{n / t_bulk:>15.0f}{t_to_sql / t_bulk:>6.1f}x")
+    engine.dispose()
+    if dossier:
+        os.remove(os.path.join(dossier, 'bench.db'))
+        os.rmdir(dossier)
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 336_776)
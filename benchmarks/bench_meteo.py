@@ -0,0 +1,34 @@
+"""
+Temps de lecture du PDF météo : extraction sur un seul processus, extraction sur le pool de processus,
+puis relecture depuis l'instantané Parquet.
+
+Usage : python -m benchmarks.bench_meteo [nb_processus]
+"""
+import os
+import sys
+import time
+
+from src.data_loader import _ecrire_cache, _lire_cache, _lire_meteo
+
+
+def chronometrer(fonction, *args):
+    debut = time.perf_counter()
+    resultat = fonction(*args)
+    return time.perf_counter() - debut, resultat
+
+
+def main(nb_processus=None, fichier='data/weather.pdf'):
+    nb_processus = nb_processus or os.cpu_count() or 1
+    t_seq, attendu = chronometrer(_lire_meteo, fichier, 1)
+    t_par, obtenu = chronometrer(_lire_meteo, fichier, nb_processus)
+    assert attendu.equals(obtenu), "l'extraction parallèle ne donne pas le même tableau"
+    _ecrire_cache(fichier, obtenu)
+    t_cache, depuis_cache = chronometrer(_lire_cache, fichier)
+    assert depuis_cache.equals(obtenu), "l'instantané ne redonne pas le même tableau"
+
+    print(f"{'lignes':>8}{'1 processus (s)':>17}{f'{nb_processus} processus (s)':>18}{'cache (s)':>11}")
+    print(f"{len(obtenu):>8}{t_seq:>17.2f}{t_par:>18.2f}{t_cache:>11.3f}")
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else None)
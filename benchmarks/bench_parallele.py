@@ -0,0 +1,68 @@
+"""
+Compare le chargement séquentiel des quatre tables (inserer_table l'une après l'autre)
+avec charger_tables_en_parallele (dimensions en parallèle puis partitions de vols sur un pool de threads).
+
+Le gain n'apparaît qu'avec un serveur qui accepte plusieurs écrivains : définir BENCH_DB_URL vers
+une base PostgreSQL locale jetable (les tables airlines, airports, planes et flights y sont recréées).
+Sans BENCH_DB_URL, le benchmark tourne sur SQLite, où le chargement reste séquentiel (un seul écrivain).
+
+Usage : python -m benchmarks.bench_parallele [nb_vols] [nb_threads]
+"""
+import os
+import sys
+import tempfile
+import time
+
+from sqlalchemy import create_engine, text
+
+from benchmarks.bench_synchro import creer_tables
+from benchmarks.donnees_synthetiques import generer_vols_depuis_referentiels
+from src.data_loader import charger_aeroports, charger_avions, charger_compagnies
+from src.database import CLES_TABLES, charger_tables_en_parallele, inserer_table
+from src.schemas import SCHEMA_VOLS, appliquer_schema
+
+
+def vider(engine, tables):
+    with engine.begin() as connexion:
+        for nom_table in reversed(list(tables)):
+            connexion.execute(text(f'DELETE FROM "{nom_table}"'))
+
+
+def main(nb_vols=1_000_000, nb_threads=4):
+    url = os.getenv('BENCH_DB_URL')
+    if not url:
+        url = f"sqlite:///{os.path.join(tempfile.mkdtemp(prefix='bench_parallele_'), 'bench.db')}"
+        engine = create_engine(url)
+    else:
+        engine = create_engine(url, pool_size=nb_threads, max_overflow=0)
+
+    df_aeroports = charger_aeroports()
+    df_compagnies = charger_compagnies()
+    df_avions = charger_avions()
+    df_vols = appliquer_schema(generer_vols_depuis_referentiels(nb_vols, df_aeroports, df_compagnies, df_avions),
+                               SCHEMA_VOLS).drop_duplicates(subset=CLES_TABLES['flights'], ignore_index=True)
+    tables = {'airlines': df_compagnies, 'airports': df_aeroports, 'planes': df_avions, 'flights': df_vols}
+    creer_tables(engine, tables)
+
+    print(f"\n--- Chargement séquentiel ({engine.dialect.name}) ---")
+    debut = time.perf_counter()
+    for nom_table, df in tables.items():
+        inserer_table(df, nom_table, engine)
+    t_sequentiel = time.perf_counter() - debut
+    vider(engine, tables)
+
+    print(f"\n--- Chargement parallèle ({nb_threads} threads demandés) ---")
+    debut = time.perf_counter()
+    charger_tables_en_parallele(tables, engine, nb_threads=nb_threads)
+    t_parallele = time.perf_counter() - debut
+
+    with engine.connect() as connexion:
+        assert connexion.execute(text('SELECT COUNT(*) FROM flights')).scalar() == len(df_vols)
+    print(f"\n Séquentiel : {t_sequentiel:.2f} s | Parallèle : {t_parallele:.2f} s "
+          f"| gain {t_sequentiel / t_parallele:.1f}x")
+    engine.dispose()
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000,
+         int(sys.argv[2]) if len(sys.argv) > 2 else 4)
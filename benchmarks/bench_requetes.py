@@ -0,0 +1,71 @@
+"""
+Compare 1 000 recherches de routes aléatoires (origin, dest) par masques booléens sur toute la table
+avec les mêmes recherches sur IndexVols (tri et recherche dichotomique).
+
+Usage : python -m benchmarks.bench_requetes [nb_vols] [nb_requetes]
+"""
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from src.requetes import IndexVols
+
+
+def generer_vols(nb_vols, nb_aeroports=300, nb_compagnies=16, nb_avions=4000, graine=0):
+    """Vols réduits aux colonnes indexées, en catégoriels comme après charger_vols, destinations très inégales."""
+    rng = np.random.default_rng(graine)
+    aeroports = np.array([f'A{i:03d}' for i in range(nb_aeroports)])
+    poids = 1.0 / np.arange(1, nb_aeroports + 1)
+    poids /= poids.sum()
+    jours = pd.Timestamp('2013-01-01') + pd.to_timedelta(rng.integers(0, 365, nb_vols), unit='D')
+    return pd.DataFrame({
+        'year': jours.year.astype('int16'),
+        'month': jours.month.astype('int8'),
+        'day': jours.day.astype('int8'),
+        'carrier': pd.Categorical.from_codes(rng.integers(0, nb_compagnies, nb_vols),
+                                             [f'C{i:02d}' for i in range(nb_compagnies)]),
+        'tailnum': pd.Categorical.from_codes(rng.integers(0, nb_avions, nb_vols),
+                                             [f'N{i:05d}' for i in range(nb_avions)]),
+        'origin': pd.Categorical.from_codes(rng.integers(0, 3, nb_vols), aeroports),
+        'dest': pd.Categorical.from_codes(rng.choice(nb_aeroports, nb_vols, p=poids), aeroports),
+    })
+
+
+def main(nb_vols=10_000_000, nb_requetes=1000):
+    df_vols = generer_vols(nb_vols)
+    rng = np.random.default_rng(1)
+    aeroports = df_vols['dest'].cat.categories
+    routes = list(zip(rng.choice(aeroports[:3], nb_requetes), rng.choice(aeroports, nb_requetes)))
+
+    debut = time.perf_counter()
+    origines, destinations = df_vols['origin'], df_vols['dest']
+    attendus = [int(((origines == o) & (destinations == d)).sum()) for o, d in routes]
+    t_masques = time.perf_counter() - debut
+
+    debut = time.perf_counter()
+    index = IndexVols(df_vols)
+    index.construire()
+    t_construction = time.perf_counter() - debut
+
+    debut = time.perf_counter()
+    obtenus = [index.compter(origin=o, dest=d) for o, d in routes]
+    t_index = time.perf_counter() - debut
+    assert attendus == obtenus, "les deux recherches ne trouvent pas les mêmes vols"
+
+    debut = time.perf_counter()
+    for o, d in routes[:100]:
+        index.filtrer(origin=o, dest=d, date_min='2013-06-01', date_max='2013-06-30')
+    t_filtrer = time.perf_counter() - debut
+
+    print(f"{nb_vols} vols, {nb_requetes} recherches de routes ({sum(obtenus)} vols trouvés au total)")
+    print(f"  masques booléens     : {t_masques:8.2f} s ({t_masques / nb_requetes * 1e3:.2f} ms/recherche)")
+    print(f"  construction index   : {t_construction:8.2f} s (une seule fois, 4 index)")
+    print(f"  index                : {t_index:8.2f} s ({t_index / nb_requetes * 1e3:.3f} ms/recherche, "
+          f"gain {t_masques / t_index:.0f}x)")
+    print(f"  100 route + mois     : {t_filtrer:8.2f} s (lignes extraites avec filtrer)")
+
+
+if __name__ == '__main__':
+    main(*(int(arg) for arg in sys.argv[1:3]))
@@ -0,0 +1,66 @@
+"""
+Compare l'enchaînement des deux missions (populate_database puis run_analysis_mission) avec des lectures
+de fichiers séparées et avec une SessionDonnees partagée, sur un jeu synthétique et une base SQLite
+temporaire (ou celle de BENCH_DB_URL). Les fichiers sont lus sans le cache Parquet pour mesurer le coût
+de lecture complet. Vérifie aussi que la Mission 2 ne modifie pas les tables brutes de la session.
+
+Usage : python -m benchmarks.bench_session [nb_vols]
+"""
+import contextlib
+import io
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+import pandas as pd
+from sqlalchemy import create_engine
+
+from benchmarks.bench_synchro import creer_tables
+from benchmarks.donnees_synthetiques import ecrire_jeu
+from src.database import populate_database, preparer_donnees
+from src.main import run_analysis_mission
+from src.session import SessionDonnees
+
+
+def deux_missions(engine, tables, dossier, partager):
+    """Mission 2 puis Mission 1 ; renvoie la durée, le nombre de fichiers lus et la session de la Mission 1."""
+    sortie = io.StringIO()
+    session_base = SessionDonnees(dossier, utiliser_cache=False)
+    session_analyse = session_base if partager else SessionDonnees(dossier, utiliser_cache=False)
+    creer_tables(engine, tables)
+    debut = time.perf_counter()
+    with contextlib.redirect_stdout(sortie):
+        populate_database(engine, session=session_base)
+        run_analysis_mission(1, session=session_analyse)
+    duree = time.perf_counter() - debut
+    return duree, sortie.getvalue().count(" chargé avec succès"), session_analyse
+
+
+def main(nb_vols=1_000_000):
+    dossier = tempfile.mkdtemp(prefix='bench_session_')
+    try:
+        engine = create_engine(os.getenv('BENCH_DB_URL') or f"sqlite:///{os.path.join(dossier, 'bench.db')}")
+        ecrire_jeu(dossier, nb_vols)
+        with contextlib.redirect_stdout(io.StringIO()):
+            tables = {nom: df.head(0) for nom, df in preparer_donnees(dossier).items()}  # schémas seuls
+
+        t_separe, lus_separe, _ = deux_missions(engine, tables, dossier, partager=False)
+        t_partage, lus_partage, session = deux_missions(engine, tables, dossier, partager=True)
+
+        brut = session.brut('flights')
+        relu = pd.read_csv(os.path.join(dossier, 'flights.csv'), encoding='latin1', usecols=['tailnum'])
+        assert len(brut) == nb_vols, "la table brute des vols a perdu des lignes"
+        assert brut['tailnum'].isna().sum() == relu['tailnum'].isna().sum(), "la table brute des vols a été modifiée"
+        engine.dispose()
+    finally:
+        shutil.rmtree(dossier, ignore_errors=True)
+
+    print(f"{'vols':>12}{'mode':>22}{'fichiers lus':>14}{'durée (s)':>11}")
+    print(f"{nb_vols:>12}{'lectures séparées':>22}{lus_separe:>14}{t_separe:>11.2f}")
+    print(f"{nb_vols:>12}{'session partagée':>22}{lus_partage:>14}{t_partage:>11.2f}")
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
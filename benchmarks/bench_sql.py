@@ -0,0 +1,105 @@
+"""
+Compare la Mission 1 calculée en pandas sur les DataFrames préparés et la même mission calculée par la
+base à partir de ses tables de résumé (analyse_sql), après un populate_database sur un jeu synthétique.
+Vérifie que les deux modes donnent les mêmes réponses (à l'ordre des ex aequo près).
+
+La base est un fichier SQLite temporaire, ou celle de BENCH_DB_URL si la variable est définie
+(ses tables de données et de résumé sont supprimées puis recréées).
+
+Usage : python -m benchmarks.bench_sql [nb_vols]
+"""
+import contextlib
+import io
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+from sqlalchemy import create_engine
+
+from benchmarks.bench_synchro import creer_tables
+from benchmarks.donnees_synthetiques import ecrire_jeu
+from src.analyse_sql import executer_analyses_sql
+from src.database import populate_database, preparer_donnees
+from src.execution import executer_analyses
+
+
+def chronometrer(fonction, *args, **kwargs):
+    debut = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        resultat = fonction(*args, **kwargs)
+    return time.perf_counter() - debut, resultat
+
+
+def comparer(pandas, sql):
+    """Vérifie que les réponses des deux modes concordent, question par question."""
+    q1, q1_sql = pandas[0], sql[0]
+    assert q1 == q1_sql, (q1, q1_sql)
+    assert pandas[1] == sql[1], (pandas[1], sql[1])
+
+    q2, q2_sql = pandas[2], sql[2]
+    assert q2.aeroport_top == q2_sql.aeroport_top
+    assert q2.vols_par_avion.astype(int).to_dict() == q2_sql.vols_par_avion.to_dict()
+    assert (dict(zip(q2.destinations['faa'].astype(str), q2.destinations['nombre_vols']))
+            == dict(zip(q2_sql.destinations['faa'], q2_sql.destinations['nombre_vols'])))
+
+    q3, q3_sql = pandas[3], sql[3]
+    assert (dict(zip(q3.destinations['carrier'].astype(str), q3.destinations['nombre_destinations_uniques']))
+            == dict(zip(q3_sql.destinations['carrier'], q3_sql.destinations['nombre_destinations_uniques'])))
+    assert (dict(zip(zip(q3.destinations_par_origine['carrier'].astype(str),
+                         q3.destinations_par_origine['origin'].astype(str)), q3.destinations_par_origine['dest']))
+            == dict(zip(zip(q3_sql.destinations_par_origine['carrier'], q3_sql.destinations_par_origine['origin']),
+                        q3_sql.destinations_par_origine['dest'])))
+
+    q4, q4_sql = pandas[4], sql[4]
+    assert len(q4.vols_houston) == len(q4_sql.vols_houston)
+    assert q4.vols_par_destination.astype(int).to_dict() == q4_sql.vols_par_destination.to_dict()
+    assert ((q4.nb_vols_nyc_sea, q4.nb_compagnies_nyc_sea, q4.nb_avions_nyc_sea)
+            == (q4_sql.nb_vols_nyc_sea, q4_sql.nb_compagnies_nyc_sea, q4_sql.nb_avions_nyc_sea))
+    noms = ['dest_name', 'origin_name', 'name']
+    assert q4.vols_tries[noms].astype(str).equals(q4_sql.vols_tries[noms].astype(str))
+
+    q6, q6_sql = pandas[5], sql[5]
+    colonnes = ['nb_origines', 'nb_destinations', 'couvre_toutes_origines', 'couvre_toutes_destinations']
+    assert (q6.tableau.assign(carrier=q6.tableau['carrier'].astype(str)).set_index('carrier')[colonnes].astype(int)
+            .sort_index().equals(q6_sql.tableau.set_index('carrier')[colonnes].astype(int).sort_index()))
+
+    q7, q7_sql = pandas[6], sql[6]
+    assert {str(dest): noms for dest, noms in q7.exclusives.items()} == q7_sql.exclusives
+    assert q7.nb_peu_desservies == q7_sql.nb_peu_desservies
+
+    q8, q8_sql = pandas[7], sql[7]
+    assert q8.nb_vols == q8_sql.nb_vols
+    assert (dict(zip(q8.repartition['carrier'], q8.repartition['nb_vols']))
+            == dict(zip(q8_sql.repartition['carrier'], q8_sql.repartition['nb_vols'])))
+
+
+def main(nb_vols=1_000_000):
+    dossier = tempfile.mkdtemp(prefix='bench_sql_')
+    try:
+        url = os.getenv('BENCH_DB_URL') or f"sqlite:///{os.path.join(dossier, 'bench.db')}"
+        engine = create_engine(url)
+        ecrire_jeu(dossier, nb_vols)
+        _, tables = chronometrer(preparer_donnees, dossier)
+        creer_tables(engine, tables)
+        t_chargement, _ = chronometrer(populate_database, engine, 'complet', dossier)
+
+        donnees = {'vols': tables['flights'], 'aeroports': tables['airports'],
+                   'compagnies': tables['airlines'], 'avions': tables['planes']}
+        t_pandas, (resultats_pandas, _) = chronometrer(executer_analyses, donnees, 1)
+        t_sql, resultats_sql = chronometrer(executer_analyses_sql, engine, afficher=False)
+        comparer(resultats_pandas, resultats_sql)
+        engine.dispose()
+    finally:
+        shutil.rmtree(dossier, ignore_errors=True)
+
+    print(f" Vols en base : {len(tables['flights'])} ({url.split(':', 1)[0]})")
+    print(f" populate_database (avec rafraîchissement des résumés) : {t_chargement:.2f} s")
+    print(f" Mission 1 en pandas sur les DataFrames préparés : {t_pandas:.2f} s")
+    print(f" Mission 1 sur les tables de résumé : {t_sql:.2f} s")
+    print(" Vérifications OK : les deux modes donnent les mêmes réponses.")
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
@@ -0,0 +1,85 @@
+"""
+Vérifie que la lecture en flux des vols donne exactement les mêmes comptages que le chargement
+en mémoire, puis mesure le pic de mémoire de la lecture en flux pour des volumes croissants.
+
+Usage : python -m benchmarks.bench_streaming [nb_vols_par_mois ...]
+"""
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+
+import pandas as pd
+
+from benchmarks.donnees_synthetiques import generer_vols_depuis_referentiels
+from src.data_loader import charger_aeroports, charger_avions, charger_compagnies, charger_vols
+from src.streaming import agreger_vols
+
+
+def ecrire_mois(dossier, nb_vols_par_mois, df_aeroports, df_compagnies, df_avions):
+    """Écrit douze fichiers mensuels de vols synthétiques dans `dossier`."""
+    os.makedirs(dossier, exist_ok=True)
+    for mois in range(1, 13):
+        df = generer_vols_depuis_referentiels(nb_vols_par_mois, df_aeroports, df_compagnies, df_avions, graine=mois)
+        df['month'] = mois
+        df.to_csv(os.path.join(dossier, f'flights_{mois:02d}.csv'), index=False, encoding='latin1')
+
+
+def verifier_coherence(dossier):
+    """Compare les agrégats en flux avec les calculs de src/analysis.py sur le DataFrame complet."""
+    agregateur = agreger_vols(dossier, taille_bloc=50_000)
+    df_vols = pd.concat([charger_vols(os.path.join(dossier, f), utiliser_cache=False)
+                         for f in sorted(os.listdir(dossier))], ignore_index=True)
+
+    attendu_dest = df_vols['dest'].astype(str).value_counts()
+    attendu_par_compagnie = df_vols.astype({'carrier': str, 'dest': str}).groupby('carrier')['dest'].nunique()
+    verifications = {
+        'vols annulés': agregateur.vols_annules == df_vols['dep_time'].isnull().sum(),
+        'origines uniques': agregateur.departs_uniques() == df_vols['origin'].nunique(),
+        'destinations uniques': agregateur.destinations_uniques() == df_vols['dest'].nunique(),
+        'vols par destination': agregateur.vols_par_destination().sort_index().equals(attendu_dest.sort_index()),
+        'destinations par compagnie': agregateur.destinations_par_compagnie().sort_index().equals(
+            attendu_par_compagnie.sort_index()),
+    }
+    for nom, ok in verifications.items():
+        print(f" {'OK ' if ok else 'KO '} {nom}")
+    return all(verifications.values())
+
+
+def pic_memoire_flux(dossier):
+    """
+    Lance la lecture en flux dans un processus séparé et renvoie son pic de mémoire résidente (Mo).
+    On lit VmHWM plutôt que ru_maxrss, qui hérite du pic du processus parent sous Linux.
+    """
+    code = ("from src.streaming import agreger_vols; "
+            f"agreger_vols({dossier!r}); "
+            "print([l for l in open('/proc/self/status') if l.startswith('VmHWM')][0].split()[1])")
+    sortie = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True)
+    return int(sortie.stdout.split()[-1]) / 1e3
+
+
+def main(tailles=(20_000, 80_000)):
+    df_aeroports = charger_aeroports()
+    df_compagnies = charger_compagnies()
+    df_avions = charger_avions()
+    racine = tempfile.mkdtemp(prefix='bench_flux_')
+    try:
+        print("\n--- Cohérence flux / mémoire ---")
+        dossier = os.path.join(racine, 'petit')
+        ecrire_mois(dossier, tailles[0], df_aeroports, df_compagnies, df_avions)
+        coherent = verifier_coherence(dossier)
+
+        print("\n--- Pic de mémoire de la lecture en flux ---")
+        for taille in tailles:
+            dossier = os.path.join(racine, str(taille))
+            ecrire_mois(dossier, taille, df_aeroports, df_compagnies, df_avions)
+            print(f" {taille * 12:>10} vols : pic RSS {pic_memoire_flux(dossier):.0f} Mo")
+        return coherent
+    finally:
+        shutil.rmtree(racine, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    tailles = tuple(int(t) for t in sys.argv[1:]) or (20_000, 80_000)
+    sys.exit(0 if main(tailles) else 1)
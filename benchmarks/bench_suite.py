@@ -0,0 +1,166 @@
+"""
+Banc d'essai complet sur un jeu synthétique écrit aux formats des fichiers de data/ (voir
+donnees_synthetiques.ecrire_jeu) : pour chaque échelle (nombre de vols), mesure la génération,
+chaque charger_* (sans cache, écriture du cache, lecture du cache), chaque question d'analyse,
+executer_analyses, preparer_donnees et populate_database (complet puis synchro).
+
+Chaque étape est mesurée en temps écoulé, temps CPU, hausse du pic de mémoire résidente et nombre de
+lignes ; les résultats sont écrits en JSON. La base est un fichier SQLite temporaire, ou celle de
+BENCH_DB_URL si la variable est définie (ses tables 'airlines', 'airports', 'planes' et 'flights'
+sont supprimées puis recréées).
+
+Les jeux générés sont conservés dans benchmarks/.donnees/<nb_vols> et réutilisés d'une exécution à l'autre.
+50 millions de vols demandent plusieurs Go de mémoire à l'analyse comme à l'insertion.
+
+Usage : python -m benchmarks.bench_suite [nb_vols,nb_vols,...] [fichier_json]
+"""
+import contextlib
+import datetime
+import io
+import json
+import os
+import platform
+import resource
+import shutil
+import sys
+import tempfile
+import time
+
+import pandas as pd
+from sqlalchemy import create_engine, text
+
+from benchmarks.bench_synchro import creer_tables
+from benchmarks.donnees_synthetiques import ecrire_jeu
+from src.data_loader import (NOM_DOSSIER_CACHE, charger_aeroports, charger_avions, charger_compagnies,
+                             charger_meteo, charger_vols)
+from src.database import populate_database, preparer_donnees
+from src.execution import QUESTIONS, executer_analyses
+
+DOSSIER_JEUX = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.donnees')
+CHARGEURS = [
+    ('charger_aeroports', charger_aeroports, 'airports.csv'),
+    ('charger_compagnies', charger_compagnies, 'airlines.json'),
+    ('charger_avions', charger_avions, 'planes.html'),
+    ('charger_vols', charger_vols, 'flights.csv'),
+]
+METEO = os.path.join('data', 'weather.pdf')
+
+
+def _memoire_ko(cle):
+    with open('/proc/self/status') as f:
+        return int(next(ligne for ligne in f if ligne.startswith(cle)).split()[1])
+
+
+def _remettre_pic_a_zero():
+    """Remet VmHWM au niveau actuel (Linux) ; renvoie False si ce n'est pas possible."""
+    try:
+        with open('/proc/self/clear_refs', 'w') as f:
+            f.write('5')
+        return True
+    except OSError:
+        return False
+
+
+def _nb_lignes(resultat):
+    if isinstance(resultat, (pd.DataFrame, pd.Series)):
+        return len(resultat)
+    if isinstance(resultat, dict) and any(isinstance(df, pd.DataFrame) for df in resultat.values()):
+        return sum(len(df) for df in resultat.values() if df is not None)
+    return None
+
+
+def mesurer(echelle, etape, categorie, fonction, *args, **kwargs):
+    """
+    Exécute fonction(*args, **kwargs) sans son affichage et renvoie (mesure, résultat).
+    Le pic de mémoire est lu dans VmHWM remis à zéro juste avant ; à défaut, c'est la hausse de ru_maxrss,
+    nulle tant que le processus ne dépasse pas son pic précédent.
+    """
+    remis_a_zero = _remettre_pic_a_zero()
+    avant = _memoire_ko('VmRSS') if remis_a_zero else resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    debut, debut_cpu = time.perf_counter(), time.process_time()
+    with contextlib.redirect_stdout(io.StringIO()):
+        resultat = fonction(*args, **kwargs)
+    duree, cpu = time.perf_counter() - debut, time.process_time() - debut_cpu
+    apres = _memoire_ko('VmHWM') if remis_a_zero else resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    mesure = {'echelle': echelle, 'etape': etape, 'categorie': categorie, 'duree_s': round(duree, 4),
+              'cpu_s': round(cpu, 4), 'pic_rss_mo': round(max(apres - avant, 0) / 1e3, 1),
+              'lignes': _nb_lignes(resultat)}
+    print(f"{echelle:>12} {categorie:<12}{etape:<40}{duree:>10.2f}{cpu:>10.2f}{mesure['pic_rss_mo']:>12.0f}"
+          f"{mesure['lignes'] if mesure['lignes'] is not None else '':>12}")
+    return mesure, resultat
+
+
+def mesurer_echelle(nb_vols, url):
+    mesures = []
+    dossier = os.path.join(DOSSIER_JEUX, str(nb_vols))
+    if not os.path.exists(os.path.join(dossier, 'flights.csv')):
+        mesure, _ = mesurer(nb_vols, 'ecrire_jeu', 'generation', ecrire_jeu, dossier, nb_vols)
+        mesures.append({**mesure, 'lignes': nb_vols})
+    shutil.rmtree(os.path.join(dossier, NOM_DOSSIER_CACHE), ignore_errors=True)
+
+    tables = {}
+    for nom, chargeur, fichier in CHARGEURS:
+        chemin = os.path.join(dossier, fichier)
+        for etape, utiliser_cache in (('sans cache', False), ('écriture du cache', True), ('depuis le cache', True)):
+            mesure, tables[nom] = mesurer(nb_vols, f'{nom} ({etape})', 'chargement', chargeur, chemin, utiliser_cache)
+            mesures.append(mesure)
+    if os.path.exists(METEO):
+        mesure, _ = mesurer(nb_vols, 'charger_meteo', 'chargement', charger_meteo, METEO)
+        mesures.append(mesure)
+
+    donnees = {'vols': tables['charger_vols'], 'aeroports': tables['charger_aeroports'],
+               'compagnies': tables['charger_compagnies'], 'avions': tables['charger_avions']}
+    for libelle, fonction, arguments in QUESTIONS:
+        mesure, _ = mesurer(nb_vols, f'{libelle} {fonction.__name__}', 'analyse', fonction,
+                            *(donnees[nom] for nom in arguments), afficher=False)
+        mesures.append(mesure)
+    mesure, _ = mesurer(nb_vols, 'executer_analyses (1 processus)', 'analyse', executer_analyses, donnees, 1)
+    mesures.append(mesure)
+    del donnees, tables
+
+    mesure, tables = mesurer(nb_vols, 'preparer_donnees', 'base', preparer_donnees, dossier)
+    mesures.append(mesure)
+    engine = create_engine(url)
+    creer_tables(engine, tables)
+    del tables
+    for mode in ('complet', 'synchro'):
+        mesure, _ = mesurer(nb_vols, f'populate_database ({mode})', 'base', populate_database, engine, mode, dossier)
+        # populate_database affiche ses erreurs sans les relever : les lignes comptées en base le révèlent.
+        with engine.connect() as connexion:
+            mesure['lignes'] = connexion.execute(text('SELECT COUNT(*) FROM flights')).scalar()
+        mesures.append(mesure)
+    engine.dispose()
+    return mesures
+
+
+def main(echelles=(1_000_000,), fichier_json='bench_suite.json'):
+    url = os.getenv('BENCH_DB_URL')
+    dossier_base = None
+    if not url:
+        dossier_base = tempfile.mkdtemp(prefix='bench_suite_')
+        url = f"sqlite:///{os.path.join(dossier_base, 'bench.db')}"
+
+    print(f"{'vols':>12} {'catégorie':<12}{'étape':<40}{'durée (s)':>10}{'CPU (s)':>10}{'pic (Mo)':>12}{'lignes':>12}")
+    mesures = []
+    try:
+        for nb_vols in echelles:
+            mesures += mesurer_echelle(nb_vols, url)
+    finally:
+        if dossier_base is not None:
+            shutil.rmtree(dossier_base, ignore_errors=True)
+
+    resultats = {
+        'date': datetime.datetime.now().isoformat(timespec='seconds'),
+        'machine': {'python': platform.python_version(), 'pandas': pd.__version__, 'plateforme': platform.platform(),
+                    'nb_coeurs': os.cpu_count()},
+        'base': url.split(':', 1)[0],
+        'mesures': mesures,
+    }
+    with open(fichier_json, 'w', encoding='utf-8') as f:
+        json.dump(resultats, f, ensure_ascii=False, indent=2)
+    print(f"\n {len(mesures)} mesure(s) écrites dans '{fichier_json}'.")
+
+
+if __name__ == '__main__':
+    main([int(n) for n in sys.argv[1].split(',')] if len(sys.argv) > 1 else (1_000_000,),
+         sys.argv[2] if len(sys.argv) > 2 else 'bench_suite.json')
@@ -0,0 +1,100 @@
+"""
+Vérifie le mode 'synchro' de populate_database sur une base SQLite locale (avec clés primaires),
+et compare son coût à un rechargement complet après une modification d'une seule ligne.
+
+Pour une base PostgreSQL locale, définir BENCH_DB_URL (les tables 'airlines', 'airports',
+'planes' et 'flights' de cette base sont supprimées puis recréées).
+
+Usage : python -m benchmarks.bench_synchro [nb_vols]
+"""
+import os
+import sys
+import tempfile
+import time
+
+import pandas as pd
+from sqlalchemy import create_engine, text
+
+from benchmarks.donnees_synthetiques import generer_vols_depuis_referentiels
+from src.data_loader import charger_aeroports, charger_avions, charger_compagnies
+from src.database import CLES_TABLES, calculer_differences, inserer_table, synchroniser_tables
+from src.schemas import SCHEMA_VOLS, appliquer_schema
+
+
+def creer_tables(engine, tables):
+    with engine.begin() as connexion:
+        for nom_table in reversed(list(tables)):
+            connexion.execute(text(f'DROP TABLE IF EXISTS "{nom_table}"'))
+        for nom_table, df in tables.items():
+            connexion.execute(text(pd.io.sql.get_schema(df, nom_table, keys=CLES_TABLES[nom_table], con=connexion)))
+
+
+def rechargement_complet(engine, tables):
+    with engine.begin() as connexion:
+        for nom_table in reversed(list(tables)):
+            connexion.execute(text(f'DELETE FROM "{nom_table}"'))
+    for nom_table, df in tables.items():
+        inserer_table(df, nom_table, engine)
+
+
+def base_identique(engine, tables):
+    for nom_table, df in tables.items():
+        existant = pd.read_sql(text(f'SELECT * FROM "{nom_table}"'), engine)
+        if any(len(d) for d in calculer_differences(df, existant[list(df.columns)], CLES_TABLES[nom_table])):
+            return False
+    return True
+
+
+def chronometrer(fonction, *args):
+    debut = time.perf_counter()
+    resultat = fonction(*args)
+    return time.perf_counter() - debut, resultat
+
+
+def main(nb_vols=336_776):
+    url = os.getenv('BENCH_DB_URL')
+    if not url:
+        url = f"sqlite:///{os.path.join(tempfile.mkdtemp(prefix='bench_synchro_'), 'bench.db')}"
+    engine = create_engine(url)
+
+    df_aeroports = charger_aeroports()
+    df_compagnies = charger_compagnies()
+    df_avions = charger_avions()
+    df_vols = appliquer_schema(generer_vols_depuis_referentiels(nb_vols, df_aeroports, df_compagnies, df_avions),
+                               SCHEMA_VOLS).drop_duplicates(subset=CLES_TABLES['flights'], ignore_index=True)
+    tables = {'airlines': df_compagnies, 'airports': df_aeroports, 'planes': df_avions, 'flights': df_vols}
+    creer_tables(engine, tables)
+
+    print("\n--- Synchronisation initiale (base vide) ---")
+    t_initial, bilan = chronometrer(synchroniser_tables, tables, engine)
+    assert bilan['flights']['insertions'] == len(df_vols)
+
+    print("\n--- Modification d'une seule compagnie ---")
+    df_compagnies = df_compagnies.copy()
+    df_compagnies.loc[0, 'name'] = df_compagnies.loc[0, 'name'] + ' (renommée)'
+    tables['airlines'] = df_compagnies
+    t_une_ligne, bilan = chronometrer(synchroniser_tables, tables, engine)
+    assert bilan['airlines'] == {'insertions': 0, 'mises_a_jour': 1, 'suppressions': 0}
+    assert all(bilan[t] == {'insertions': 0, 'mises_a_jour': 0, 'suppressions': 0} for t in ('airports', 'planes', 'flights'))
+
+    print("\n--- Vols ajoutés, modifiés et supprimés ---")
+    nouveaux = df_vols.tail(5).copy()
+    nouveaux['flight'] = nouveaux['flight'] + 10_000
+    df_vols = pd.concat([df_vols.iloc[10:], nouveaux], ignore_index=True)
+    df_vols.loc[:2, 'arr_delay'] = 999
+    tables['flights'] = df_vols
+    _, bilan = chronometrer(synchroniser_tables, tables, engine)
+    assert bilan['flights'] == {'insertions': 5, 'mises_a_jour': 3, 'suppressions': 10}, bilan['flights']
+    assert base_identique(engine, tables), "la base ne correspond pas aux DataFrames après synchronisation"
+
+    print("\n--- Rechargement complet ---")
+    t_complet, _ = chronometrer(rechargement_complet, engine, tables)
+
+    print(f"\n Synchronisation initiale : {t_initial:.2f} s")
+    print(f" Synchronisation après une modification : {t_une_ligne:.2f} s")
+    print(f" Rechargement complet : {t_complet:.2f} s")
+    print(" Vérifications OK : la base correspond aux DataFrames.")
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 336_776)
@@ -0,0 +1,84 @@
+"""
+Compare l'aperçu des vols triés (Destination, Origine, Compagnie) d'analyses_filtrage_et_tri :
+ancienne méthode (trois jointures puis tri de toute la table) contre VueTrieeVols (rangs de noms et
+sélection partielle). Chaque mesure tourne dans un processus séparé pour isoler son pic de mémoire.
+
+Usage : python -m benchmarks.bench_tri [nb_vols]
+"""
+import subprocess
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from src.data_loader import charger_aeroports, charger_compagnies
+from src.requetes import VueTrieeVols
+
+COLONNES = VueTrieeVols.COLONNES
+
+
+def generer_vols(nb_vols, df_aeroports, df_compagnies, graine=0):
+    """Vols synthétiques réduits aux colonnes utiles, codes pris dans les référentiels (plus quelques codes inconnus)."""
+    rng = np.random.default_rng(graine)
+    aeroports = np.append(df_aeroports['faa'].astype(str).to_numpy()[:300], 'ZZZ')
+    compagnies = df_compagnies['carrier'].astype(str).to_numpy()
+    return pd.DataFrame({
+        'carrier': pd.Categorical.from_codes(rng.integers(0, len(compagnies), nb_vols), compagnies),
+        'flight': rng.integers(1, 8000, nb_vols).astype('int32'),
+        'tailnum': pd.Categorical.from_codes(rng.integers(0, 4000, nb_vols), [f'N{i:05d}' for i in range(4000)]),
+        'origin': pd.Categorical.from_codes(rng.integers(0, 3, nb_vols), aeroports),
+        'dest': pd.Categorical.from_codes(rng.integers(0, len(aeroports), nb_vols), aeroports),
+    })
+
+
+def tri_par_jointures(df_vols, df_aeroports, df_compagnies):
+    df_tries = pd.merge(df_vols, df_aeroports, left_on='origin', right_on='faa', suffixes=('', '_origin'))
+    df_tries.rename(columns={'name': 'origin_name'}, inplace=True)
+    df_tries = pd.merge(df_tries, df_aeroports, left_on='dest', right_on='faa', suffixes=('', '_dest'))
+    df_tries.rename(columns={'name': 'dest_name'}, inplace=True)
+    df_tries = pd.merge(df_tries, df_compagnies, on='carrier')
+    df_tries.sort_values(by=['dest_name', 'origin_name', 'name'], inplace=True, kind='stable')
+    return df_tries[COLONNES].head(10).reset_index(drop=True)
+
+
+def tri_par_rangs(df_vols, df_aeroports, df_compagnies):
+    return VueTrieeVols(df_vols, df_aeroports, df_compagnies).tete(10)
+
+
+def _memoire_ko(cle):
+    with open('/proc/self/status') as f:
+        return int(next(ligne for ligne in f if ligne.startswith(cle)).split()[1])
+
+
+def mesurer(methode, nb_vols):
+    """Exécuté dans le processus fils : temps et hausse du pic de mémoire (VmHWM remis à zéro) de la méthode."""
+    df_aeroports, df_compagnies = charger_aeroports(), charger_compagnies()
+    df_vols = generer_vols(nb_vols, df_aeroports, df_compagnies)
+    with open('/proc/self/clear_refs', 'w') as f:
+        f.write('5')  # remet VmHWM au niveau de la mémoire actuelle
+    avant = _memoire_ko('VmRSS')
+    debut = time.perf_counter()
+    resultat = globals()[methode](df_vols, df_aeroports, df_compagnies)
+    duree = time.perf_counter() - debut
+    print(f"{duree} {(_memoire_ko('VmHWM') - avant) / 1e3}")
+    print(resultat.to_json())
+
+
+def main(nb_vols=10_000_000):
+    print(f"{'vols':>12}{'méthode':>20}{'durée (s)':>11}{'pic mémoire (Mo)':>18}")
+    resultats = {}
+    for methode in ('tri_par_jointures', 'tri_par_rangs'):
+        sortie = subprocess.run([sys.executable, '-m', 'benchmarks.bench_tri', '--mesurer', methode, str(nb_vols)],
+                                capture_output=True, text=True, check=True).stdout.splitlines()
+        duree, pic = map(float, sortie[-2].split())
+        resultats[methode] = sortie[-1]
+        print(f"{nb_vols:>12}{methode:>20}{duree:>11.2f}{pic:>18.0f}")
+    assert resultats['tri_par_jointures'] == resultats['tri_par_rangs'], "les deux méthodes n'affichent pas les mêmes vols"
+
+
+if __name__ == '__main__':
+    if sys.argv[1:2] == ['--mesurer']:
+        mesurer(sys.argv[2], int(sys.argv[3]))
+    else:
+        main(int(sys.argv[1]) if len(sys.argv) > 1 else 10_000_000)
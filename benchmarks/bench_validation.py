@@ -0,0 +1,118 @@
+"""
+Compare la validation ligne à ligne des vols (une passe de chaînes par règle : str.match, isin sur des ensembles)
+avec le moteur de règles de src.validation, qui n'évalue les règles de valeur que sur les valeurs distinctes.
+
+Usage : python -m benchmarks.bench_validation [nb_vols]
+"""
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from src.validation import REGLES_DONNEES, valider_tables
+
+
+def generer_tables(nb_vols, nb_avions=4000, taux_inconnus=0.01, graine=0):
+    """
+    Référentiels, relevés météo horaires et vols synthétiques en catégoriels comme après charger_vols et
+    charger_meteo, avec quelques clés inconnues et quelques humidités hors plage.
+    """
+    rng = np.random.default_rng(graine)
+    compagnies = np.array([f'{chr(65 + i // 10)}{i % 10}' for i in range(16)])
+    aeroports = np.array([f'A{i:03d}' for i in range(110)])
+    avions = np.array([f'N{i:05d}' for i in range(nb_avions)])
+    tailnums = np.concatenate([avions, [f'X{i:04d}' for i in range(int(nb_avions * taux_inconnus) + 1)]])
+
+    df_vols = pd.DataFrame({
+        'year': np.full(nb_vols, 2013, dtype='int16'),
+        'month': rng.integers(1, 13, nb_vols).astype('int8'),
+        'day': rng.integers(1, 29, nb_vols).astype('int8'),
+        'hour': rng.integers(5, 24, nb_vols).astype('int8'),
+        'minute': rng.integers(0, 60, nb_vols).astype('int8'),
+        'carrier': pd.Categorical.from_codes(rng.integers(0, len(compagnies), nb_vols), compagnies),
+        'flight': rng.integers(1, 8000, nb_vols).astype('int32'),
+        'tailnum': pd.Categorical.from_codes(rng.integers(0, len(tailnums), nb_vols), tailnums),
+        'origin': pd.Categorical.from_codes(rng.integers(0, 3, nb_vols), aeroports),
+        'dest': pd.Categorical.from_codes(rng.integers(3, len(aeroports), nb_vols), aeroports),
+    })
+    heures = pd.date_range('2013-01-01', '2013-12-31 23:00', freq='h')
+    nb_releves = 3 * len(heures)
+    df_meteo = pd.DataFrame({
+        'origin': pd.Categorical.from_codes(np.repeat(np.arange(3), len(heures)), aeroports),
+        'year': np.full(nb_releves, 2013, dtype='int16'),
+        'month': np.tile(heures.month, 3).astype('int8'),
+        'day': np.tile(heures.day, 3).astype('int8'),
+        'hour': np.tile(heures.hour, 3).astype('int8'),
+        'humid': np.where(rng.random(nb_releves) < taux_inconnus, 101.0, rng.uniform(10, 100, nb_releves)),
+        'wind_dir': pd.array(np.where(rng.random(nb_releves) < taux_inconnus, None,
+                                      rng.integers(0, 37, nb_releves) * 10), dtype='Int16'),
+    })
+    tables = {
+        'airlines': pd.DataFrame({'carrier': pd.array(compagnies, dtype='string')}),
+        'airports': pd.DataFrame({'faa': pd.array(aeroports, dtype='string'),
+                                  'lat': rng.uniform(-60, 70, len(aeroports)),
+                                  'lon': rng.uniform(-170, 170, len(aeroports))}),
+        'planes': pd.DataFrame({'tailnum': pd.array(avions, dtype='string'),
+                                'year': rng.integers(1960, 2014, nb_avions),
+                                'seats': rng.integers(2, 450, nb_avions)}),
+        'weather': df_meteo,
+        'flights': df_vols,
+    }
+    return tables
+
+
+def validation_ligne_a_ligne(tables):
+    """Ancienne approche : chaque règle reparcourt toutes les lignes, les clés étrangères via isin sur un ensemble."""
+    nb_violations = {}
+    for nom_table, regles in REGLES_DONNEES.items():
+        table = tables[nom_table]
+        for regle in regles:
+            if regle.type == 'unique':
+                cles = [regle.colonnes] if isinstance(regle.colonnes, str) else list(regle.colonnes)
+                masque = table.duplicated(subset=cles)
+            elif regle.type == 'non_nul':
+                masque = table[regle.colonnes].isnull()
+            elif regle.type == 'regex':
+                valeurs = table[regle.colonnes].astype(str)
+                masque = ~valeurs.str.match(regle.parametre)
+            elif regle.type == 'plage':
+                minimum, maximum = regle.parametre
+                valeurs = table[regle.colonnes]
+                masque = pd.Series(False, index=table.index)
+                if minimum is not None:
+                    masque |= valeurs < minimum
+                if maximum is not None:
+                    masque |= valeurs > maximum
+            else:
+                nom_reference, colonne_reference = regle.parametre
+                reference = set(tables[nom_reference][colonne_reference].dropna())
+                valeurs = table[regle.colonnes]
+                masque = valeurs.notnull() & ~valeurs.astype(str).isin(reference)
+            nb_violations[(nom_table, regle.colonnes, regle.type)] = int(masque.sum())
+    return nb_violations
+
+
+def validation_moteur(tables):
+    rapport = valider_tables(tables)
+    return {(l.table, l.colonnes, l.regle): l.nb_violations for l in rapport.resultats.itertuples(index=False)}
+
+
+def chronometrer(fonction, tables):
+    debut = time.perf_counter()
+    resultat = fonction(tables)
+    return time.perf_counter() - debut, resultat
+
+
+def main(nb_vols=10_000_000):
+    print(f"{'vols':>12}{'ligne à ligne (s)':>19}{'moteur (s)':>12}{'gain':>8}{'violations':>12}")
+    for n in (nb_vols // 10, nb_vols):
+        tables = generer_tables(n)
+        t_lignes, attendu = chronometrer(validation_ligne_a_ligne, tables)
+        t_moteur, obtenu = chronometrer(validation_moteur, tables)
+        assert attendu == obtenu, "les deux validations ne trouvent pas les mêmes violations"
+        print(f"{n:>12}{t_lignes:>19.2f}{t_moteur:>12.2f}{t_lignes / t_moteur:>7.1f}x{sum(obtenu.values()):>12}")
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10_000_000)
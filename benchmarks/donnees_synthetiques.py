@@ -0,0 +1,192 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+ORIGINES_NYC = ['EWR', 'JFK', 'LGA']
+# Codes ajoutés par preparer_donnees : ils ne doivent pas figurer dans les aéroports générés.
+AEROPORTS_AJOUTES = ['BQN', 'PSE', 'SJU', 'STT']
+
+COMPAGNIES = {
+    '9E': 'Endeavor Air Inc.', 'AA': 'American Airlines Inc.', 'AS': 'Alaska Airlines Inc.',
+    'B6': 'JetBlue Airways', 'DL': 'Delta Air Lines Inc.', 'EV': 'ExpressJet Airlines Inc.',
+    'F9': 'Frontier Airlines Inc.', 'FL': 'AirTran Airways Corporation', 'HA': 'Hawaiian Airlines Inc.',
+    'MQ': 'Envoy Air', 'OO': 'SkyWest Airlines Inc.', 'UA': 'United Air Lines Inc.',
+    'US': 'US Airways Inc.', 'VX': 'Virgin America', 'WN': 'Southwest Airlines Co.', 'YV': 'Mesa Airlines Inc.',
+}
+FUSEAUX = [(-5, 'America/New_York'), (-6, 'America/Chicago'), (-9, 'America/Anchorage'),
+           (-8, 'America/Los_Angeles'), (-7, 'America/Denver'), (-10, 'Pacific/Honolulu')]
+CONSTRUCTEURS = ['BOEING', 'AIRBUS INDUSTRIE', 'BOMBARDIER INC', 'AIRBUS', 'EMBRAER', 'MCDONNELL DOUGLAS']
+
+COLONNES_VOLS = ['year', 'month', 'day', 'dep_time', 'sched_dep_time', 'dep_delay',
+                 'arr_time', 'sched_arr_time', 'arr_delay', 'carrier', 'flight', 'tailnum',
+                 'origin', 'dest', 'air_time', 'distance', 'hour', 'minute', 'time_hour']
+
+
+def _poids_zipf(n, rng, exposant=1.1):
+    """Poids décroissants (loi de Zipf) dans un ordre aléatoire, pour simuler des distributions très asymétriques."""
+    poids = 1.0 / np.arange(1, n + 1) ** exposant
+    rng.shuffle(poids)
+    return poids / poids.sum()
+
+
+def generer_vols(nb_vols, carriers, destinations, tailnums, annee=2013, graine=0, graine_poids=None):
+    """
+    Génère un DataFrame de vols synthétiques au format de 'flights.csv'.
+    `graine_poids` fixe la répartition des vols entre compagnies, destinations et avions indépendamment
+    de `graine` : des blocs générés avec des graines différentes gardent ainsi la même asymétrie.
+    """
+    rng = np.random.default_rng(graine)
+    rng_poids = rng if graine_poids is None else np.random.default_rng(graine_poids)
+    carriers = np.asarray(carriers)
+    destinations = np.asarray(destinations)
+    tailnums = np.asarray(tailnums)
+
+    mois = rng.integers(1, 13, nb_vols)
+    jour = rng.integers(1, 29, nb_vols)
+    heure = rng.integers(5, 24, nb_vols)
+    minute = rng.integers(0, 60, nb_vols)
+    sched_dep = heure * 100 + minute
+    dep_delay = np.round(rng.gamma(0.6, 20.0, nb_vols) - 8.0)
+    annule = rng.random(nb_vols) < 0.02
+
+    dep_min = (heure * 60 + minute + dep_delay) % 1440
+    air_time = np.round(rng.uniform(30, 400, nb_vols))
+    arr_min = (dep_min + air_time + 20) % 1440
+    sched_arr_min = (heure * 60 + minute + air_time + 20) % 1440
+    arr_delay = dep_delay + np.round(rng.normal(-5.0, 10.0, nb_vols))
+
+    df = pd.DataFrame({
+        'year': np.full(nb_vols, annee),
+        'month': mois,
+        'day': jour,
+        'dep_time': np.where(annule, np.nan, (dep_min // 60) * 100 + dep_min % 60),
+        'sched_dep_time': sched_dep,
+        'dep_delay': np.where(annule, np.nan, dep_delay),
+        'arr_time': np.where(annule, np.nan, (arr_min // 60) * 100 + arr_min % 60),
+        'sched_arr_time': (sched_arr_min // 60) * 100 + sched_arr_min % 60,
+        'arr_delay': np.where(annule, np.nan, arr_delay),
+        'carrier': carriers[rng.choice(len(carriers), nb_vols, p=_poids_zipf(len(carriers), rng_poids))],
+        'flight': rng.integers(1, 8500, nb_vols),
+        'tailnum': tailnums[rng.choice(len(tailnums), nb_vols, p=_poids_zipf(len(tailnums), rng_poids, 0.5))],
+        'origin': rng.choice(ORIGINES_NYC, nb_vols, p=[0.36, 0.33, 0.31]),
+        'dest': destinations[rng.choice(len(destinations), nb_vols, p=_poids_zipf(len(destinations), rng_poids))],
+        'air_time': np.where(annule, np.nan, air_time),
+        'distance': np.round(air_time * 7.5 + 80),
+        'hour': heure,
+        'minute': minute,
+    })
+    df['time_hour'] = pd.to_datetime(dict(year=df['year'], month=df['month'], day=df['day'], hour=df['hour'])).dt.strftime('%Y-%m-%d %H:%M:%S')
+    return df[COLONNES_VOLS]
+
+
+def generer_vols_depuis_referentiels(nb_vols, df_aeroports, df_compagnies, df_avions, graine=0):
+    """Génère des vols cohérents avec les référentiels chargés (codes faa, carrier et tailnum existants)."""
+    destinations = df_aeroports.loc[~df_aeroports['faa'].isin(ORIGINES_NYC), 'faa'].to_numpy()
+    destinations = destinations[np.random.default_rng(graine).permutation(len(destinations))[:105]]
+    return generer_vols(nb_vols, df_compagnies['carrier'].to_numpy(), destinations,
+                        df_avions['tailnum'].to_numpy(), graine=graine)
+
+
+def _codes_uniques(rng, nb, longueur, exclus=(), prefixe=''):
+    """`nb` codes distincts de lettres majuscules et de chiffres, hors `exclus`."""
+    alphabet = np.array(list('ABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789'))
+    codes, exclus = [], set(exclus)
+    while len(codes) < nb:
+        tirage = [prefixe + ''.join(c) for c in alphabet[rng.integers(0, len(alphabet), (nb * 2, longueur))]]
+        codes = list(dict.fromkeys(codes + [c for c in tirage if c not in exclus]))
+    return codes[:nb]
+
+
+def generer_aeroports(nb_aeroports=1500, graine=0):
+    """Aéroports synthétiques au format de 'airports.csv', dont les trois aéroports de New York."""
+    rng = np.random.default_rng(graine)
+    codes = ORIGINES_NYC + _codes_uniques(rng, nb_aeroports - len(ORIGINES_NYC), 3,
+                                          exclus=ORIGINES_NYC + AEROPORTS_AJOUTES)
+    fuseaux = rng.choice(len(FUSEAUX), nb_aeroports, p=[0.36, 0.24, 0.16, 0.12, 0.1, 0.02])
+    return pd.DataFrame({
+        'faa': codes,
+        'name': [f'Aéroport {code}' for code in codes],
+        'lat': np.round(rng.uniform(19.0, 71.0, nb_aeroports), 7),
+        'lon': np.round(rng.uniform(-170.0, -67.0, nb_aeroports), 7),
+        'alt': rng.integers(0, 7000, nb_aeroports),
+        'tz': [FUSEAUX[i][0] for i in fuseaux],
+        'dst': rng.choice(['A', 'U', 'N'], nb_aeroports, p=[0.95, 0.03, 0.02]),
+        'tzone': [FUSEAUX[i][1] for i in fuseaux],
+    })
+
+
+def generer_compagnies(nb_compagnies=16, graine=0):
+    """Compagnies au format de 'airlines.json' : les 16 compagnies réelles, complétées par des codes générés."""
+    rng = np.random.default_rng(graine)
+    codes = list(COMPAGNIES)[:nb_compagnies]
+    codes += _codes_uniques(rng, nb_compagnies - len(codes), 2, exclus=codes)
+    return pd.DataFrame({'carrier': codes, 'name': [COMPAGNIES.get(code, f'Compagnie {code}') for code in codes]})
+
+
+def generer_avions(nb_avions=4000, graine=0):
+    """Avions synthétiques au format de 'planes.html' (année parfois inconnue, vitesse presque toujours vide)."""
+    rng = np.random.default_rng(graine)
+    moteurs = rng.choice([1, 2, 3, 4], nb_avions, p=[0.01, 0.987, 0.001, 0.002])
+    return pd.DataFrame({
+        'tailnum': _codes_uniques(rng, nb_avions, 5, prefixe='N'),
+        'year': pd.array(np.where(rng.random(nb_avions) < 0.02, np.nan, rng.integers(1960, 2014, nb_avions)),
+                         dtype='Int16'),
+        'type': np.where(moteurs == 1, 'Fixed wing single engine', 'Fixed wing multi engine'),
+        'manufacturer': rng.choice(CONSTRUCTEURS, nb_avions),
+        'model': [f'M-{i}' for i in rng.integers(100, 400, nb_avions)],
+        'engines': moteurs,
+        'seats': np.where(moteurs == 1, rng.integers(2, 10, nb_avions), rng.integers(50, 450, nb_avions)),
+        'speed': pd.array(np.where(rng.random(nb_avions) < 0.993, np.nan, rng.integers(90, 430, nb_avions)),
+                          dtype='Int16'),
+        'engine': np.where(moteurs == 1, 'Reciprocating', rng.choice(['Turbo-fan', 'Turbo-jet'], nb_avions)),
+    })
+
+
+def ecrire_avions_html(chemin, nb_avions, taille_bloc=200_000, graine=0):
+    """
+    Écrit un 'planes.html' de `nb_avions` lignes par blocs de `taille_bloc`, au format de DataFrame.to_html
+    (un seul tableau, index continu), pour les flottes trop grandes pour un seul to_html.
+    """
+    with open(chemin, 'w', encoding='utf-8') as f:
+        for numero, debut in enumerate(range(0, nb_avions, taille_bloc)):
+            bloc = generer_avions(min(taille_bloc, nb_avions - debut), graine + numero)
+            bloc.index += debut
+            html = bloc.to_html(na_rep='')
+            corps = html.index('<tbody>') + len('<tbody>')
+            fin = html.rindex('</tbody>')
+            if numero == 0:
+                f.write(html[:corps])
+            f.write(html[corps:fin])
+        f.write(html[fin:] + '\n')
+
+
+def ecrire_jeu(dossier, nb_vols, nb_aeroports=1500, nb_compagnies=16, nb_avions=4000, nb_destinations=105,
+               taille_bloc=1_000_000, graine=0):
+    """
+    Écrit dans `dossier` un jeu complet aux formats lus par les charger_* : airports.csv, airlines.json,
+    planes.html et flights.csv. Les vols sont générés et écrits par blocs de `taille_bloc` lignes, ce qui
+    permet de produire 50 millions de vols sans les garder en mémoire ; compagnies, destinations et avions
+    suivent des lois de Zipf identiques d'un bloc à l'autre.
+    Renvoie les chemins des fichiers par nom de table.
+    """
+    os.makedirs(dossier, exist_ok=True)
+    df_aeroports = generer_aeroports(nb_aeroports, graine)
+    df_compagnies = generer_compagnies(nb_compagnies, graine)
+    df_avions = generer_avions(nb_avions, graine)
+    chemins = {nom: os.path.join(dossier, fichier) for nom, fichier in (
+        ('airports', 'airports.csv'), ('airlines', 'airlines.json'),
+        ('planes', 'planes.html'), ('flights', 'flights.csv'))}
+
+    df_aeroports.to_csv(chemins['airports'], sep=';', decimal=',')
+    df_compagnies.to_json(chemins['airlines'], orient='records', force_ascii=False, indent=2)
+    df_avions.to_html(chemins['planes'], na_rep='')
+
+    destinations = df_aeroports.loc[~df_aeroports['faa'].isin(ORIGINES_NYC), 'faa'].to_numpy()
+    destinations = destinations[np.random.default_rng(graine).permutation(len(destinations))[:nb_destinations]]
+    for numero, debut in enumerate(range(0, nb_vols, taille_bloc)):
+        bloc = generer_vols(min(taille_bloc, nb_vols - debut), df_compagnies['carrier'].to_numpy(), destinations,
+                            df_avions['tailnum'].to_numpy(), graine=graine + numero, graine_poids=graine)
+        bloc.to_csv(chemins['flights'], index=False, encoding='latin1', mode='w' if numero == 0 else 'a',
+                    header=numero == 0)
+    return chemins
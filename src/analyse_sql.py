@@ -0,0 +1,247 @@
+import pandas as pd
+from sqlalchemy import bindparam, text
+
+from src.instrumentation import etape
+from src.rendu import afficher as afficher_resultat
+from src.resultats import (AnalyseParCompagnie, Classements, ComptagesSimples, ComptagesSuite,
+                           CouvertureCompagnies, DestinationsExclusives, FiltrageEtTri, PrincipalesCompagnies)
+
+# Mission 1 calculée par la base : les agrégats des vols sont gardés dans des tables de résumé
+# (quelques milliers de lignes au plus), reconstruites par rafraichir_resumes après populate_database.
+# Les questions ne lisent que ces résumés, les petites tables de dimensions et, pour les listes de vols
+# demandées (Houston, échantillon de la question 8), des requêtes filtrées ou limitées sur 'flights'.
+# Les résultats portent sur le contenu de la base, c'est-à-dire sur les données nettoyées par
+# preparer_donnees (doublons retirés, aéroports ajoutés) : ils peuvent différer de ceux calculés
+# sur les fichiers bruts.
+ORDRE_NOMS = 'd.name IS NULL, d.name, o.name IS NULL, o.name, c.name IS NULL, c.name'
+ORDRE_VOLS = 'f.year, f.month, f.day, f.sched_dep_time, f.carrier, f.flight'
+TAILLE_APERCU = 10
+
+RESUMES = {
+    'resume_vols': """
+        SELECT COUNT(*) AS nb_vols,
+               SUM(CASE WHEN dep_time IS NULL THEN 1 ELSE 0 END) AS nb_vols_annules
+        FROM flights""",
+    'resume_vols_par_origine': """
+        SELECT origin, COUNT(*) AS nb_vols FROM flights WHERE origin IS NOT NULL GROUP BY origin""",
+    'resume_vols_par_destination': """
+        SELECT dest, COUNT(*) AS nb_vols FROM flights WHERE dest IS NOT NULL GROUP BY dest""",
+    'resume_vols_par_avion': """
+        SELECT tailnum, COUNT(*) AS nb_vols FROM flights WHERE tailnum IS NOT NULL GROUP BY tailnum""",
+    'resume_vols_par_compagnie': """
+        SELECT carrier, COUNT(*) AS nb_vols FROM flights WHERE carrier IS NOT NULL GROUP BY carrier""",
+    'resume_compagnie_origine': """
+        SELECT carrier, origin, COUNT(*) AS nb_vols, COUNT(DISTINCT dest) AS nb_destinations
+        FROM flights WHERE carrier IS NOT NULL AND origin IS NOT NULL GROUP BY carrier, origin""",
+    'resume_compagnie_destination': """
+        SELECT carrier, dest, COUNT(*) AS nb_vols
+        FROM flights WHERE carrier IS NOT NULL AND dest IS NOT NULL GROUP BY carrier, dest""",
+    # Début des vols triés par noms de destination, d'origine et de compagnie, noms absents (code inconnu
+    # des référentiels) en dernier comme dans VueTrieeVols ; les vols ex aequo sont départagés par date,
+    # heure prévue, compagnie et numéro de vol.
+    'resume_vols_tries': f"""
+        SELECT ROW_NUMBER() OVER (ORDER BY {ORDRE_NOMS}, {ORDRE_VOLS}) AS rang,
+               d.name AS dest_name, o.name AS origin_name, c.name, f.flight, f.tailnum
+        FROM flights f
+        LEFT JOIN airports d ON d.faa = f.dest
+        LEFT JOIN airports o ON o.faa = f.origin
+        LEFT JOIN airlines c ON c.carrier = f.carrier
+        ORDER BY {ORDRE_NOMS}, {ORDRE_VOLS}
+        LIMIT {TAILLE_APERCU}""",
+}
+
+# Index des recherches de vols faites directement sur 'flights' (Houston, NYC -> Seattle, compagnies).
+INDEX_VOLS = {
+    'flights_dest_idx': 'dest',
+    'flights_carrier_idx': 'carrier',
+}
+
+ORIGINES_NYC = ['EWR', 'JFK', 'LGA']
+
+
+def rafraichir_resumes(engine):
+    """
+    Reconstruit les tables de RESUMES à partir de 'flights', dans une seule transaction :
+    une lecture concurrente voit soit les anciens résumés, soit les nouveaux.
+    """
+    with etape('rafraichir_resumes', 'base'), engine.begin() as connexion:
+        for nom_index, colonne in INDEX_VOLS.items():
+            connexion.execute(text(f'CREATE INDEX IF NOT EXISTS {nom_index} ON flights ({colonne})'))
+        for nom_table, requete in RESUMES.items():
+            connexion.execute(text(f'DROP TABLE IF EXISTS {nom_table}'))
+            connexion.execute(text(f'CREATE TABLE {nom_table} AS {requete}'))
+    print(f" {len(RESUMES)} tables de résumé rafraîchies.")
+
+
+def _lire(connexion, requete, **parametres):
+    requete = text(requete)
+    for nom, valeur in parametres.items():
+        if isinstance(valeur, (list, tuple)):
+            requete = requete.bindparams(bindparam(nom, expanding=True))
+    return pd.read_sql(requete, connexion, params=parametres)
+
+
+def _valeur(connexion, requete, **parametres):
+    return connexion.execute(text(requete), parametres).scalar()
+
+
+def _comptes(connexion, table, colonne):
+    """Série nb_vols par valeur de `colonne`, par ordre décroissant, comme value_counts()."""
+    df = _lire(connexion, f'SELECT {colonne}, nb_vols FROM {table} ORDER BY nb_vols DESC, {colonne}')
+    return pd.Series(df['nb_vols'].to_numpy(), index=pd.Index(df[colonne], name=colonne), name='count')
+
+
+def _incidence(connexion, colonne):
+    """Ensembles d'aéroports (origine ou destination) desservis par compagnie."""
+    table = 'resume_compagnie_origine' if colonne == 'origin' else 'resume_compagnie_destination'
+    df = _lire(connexion, f'SELECT carrier, {colonne} FROM {table}')
+    return df.groupby('carrier')[colonne].agg(set)
+
+
+def _noms_compagnies(connexion):
+    return _lire(connexion, 'SELECT carrier, name FROM airlines').set_index('carrier')['name']
+
+
+def comptages_simples_sql(connexion):
+    return ComptagesSimples(
+        nb_aeroports=_valeur(connexion, 'SELECT COUNT(*) FROM airports'),
+        nb_compagnies=_valeur(connexion, 'SELECT COUNT(*) FROM airlines'),
+        nb_avions=_valeur(connexion, 'SELECT COUNT(*) FROM planes'),
+        nb_vols_annules=_valeur(connexion, 'SELECT nb_vols_annules FROM resume_vols'))
+
+
+def comptages_suite_sql(connexion):
+    return ComptagesSuite(
+        nb_departs_uniques=_valeur(connexion, 'SELECT COUNT(*) FROM resume_vols_par_origine'),
+        nb_destinations_uniques=_valeur(connexion, 'SELECT COUNT(*) FROM resume_vols_par_destination'),
+        nb_aeroports_sans_heure_ete=_valeur(connexion, "SELECT COUNT(*) FROM airports WHERE dst = 'N'"),
+        nb_fuseaux_horaires=_valeur(connexion, 'SELECT COUNT(DISTINCT tzone) FROM airports'))
+
+
+def classements_sql(connexion):
+    vols_par_origine = _comptes(connexion, 'resume_vols_par_origine', 'origin')
+    destinations = _lire(connexion, """
+        SELECT r.dest AS faa, a.name, r.nb_vols AS nombre_vols
+        FROM resume_vols_par_destination r LEFT JOIN airports a ON a.faa = r.dest
+        ORDER BY r.nb_vols DESC, r.dest""")
+    destinations['pourcentage'] = destinations['nombre_vols'] / _valeur(connexion, 'SELECT nb_vols FROM resume_vols') * 100
+    return Classements(aeroport_top=vols_par_origine.index[0],
+                       vols_par_avion=_comptes(connexion, 'resume_vols_par_avion', 'tailnum'),
+                       destinations=destinations)
+
+
+def par_compagnie_sql(connexion):
+    destinations = _lire(connexion, """
+        SELECT r.carrier, COUNT(*) AS nombre_destinations_uniques, a.name
+        FROM resume_compagnie_destination r JOIN airlines a ON a.carrier = r.carrier
+        GROUP BY r.carrier, a.name ORDER BY nombre_destinations_uniques DESC, r.carrier""")
+    destinations['pourcentage_destinations'] = (
+        destinations['nombre_destinations_uniques'] / destinations['nombre_destinations_uniques'].sum() * 100).round(2)
+    par_origine = _lire(connexion, """
+        SELECT r.carrier, r.origin, r.nb_destinations AS dest, a.name
+        FROM resume_compagnie_origine r JOIN airlines a ON a.carrier = r.carrier
+        ORDER BY r.nb_destinations DESC, r.carrier, r.origin""")
+    return AnalyseParCompagnie(destinations, par_origine)
+
+
+def filtrage_et_tri_sql(connexion):
+    vols_houston = _lire(connexion, f"SELECT * FROM flights f WHERE dest IN ('IAH', 'HOU') ORDER BY {ORDRE_VOLS}")
+    nyc_sea = connexion.execute(text("""
+        SELECT COUNT(*), COUNT(DISTINCT carrier), COUNT(DISTINCT tailnum)
+        FROM flights WHERE dest = 'SEA' AND origin IN :origines""").bindparams(
+        bindparam('origines', expanding=True)), {'origines': ORIGINES_NYC}).one()
+    vols_tries = _lire(connexion, 'SELECT dest_name, origin_name, name, flight, tailnum FROM resume_vols_tries '
+                                  'ORDER BY rang')
+    return FiltrageEtTri(
+        vols_houston=vols_houston,
+        vols_par_destination=_comptes(connexion, 'resume_vols_par_destination', 'dest'),
+        nb_vols_nyc_sea=nyc_sea[0],
+        nb_compagnies_nyc_sea=nyc_sea[1],
+        nb_avions_nyc_sea=nyc_sea[2],
+        vols_tries=vols_tries,
+    )
+
+
+def couverture_sql(connexion):
+    origines, destinations = _incidence(connexion, 'origin'), _incidence(connexion, 'dest')
+    toutes_origines = set().union(*origines)
+    toutes_destinations = set().union(*destinations)
+    compagnies = origines.index.union(destinations.index)
+    origines = origines.reindex(compagnies).map(lambda codes: codes if isinstance(codes, set) else set())
+    destinations = destinations.reindex(compagnies).map(lambda codes: codes if isinstance(codes, set) else set())
+    noms = _noms_compagnies(connexion)
+    tableau = pd.DataFrame({
+        'carrier': compagnies,
+        'name': noms.reindex(compagnies).to_numpy(),
+        'nb_origines': origines.map(len).to_numpy(),
+        'nb_destinations': destinations.map(len).to_numpy(),
+        'couvre_toutes_origines': (origines.map(len) == len(toutes_origines)).to_numpy(),
+        'couvre_toutes_destinations': (destinations.map(len) == len(toutes_destinations)).to_numpy(),
+        'origines': origines.to_numpy(),
+        'destinations': destinations.to_numpy(),
+    })
+    return CouvertureCompagnies(len(toutes_origines), len(toutes_destinations), tableau)
+
+
+def destinations_exclusives_sql(connexion):
+    df = _lire(connexion, """
+        SELECT r.dest, a.name FROM resume_compagnie_destination r LEFT JOIN airlines a ON a.carrier = r.carrier
+        ORDER BY r.dest, r.carrier""")
+    compagnies = df.groupby('dest')['name'].agg(list)
+    nb_compagnies = compagnies.map(len)
+    exclusives = compagnies[nb_compagnies == 1].to_dict()
+    peu_desservies = compagnies[nb_compagnies.between(2, 3)]
+    return DestinationsExclusives(exclusives, len(peu_desservies), peu_desservies.head(10).to_dict())
+
+
+def principales_compagnies_sql(connexion):
+    compagnies = _lire(connexion, 'SELECT carrier, name FROM airlines')
+    codes_trouves = {}
+    for nom_compagnie in ['United Air Lines Inc.', 'American Airlines Inc.', 'Delta Air Lines Inc.']:
+        code = compagnies[compagnies['name'].str.contains(nom_compagnie, case=False, na=False, regex=False)]['carrier']
+        if not code.empty:
+            codes_trouves[nom_compagnie] = code.tolist()
+    resultat = PrincipalesCompagnies(codes_trouves)
+
+    codes_recherches = [code for codes in codes_trouves.values() for code in codes]
+    if codes_recherches:
+        repartition = _lire(connexion, """
+            SELECT r.carrier, a.name, r.nb_vols FROM resume_vols_par_compagnie r JOIN airlines a ON a.carrier = r.carrier
+            WHERE r.carrier IN :codes ORDER BY r.nb_vols DESC, r.carrier""", codes=codes_recherches)
+        resultat.nb_vols = int(repartition['nb_vols'].sum())
+        repartition['pourcentage'] = repartition['nb_vols'] / max(resultat.nb_vols, 1) * 100
+        resultat.repartition = repartition
+        resultat.echantillon = _lire(connexion, f"""
+            SELECT carrier, flight, origin, dest, dep_time, arr_time FROM flights f WHERE carrier IN :codes
+            ORDER BY {ORDRE_VOLS} LIMIT 10""", codes=codes_recherches)
+    return resultat
+
+
+# Questions calculées par la base, dans l'ordre de src/execution.QUESTIONS.
+QUESTIONS_SQL = [
+    ('Q1', comptages_simples_sql),
+    ('Q1 (suite)', comptages_suite_sql),
+    ('Q2', classements_sql),
+    ('Q3', par_compagnie_sql),
+    ('Q4/Q5', filtrage_et_tri_sql),
+    ('Q6', couverture_sql),
+    ('Q7', destinations_exclusives_sql),
+    ('Q8', principales_compagnies_sql),
+]
+
+
+def executer_analyses_sql(engine, afficher=True):
+    """
+    Répond aux questions de la Mission 1 à partir des tables de résumé de la base (voir RESUMES),
+    qui doivent avoir été rafraîchies après le dernier chargement. Renvoie les résultats dans l'ordre
+    de QUESTIONS_SQL.
+    """
+    resultats = []
+    with engine.connect() as connexion:
+        for libelle, fonction in QUESTIONS_SQL:
+            with etape(f'{libelle} {fonction.__name__}', 'analyse'):
+                resultat = fonction(connexion)
+            if afficher:
+                afficher_resultat(resultat)
+            resultats.append(resultat)
+    return resultats
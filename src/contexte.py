@@ -0,0 +1,134 @@
+from collections import Counter
+
+import numpy as np
+import pandas as pd
+
+from src.cube import CubeVols
+from src.requetes import IndexVols, VueTrieeVols, _codes_et_valeurs
+
+
+def incidence_compagnies(df_vols):
+    """
+    Construit en une seule passe les matrices d'incidence compagnies × aéroports d'origine
+    et compagnies × destinations : m.loc[carrier, faa] vaut True si la compagnie a au moins un vol sur cet aéroport.
+    Seuls les compagnies et aéroports présents dans les vols apparaissent dans les matrices.
+    """
+    codes_compagnies, compagnies = _codes_et_valeurs(df_vols['carrier'])
+    compagnies_presentes = np.bincount(codes_compagnies[codes_compagnies >= 0], minlength=len(compagnies)) > 0
+    index = pd.Index(compagnies[compagnies_presentes], name='carrier')
+
+    incidence = {}
+    for colonne in ('origin', 'dest'):
+        codes_aeroports, aeroports = _codes_et_valeurs(df_vols[colonne])
+        valides = (codes_compagnies >= 0) & (codes_aeroports >= 0)
+        matrice = np.zeros((len(compagnies), len(aeroports)), dtype=bool)
+        matrice[codes_compagnies[valides], codes_aeroports[valides]] = True
+        aeroports_presents = matrice.any(axis=0)
+        incidence[colonne] = pd.DataFrame(matrice[np.ix_(compagnies_presentes, aeroports_presents)], index=index,
+                                          columns=pd.Index(aeroports[aeroports_presents], name=colonne))
+    return incidence
+
+
+def afficher_compteurs(compteurs):
+    """Affiche le nombre de calculs de chaque agrégat (compteurs d'un ou plusieurs contextes)."""
+    print("\n--- Agrégats calculés pendant la mission ---")
+    for nom, nombre in sorted(compteurs.items()):
+        print(f"  - {nom} : {nombre} calcul(s)")
+
+
+def _signature(df):
+    """Identité d'un DataFrame pour détecter qu'il a été remplacé ou modifié dans sa forme."""
+    if df is None:
+        return None
+    return id(df), df.shape, tuple(df.columns), tuple(map(str, df.dtypes))
+
+
+class ContexteAnalyse:
+    """
+    Agrégats dérivés des vols partagés par toutes les questions de la Mission 1.
+    Chaque agrégat est calculé à la première demande puis gardé en cache ; `compteurs` enregistre
+    le nombre de calculs effectifs de chaque agrégat.
+    Le cache est vidé automatiquement si l'un des DataFrames est remplacé ou change de forme
+    (lignes, colonnes, types). Après une modification en place des valeurs, appeler `invalider()`.
+    """
+
+    def __init__(self, df_vols, df_aeroports=None, df_compagnies=None):
+        self.df_vols = df_vols
+        self.df_aeroports = df_aeroports
+        self.df_compagnies = df_compagnies
+        self.compteurs = Counter()
+        self._cache = {}
+        self._signatures = self._signatures_courantes()
+
+    def _signatures_courantes(self):
+        return _signature(self.df_vols), _signature(self.df_aeroports), _signature(self.df_compagnies)
+
+    def invalider(self):
+        """Vide le cache des agrégats."""
+        self._cache.clear()
+        self._signatures = self._signatures_courantes()
+
+    def _obtenir(self, nom, calcul):
+        if self._signatures_courantes() != self._signatures:
+            self.invalider()
+        if nom not in self._cache:
+            self.compteurs[nom] += 1
+            self._cache[nom] = calcul()
+        return self._cache[nom]
+
+    def _comptes(self, colonne):
+        comptes = self.df_vols[colonne].value_counts()
+        return comptes[comptes > 0]  # les colonnes catégorielles listent aussi les codes absents
+
+    def vols_annules(self):
+        return self._obtenir('vols_annules', lambda: int(self.df_vols['dep_time'].isnull().sum()))
+
+    def vols_par_origine(self):
+        return self._obtenir('vols_par_origine', lambda: self._comptes('origin'))
+
+    def vols_par_destination(self):
+        return self._obtenir('vols_par_destination', lambda: self._comptes('dest'))
+
+    def vols_par_avion(self):
+        return self._obtenir('vols_par_avion', lambda: self._comptes('tailnum'))
+
+    def index_vols(self):
+        """Index des vols par route, compagnie, avion et date pour les recherches (voir `IndexVols`)."""
+        return self._obtenir('index_vols', lambda: IndexVols(self.df_vols))
+
+    def vue_triee(self):
+        """Vols triés par noms de destination, d'origine et de compagnie (voir `VueTrieeVols`)."""
+        return self._obtenir('vue_triee', lambda: VueTrieeVols(self.df_vols, self.df_aeroports, self.df_compagnies))
+
+    def cube(self, grain='jour'):
+        """Cube des retards et du trafic par compagnie, route et date (voir `CubeVols`)."""
+        return self._obtenir(f'cube_{grain}', lambda: CubeVols.construire(self.df_vols, grain))
+
+    def incidence(self):
+        """Matrices compagnies × origines et compagnies × destinations (voir `incidence_compagnies`)."""
+        return self._obtenir('incidence', lambda: incidence_compagnies(self.df_vols))
+
+    def destinations_par_compagnie(self):
+        """Nombre de destinations distinctes par compagnie, par ordre décroissant."""
+        return self._obtenir('destinations_par_compagnie', lambda: (
+            self.incidence()['dest'].sum(axis=1).rename('dest').sort_values(ascending=False)))
+
+    def destinations_par_compagnie_origine(self):
+        """Nombre de destinations distinctes par couple (compagnie, aéroport d'origine)."""
+        return self._obtenir('destinations_par_compagnie_origine', lambda: (
+            self.df_vols.groupby(['carrier', 'origin'], observed=True)['dest'].nunique()))
+
+    def noms_compagnies(self):
+        """Table de correspondance carrier -> nom de la compagnie."""
+        return self._obtenir('noms_compagnies', lambda: self.df_compagnies.set_index('carrier')['name'])
+
+    def noms_aeroports(self):
+        """Table de correspondance faa -> nom de l'aéroport."""
+        return self._obtenir('noms_aeroports', lambda: self.df_aeroports.set_index('faa')['name'])
+
+    def nom_compagnie(self, carrier):
+        return self.noms_compagnies().get(carrier)
+
+    def resume(self):
+        """Affiche le nombre de calculs de chaque agrégat pendant la mission."""
+        afficher_compteurs(self.compteurs)
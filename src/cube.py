@@ -0,0 +1,237 @@
+import numpy as np
+import pandas as pd
+
+from src.requetes import _codes_et_valeurs
+from src.schemas import memoire_mo
+from src.streaming import TAILLE_BLOC, iterer_vols
+
+# Un vol est à l'heure s'il arrive avec au plus 15 minutes de retard (définition du DOT américain).
+SEUIL_PONCTUALITE = 15
+
+# Clés des cellules selon la finesse du découpage dans le temps.
+GRAINS = {
+    'jour': ('carrier', 'origin', 'dest', 'year', 'month', 'day'),
+    'heure': ('carrier', 'origin', 'dest', 'year', 'month', 'day', 'hour'),
+}
+
+# Colonnes numériques résumées dans chaque cellule (effectif, somme, somme des carrés, minimum, maximum).
+MESURES = ('dep_delay', 'arr_delay', 'distance')
+
+# Colonnes des vols lues pour construire un cube (voir construire_cube_en_flux).
+COLONNES_CUBE = list(GRAINS['heure']) + ['dep_time'] + list(MESURES)
+
+
+def _fusions():
+    """Opération qui combine deux cellules de même clé, pour chaque colonne du cube."""
+    fusions = {'nb_vols': 'sum', 'nb_annules': 'sum', 'nb_a_l_heure': 'sum'}
+    for mesure in MESURES:
+        fusions.update({f'{mesure}_nb': 'sum', f'{mesure}_somme': 'sum', f'{mesure}_somme_carres': 'sum',
+                        f'{mesure}_min': 'min', f'{mesure}_max': 'max'})
+    return fusions
+
+
+FUSIONS = _fusions()
+
+# Les comptages d'une cellule tiennent sur 32 bits ; sommes et sommes des carrés restent en float64.
+COMPTAGES = [colonne for colonne in FUSIONS if colonne.startswith('nb_') or colonne.endswith('_nb')]
+
+
+def _compacter(cellules):
+    """Ramène les comptages des cellules en int32 (le groupby les rend en int64)."""
+    return cellules.astype({colonne: 'int32' for colonne in COMPTAGES})
+
+
+def _regrouper(cellules, cles, colonnes=None):
+    """
+    Combine les cellules qui partagent les mêmes `cles` (fusion de cubes ou cumul sur moins de clés),
+    pour les `colonnes` d'agrégats demandées (toutes par défaut).
+    """
+    fusions = FUSIONS if colonnes is None else {colonne: FUSIONS[colonne] for colonne in colonnes}
+    return (cellules[list(cles) + list(fusions)]
+            .groupby(list(cles), observed=True, sort=False, dropna=False).agg(fusions))
+
+
+class CubeVols:
+    """
+    Agrégats pré-calculés des vols par (compagnie, origine, destination, année, mois, jour[, heure]).
+    Chaque cellule garde le nombre de vols, d'annulations (dep_time manquant) et d'arrivées à l'heure, et pour
+    chaque mesure de MESURES son effectif non manquant, sa somme, sa somme des carrés, son minimum et son maximum.
+    Ces agrégats s'additionnent : deux cubes se fusionnent sans relire les vols (`fusionner`, `ajouter`),
+    et tout cumul sur un sous-ensemble des clés (`cumul`, `statistiques`, `taux_ponctualite`...) se calcule
+    sur les cellules, bien moins nombreuses que les vols.
+    """
+
+    def __init__(self, cellules, grain='jour', seuil=SEUIL_PONCTUALITE):
+        self.cellules = cellules
+        self.grain = grain
+        self.seuil = seuil
+        self._groupes = {}  # clés de cumul -> (numéro de groupe de chaque cellule, index des groupes)
+
+    @property
+    def cles(self):
+        return GRAINS[self.grain]
+
+    @classmethod
+    def construire(cls, df_vols, grain='jour', seuil=SEUIL_PONCTUALITE):
+        """Construit le cube d'un DataFrame de vols en un seul regroupement vectorisé."""
+        if grain not in GRAINS:
+            raise ValueError(f"Grain de cube inconnu : {grain!r} (attendu : {', '.join(GRAINS)})")
+        cles = GRAINS[grain]
+        colonnes = {cle: df_vols[cle] for cle in cles}
+        colonnes['annule'] = df_vols['dep_time'].isna()
+        colonnes['a_l_heure'] = df_vols['arr_delay'] <= seuil
+        agregats = {'nb_vols': ('annule', 'size'), 'nb_annules': ('annule', 'sum'),
+                    'nb_a_l_heure': ('a_l_heure', 'sum')}
+        for mesure in MESURES:
+            valeurs = df_vols[mesure].astype('float64')  # sommes en double précision
+            colonnes[mesure] = valeurs
+            colonnes[f'{mesure}_carre'] = valeurs * valeurs
+            agregats.update({f'{mesure}_nb': (mesure, 'count'), f'{mesure}_somme': (mesure, 'sum'),
+                             f'{mesure}_somme_carres': (f'{mesure}_carre', 'sum'),
+                             f'{mesure}_min': (mesure, 'min'), f'{mesure}_max': (mesure, 'max')})
+        cellules = (pd.DataFrame(colonnes, copy=False)
+                    .groupby(list(cles), observed=True, sort=False, dropna=False).agg(**agregats).reset_index())
+        # Minimums et maximums sont des valeurs de la colonne : ils reprennent son type (float32 après charger_vols).
+        extremes = {f'{mesure}_{agregat}': df_vols[mesure].dtype for mesure in MESURES for agregat in ('min', 'max')
+                    if df_vols[mesure].dtype.kind == 'f'}
+        return cls(_compacter(cellules).astype(extremes), grain, seuil)
+
+    def fusionner(self, autre):
+        """Nouveau cube qui cumule les vols des deux cubes (même grain et même seuil de ponctualité)."""
+        if (autre.grain, autre.seuil) != (self.grain, self.seuil):
+            raise ValueError("Seuls des cubes de même grain et de même seuil de ponctualité se fusionnent.")
+        cellules = pd.concat([self.cellules, autre.cellules], ignore_index=True)
+        for cle in ('carrier', 'origin', 'dest'):
+            # Des catégories différentes d'un cube à l'autre donnent une colonne objet après concat.
+            if not isinstance(cellules[cle].dtype, pd.CategoricalDtype):
+                cellules[cle] = cellules[cle].astype('category')
+        return CubeVols(_compacter(_regrouper(cellules, self.cles).reset_index()), self.grain, self.seuil)
+
+    def ajouter(self, df_vols):
+        """Intègre de nouveaux vols au cube (sans relire les vols déjà comptés)."""
+        self.cellules = self.fusionner(CubeVols.construire(df_vols, self.grain, self.seuil)).cellules
+        self._groupes.clear()
+        return self
+
+    def __len__(self):
+        return len(self.cellules)
+
+    def nb_vols(self):
+        return int(self.cellules['nb_vols'].sum())
+
+    def memoire_mo(self):
+        return memoire_mo(self.cellules)
+
+    def _groupes_cumul(self, par):
+        """
+        Numéro de groupe de chaque cellule pour un cumul par les clés `par`, et index des groupes.
+        Les codes des clés sont combinés en un seul entier par cellule ; calculé une fois par jeu de clés.
+        """
+        if par not in self._groupes:
+            codes, valeurs = zip(*(_codes_et_valeurs(self.cellules[cle]) for cle in par))
+            tailles = [len(v) + 1 for v in valeurs]  # case 0 : valeur manquante
+            numeros = np.ravel_multi_index([c.astype(np.int64) + 1 for c in codes], tailles)
+            if np.prod(tailles, dtype=np.float64) <= 4 * len(numeros) + 1024:
+                comptes = np.bincount(numeros, minlength=int(np.prod(tailles)))
+                presents = np.flatnonzero(comptes)
+                position = np.zeros(len(comptes), dtype=np.int64)
+                position[presents] = np.arange(len(presents))
+                groupes = position[numeros]
+            else:
+                presents, groupes = np.unique(numeros, return_inverse=True)
+
+            niveaux = []
+            for cle, cases, valeurs_cle in zip(par, np.unravel_index(presents, tailles), valeurs):
+                if isinstance(self.cellules[cle].dtype, pd.CategoricalDtype):
+                    niveaux.append(pd.Categorical.from_codes(cases - 1, categories=valeurs_cle))
+                elif (cases > 0).all():
+                    niveaux.append(valeurs_cle[cases - 1])
+                else:
+                    niveaux.append(pd.array(valeurs_cle).take(cases - 1, allow_fill=True))
+            index = pd.MultiIndex.from_arrays(niveaux, names=par) if len(par) > 1 else pd.Index(niveaux[0], name=par[0])
+            ordre = index.argsort()
+            self._groupes[par] = np.argsort(ordre)[groupes], index[ordre]
+        return self._groupes[par]
+
+    def _cumuler(self, par, colonnes=None):
+        """
+        Agrégats cumulés par les clés `par` : tableaux numpy par colonne et index des groupes (triés par clés).
+        Sommes (np.bincount), minimums et maximums (np.fmin.at, np.fmax.at, qui ignorent les NaN) sont cumulés
+        par numéro de groupe : quelques millisecondes là où un groupby pandas sur les cellules en prend
+        plusieurs dizaines.
+        """
+        par = (par,) if isinstance(par, str) else tuple(par)
+        inconnues = set(par) - set(self.cles)
+        if inconnues:
+            raise ValueError(f"Clé(s) absente(s) du cube : {sorted(inconnues)}")
+        groupes, index = self._groupes_cumul(par)
+
+        cumuls = {}
+        for colonne in (FUSIONS if colonnes is None else colonnes):
+            valeurs = self.cellules[colonne].to_numpy()
+            if FUSIONS[colonne] == 'sum':
+                cumul = np.bincount(groupes, weights=valeurs, minlength=len(index))
+                if valeurs.dtype.kind in 'iu':
+                    cumul = cumul.astype(np.int64)
+            else:
+                cumul = np.full(len(index), np.nan, dtype=valeurs.dtype)  # même type : chemin rapide de ufunc.at
+                (np.fmin if FUSIONS[colonne] == 'min' else np.fmax).at(cumul, groupes, valeurs)
+            cumuls[colonne] = cumul
+        return cumuls, index
+
+    def cumul(self, par, colonnes=None):
+        """
+        Agrégats bruts cumulés par les clés `par` (une clé ou une liste de clés du cube), triés par clés ;
+        `colonnes` limite le calcul aux agrégats utiles.
+        """
+        cumuls, index = self._cumuler(par, colonnes)
+        return pd.DataFrame(cumuls, index=index)
+
+    def statistiques(self, par, mesure='arr_delay'):
+        """
+        Effectif, moyenne, écart-type (comme Series.std, ddof=1), minimum et maximum de `mesure`
+        cumulés par les clés `par`.
+        """
+        cumuls, index = self._cumuler(par, [f'{mesure}_{agregat}'
+                                            for agregat in ('nb', 'somme', 'somme_carres', 'min', 'max')])
+        nb = cumuls[f'{mesure}_nb']
+        somme = cumuls[f'{mesure}_somme']
+        with np.errstate(divide='ignore', invalid='ignore'):
+            moyenne = np.where(nb > 0, somme / nb, np.nan)
+            variance = np.where(nb > 1, (cumuls[f'{mesure}_somme_carres'] - somme * moyenne) / (nb - 1), np.nan)
+        return pd.DataFrame({
+            'nb': nb,
+            'moyenne': moyenne,
+            'ecart_type': np.sqrt(np.maximum(variance, 0)),
+            'min': cumuls[f'{mesure}_min'],
+            'max': cumuls[f'{mesure}_max'],
+        }, index=index)
+
+    def _taux(self, par, numerateur, denominateur, nom):
+        cumuls, index = self._cumuler(par, [numerateur, denominateur])
+        with np.errstate(divide='ignore', invalid='ignore'):
+            taux = np.where(cumuls[denominateur] > 0, cumuls[numerateur] / cumuls[denominateur], np.nan)
+        return pd.Series(taux, index=index, name=nom)
+
+    def taux_ponctualite(self, par=('carrier', 'year', 'month')):
+        """Part des vols arrivés avec au plus `seuil` minutes de retard, parmi ceux dont le retard est connu."""
+        return self._taux(par, 'nb_a_l_heure', 'arr_delay_nb', 'taux_ponctualite')
+
+    def taux_annulation(self, par=('carrier', 'year', 'month')):
+        """Part des vols annulés (dep_time manquant)."""
+        return self._taux(par, 'nb_annules', 'nb_vols', 'taux_annulation')
+
+    def retard_moyen_par_route(self, mesure='arr_delay'):
+        """Retard moyen (minutes) de chaque route (origin, dest), du plus fort au plus faible."""
+        return self.statistiques(('origin', 'dest'), mesure)['moyenne'].sort_values(ascending=False)
+
+
+def construire_cube_en_flux(source, grain='jour', taille_bloc=TAILLE_BLOC):
+    """
+    Construit le cube d'une source de vols (fichier CSV ou dossier de CSV) lue par blocs :
+    seuls le cube et le bloc en cours sont en mémoire.
+    """
+    cube = None
+    for bloc in iterer_vols(source, taille_bloc, colonnes=COLONNES_CUBE):
+        cube = CubeVols.construire(bloc, grain) if cube is None else cube.ajouter(bloc)
+    return cube
@@ -1,42 +1,424 @@
+import hashlib
+import io
+import json
+import math
+import multiprocessing
+import os
+import re
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
 import pandas as pd
 
-def charger_aeroports(fichier='data/airports.csv'):
-    """Charge les données des aéroports depuis un fichier CSV."""
+from src.instrumentation import etape, pic_rss_mo
+from src.schemas import (SCHEMA_AEROPORTS, SCHEMA_AVIONS, SCHEMA_COMPAGNIES, SCHEMA_METEO, SCHEMA_VOLS,
+                         appliquer_schema, dtypes_lecture, memoire_mo)
+
+# Les instantanés Parquet sont rangés dans un dossier '.cache' à côté des fichiers sources.
+# VERSION_CACHE doit être incrémentée dès que la façon de lire un fichier change.
+NOM_DOSSIER_CACHE = '.cache'
+VERSION_CACHE = 3
+
+# Extraction du PDF météo : nombre de pages extraites par tâche du pool de processus.
+PAGES_PAR_TACHE = 10
+
+# Lecture du HTML des avions : textes tenus pour manquants (ceux de pandas) et blancs réduits par pd.read_html.
+VALEURS_MANQUANTES = frozenset({
+    '', '#N/A', '#N/A N/A', '#NA', '-1.#IND', '-1.#QNAN', '-NaN', '-nan', '1.#IND', '1.#QNAN', '<NA>', 'N/A',
+    'NA', 'NULL', 'NaN', 'None', 'n/a', 'nan', 'null',
+})
+_RE_ESPACES = re.compile(r'[\r\n]+|\s{2,}')
+TAILLE_BLOC_HTML = 65_536  # lignes lues entre deux compactages des colonnes de texte
+
+
+def _empreinte_fichier(fichier):
+    """Calcule l'empreinte SHA-256 du contenu d'un fichier."""
+    sha = hashlib.sha256()
+    with open(fichier, 'rb') as f:
+        for bloc in iter(lambda: f.read(1 << 20), b''):
+            sha.update(bloc)
+    return sha.hexdigest()
+
+
+def _chemins_cache(fichier):
+    """Renvoie les chemins de l'instantané Parquet et de ses métadonnées pour un fichier source."""
+    dossier = os.path.join(os.path.dirname(os.path.abspath(fichier)), NOM_DOSSIER_CACHE)
+    base = os.path.basename(fichier)
+    return os.path.join(dossier, base + '.parquet'), os.path.join(dossier, base + '.json')
+
+
+def _lire_cache(fichier):
+    """
+    Lit l'instantané Parquet d'un fichier s'il est encore valide, sinon renvoie None.
+    L'instantané est valide si la date de modification et la taille de la source n'ont pas changé,
+    ou, si elles ont changé, si l'empreinte SHA-256 du contenu est toujours la même.
+    """
+    stat = os.stat(fichier)
+    chemin_parquet, chemin_meta = _chemins_cache(fichier)
     try:
-        df = pd.read_csv(fichier, sep=';', index_col=0, decimal=',')
-        print(f" Fichier '{fichier}' chargé avec succès.")
+        with open(chemin_meta, encoding='utf-8') as f:
+            meta = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    if meta.get('version') != VERSION_CACHE or meta.get('taille') != stat.st_size:
+        return None
+    if meta.get('mtime_ns') != stat.st_mtime_ns:
+        if meta.get('sha256') != _empreinte_fichier(fichier):
+            return None
+        meta['mtime_ns'] = stat.st_mtime_ns
+        with open(chemin_meta, 'w', encoding='utf-8') as f:
+            json.dump(meta, f)
+
+    try:
+        return pd.read_parquet(chemin_parquet)
+    except (ImportError, OSError, ValueError):
+        return None
+
+
+def _ecrire_cache(fichier, df):
+    """Écrit l'instantané Parquet d'un DataFrame et les métadonnées de son fichier source."""
+    chemin_parquet, chemin_meta = _chemins_cache(fichier)
+    stat = os.stat(fichier)
+    meta = {
+        'version': VERSION_CACHE,
+        'taille': stat.st_size,
+        'mtime_ns': stat.st_mtime_ns,
+        'sha256': _empreinte_fichier(fichier),
+    }
+    try:
+        os.makedirs(os.path.dirname(chemin_parquet), exist_ok=True)
+        df.to_parquet(chemin_parquet)
+        with open(chemin_meta, 'w', encoding='utf-8') as f:
+            json.dump(meta, f)
+    except (ImportError, OSError, TypeError, ValueError) as e:
+        print(f" Avertissement : impossible d'écrire le cache de '{fichier}' : {e}")
+
+
+def _rapport_memoire(df, pic_avant):
+    """Résumé mémoire d'un DataFrame chargé : taille en mémoire et hausse du pic RSS pendant la lecture."""
+    rapport = f"{len(df)} lignes, {memoire_mo(df):.1f} Mo"
+    pic_apres = pic_rss_mo()
+    if pic_avant is not None and pic_apres is not None:
+        rapport += f", pic RSS +{pic_apres - pic_avant:.1f} Mo"
+    return rapport
+
+
+def _charger_avec_cache(fichier, lecteur, utiliser_cache):
+    """Lit un fichier via son instantané Parquet s'il est valide, sinon avec `lecteur` puis met le cache à jour."""
+    with etape(os.path.basename(fichier), 'chargement') as span:
+        pic_avant = pic_rss_mo()
+        if utiliser_cache:
+            df = _lire_cache(fichier)
+            if df is not None:
+                span.lignes = len(df)
+                print(f" Fichier '{fichier}' chargé depuis le cache ({_rapport_memoire(df, pic_avant)}).")
+                return df
+
+        df = lecteur(fichier)
+        if utiliser_cache:
+            _ecrire_cache(fichier, df)
+        span.lignes = len(df)
+        print(f" Fichier '{fichier}' chargé avec succès ({_rapport_memoire(df, pic_avant)}).")
         return df
+
+
+def _lire_csv_type(fichier, schema, **options):
+    """
+    Lit un CSV en appliquant le schéma dès l'analyse.
+    Si une colonne ne respecte pas le schéma (valeur manquante dans un entier, texte dans un nombre),
+    le fichier est relu sans types imposés puis converti colonne par colonne.
+    """
+    try:
+        df = pd.read_csv(fichier, dtype=dtypes_lecture(schema), **options)
+    except (ValueError, TypeError):
+        if hasattr(fichier, 'seek'):
+            fichier.seek(0)
+        df = pd.read_csv(fichier, **options)
+    return appliquer_schema(df, schema)
+
+
+def _lire_aeroports(fichier):
+    return _lire_csv_type(fichier, SCHEMA_AEROPORTS, sep=';', index_col=0, decimal=',')
+
+
+def _lire_vols(fichier):
+    return _lire_csv_type(fichier, SCHEMA_VOLS, encoding='latin1')
+
+
+def _lire_compagnies(fichier):
+    return appliquer_schema(pd.read_json(fichier, dtype=False), SCHEMA_COMPAGNIES)
+
+
+def _texte_cellule(cellule):
+    """Texte d'une cellule normalisé comme le fait pd.read_html (<br> compris comme un saut de ligne)."""
+    if len(cellule):
+        for br in cellule.iter('br'):
+            br.tail = '\n' + (br.tail or '')
+        texte = ''.join(cellule.itertext())
+    else:
+        texte = cellule.text
+        if texte is None or texte.isalnum():  # cas courant : rien à normaliser
+            return texte or ''
+    return _RE_ESPACES.sub(' ', texte.strip())
+
+
+def _nombre(texte):
+    """Valeur d'une cellule numérique ; NaN si elle est vide ou n'est pas un nombre."""
+    if texte in VALEURS_MANQUANTES:
+        return math.nan
+    try:
+        return float(texte.replace(',', '') if ',' in texte else texte)  # read_html : thousands=','
+    except ValueError:
+        return math.nan
+
+
+def _est_nombre(texte):
+    """Vrai si pd.read_html lirait ce texte comme un nombre ou un booléen."""
+    if texte.lower() in ('true', 'false'):
+        return True
+    try:
+        float(texte.replace(',', ''))
+    except ValueError:
+        return False
+    return True
+
+
+class _ColonneHtml:
+    """
+    Valeurs d'une colonne du tableau HTML, rangées au fil de la lecture selon le type du schéma :
+    nombres dans un array('d'), catégories en codes array('i') avec le dictionnaire des valeurs
+    rencontrées, textes par blocs convertis en tableaux de chaînes pandas (`vider`).
+    """
+
+    def __init__(self, dtype):
+        self.dtype = dtype
+        self.que_des_nombres = True  # read_html convertirait une colonne de texte entièrement numérique
+        if dtype == 'category':
+            self.valeurs = array('i')
+            self.codes = {}
+        elif dtype == 'string':
+            self.valeurs = []
+            self.blocs = []
+        else:
+            self.valeurs = array('d')
+
+    def ajouter(self, texte):
+        if self.dtype == 'category':
+            if texte in VALEURS_MANQUANTES:
+                self.valeurs.append(-1)
+            else:
+                self.valeurs.append(self.codes.setdefault(texte, len(self.codes)))
+        elif self.dtype == 'string':
+            self.valeurs.append(None if texte in VALEURS_MANQUANTES else texte)
+        else:
+            self.valeurs.append(_nombre(texte))
+
+    def vider(self):
+        """Range les textes du bloc en cours dans un tableau de chaînes, bien plus compact qu'une liste."""
+        if self.dtype == 'string' and self.valeurs:
+            self.que_des_nombres = self.que_des_nombres and all(
+                texte is None or _est_nombre(texte) for texte in self.valeurs)
+            self.blocs.append(pd.array(self.valeurs, dtype='str'))
+            self.valeurs = []
+
+    def serie(self, index):
+        """
+        Colonne finale, aux types que donne appliquer_schema après pd.read_html. Lève ValueError pour une
+        colonne de texte entièrement numérique, que read_html aurait convertie.
+        """
+        self.vider()
+        if self.dtype == 'category':
+            self.que_des_nombres = all(_est_nombre(texte) for texte in self.codes)
+        if self.dtype in ('category', 'string') and self.que_des_nombres:
+            raise ValueError("Colonne de texte entièrement numérique.")
+        if self.dtype == 'category':
+            # astype('category') trie les catégories : les codes sont renumérotés dans l'ordre trié.
+            valeurs = np.array(list(self.codes), dtype=object)
+            ordre = np.argsort(valeurs, kind='stable')
+            rangs = np.empty(len(ordre) + 1, dtype=np.int32)
+            rangs[ordre] = np.arange(len(ordre), dtype=np.int32)
+            rangs[-1] = -1  # le code -1 (valeur manquante) reste -1
+            codes = rangs[np.frombuffer(self.valeurs, dtype=np.int32)]
+            return pd.Series(pd.Categorical.from_codes(codes, pd.Index(list(valeurs[ordre]))), index=index)
+        if self.dtype == 'string':
+            serie = pd.concat([pd.Series(bloc) for bloc in self.blocs], ignore_index=True)
+            return serie.set_axis(index)
+        valeurs = pd.Series(np.frombuffer(self.valeurs, dtype=np.float64), index=index)
+        dtype = self.dtype
+        if dtype.startswith('int') and valeurs.isna().any():
+            dtype = dtype.capitalize()
+        return valeurs.astype(dtype)
+
+
+def _index_html(entiers):
+    """Index du DataFrame à partir des en-têtes de ligne, en RangeIndex (comme read_html) s'ils forment une suite arithmétique."""
+    if len(entiers) == 0:
+        return pd.RangeIndex(0)
+    if len(entiers) > 1 and entiers[1] != entiers[0]:
+        pas = entiers[1] - entiers[0]
+        if np.array_equal(entiers, np.arange(entiers[0], entiers[-1] + pas, pas)):
+            return pd.RangeIndex(entiers[0], entiers[-1] + pas, pas)
+    return pd.Index(entiers)
+
+
+def _lire_table_html(fichier, schema):
+    """
+    Lit en continu le premier tableau d'un fichier HTML écrit par DataFrame.to_html (première colonne
+    d'en-têtes de ligne = index) : lxml.etree.iterparse rend chaque <tr> dès sa fermeture, ses cellules
+    vont directement dans les colonnes typées puis la ligne est libérée. La mémoire reste de l'ordre
+    des colonnes finales au lieu de l'arbre HTML complet et des listes de textes de pd.read_html.
+
+    Le tableau est lu avec l'analyseur XML de libxml2, qui ne garde pas le texte déjà lu (l'analyseur HTML
+    en continu conserve tout le fichier) ; to_html produit un tableau XML bien formé. Lève ValueError si le
+    tableau sort de ce format (erreur d'analyse avant la fin du tableau, fusion de cellules, en-tête sur
+    plusieurs lignes, colonne absente du schéma, lignes de longueurs différentes, index non entier).
+    """
+    from lxml import etree
+
+    lecture = etree.iterparse(fichier, events=('end',), tag=('tr', 'table'), recover=True)
+    en_tete, colonnes, index = None, None, array('q')
+    try:
+        for _, element in lecture:
+            if element.tag == 'table':
+                break
+            cellules = [cellule for cellule in element if cellule.tag in ('td', 'th')]
+            for cellule in cellules:
+                if cellule.attrib and (int(cellule.get('colspan', 1)) > 1 or int(cellule.get('rowspan', 1)) > 1):
+                    raise ValueError("Tableau HTML avec cellules fusionnées.")
+            textes = [_texte_cellule(cellule) for cellule in cellules]
+            if en_tete is None:
+                if element.getparent().tag != 'thead' and any(cellule.tag != 'th' for cellule in cellules):
+                    raise ValueError("Tableau HTML sans ligne d'en-tête.")
+                en_tete = textes
+                if len(set(en_tete[1:])) != len(en_tete) - 1 or any(nom not in schema for nom in en_tete[1:]):
+                    raise ValueError("Colonnes du tableau HTML différentes du schéma.")
+                colonnes = [_ColonneHtml(schema[nom]) for nom in en_tete[1:]]
+            elif element.getparent().tag == 'thead':
+                raise ValueError("En-tête HTML sur plusieurs lignes.")
+            elif any(textes):  # read_html ignore les lignes entièrement vides
+                if len(textes) != len(en_tete):
+                    raise ValueError("Ligne du tableau HTML de longueur inattendue.")
+                index.append(int(textes[0]))
+                for colonne, texte in zip(colonnes, textes[1:]):
+                    colonne.ajouter(texte)
+                if len(index) % TAILLE_BLOC_HTML == 0:
+                    for colonne in colonnes:
+                        colonne.vider()
+            # Libère la ligne lue et celles qui la précèdent dans l'arbre.
+            element.clear()
+            while element.getprevious() is not None:
+                del element.getparent()[0]
+    except etree.LxmlError as erreur:
+        raise ValueError(f"Fichier '{fichier}' illisible en XML : {erreur}") from erreur
+    # Seul le contenu placé après le tableau (fin de document de planes.html) peut être mal formé.
+    if any(erreur.type_name != 'ERR_DOCUMENT_END' for erreur in lecture.error_log):
+        raise ValueError(f"Le tableau du fichier '{fichier}' n'est pas du XML bien formé.")
+    if en_tete is None:
+        raise ValueError(f"Aucun tableau n'a été trouvé dans le fichier '{fichier}'.")
+
+    index = _index_html(np.frombuffer(index, dtype=np.int64))
+    index.name = en_tete[0] or None
+    return pd.DataFrame({nom: colonne.serie(index) for nom, colonne in zip(en_tete[1:], colonnes)}, index=index)
+
+
+def _lire_avions(fichier):
+    """
+    Lecture en continu de planes.html (_lire_table_html) ; un tableau dans un autre format est lu
+    par pd.read_html.
+    """
+    try:
+        return _lire_table_html(fichier, SCHEMA_AVIONS)
+    except ValueError:
+        return appliquer_schema(pd.read_html(fichier, index_col=0)[0], SCHEMA_AVIONS)
+
+
+def _texte_pages(fichier, debut, fin):
+    """Extrait le texte des pages [debut, fin) d'un PDF (exécuté dans un processus du pool)."""
+    import pdfplumber
+
+    with pdfplumber.open(fichier) as pdf:
+        return [(page.extract_text() or '') for page in pdf.pages[debut:fin]]
+
+
+def _nb_pages(fichier):
+    import pdfplumber
+
+    with pdfplumber.open(fichier) as pdf:
+        return len(pdf.pages)
+
+
+def _extraire_textes(fichier, nb_processus=None):
+    """Texte de chaque page du PDF, pages extraites par lots sur un pool de processus."""
+    nb_pages = _nb_pages(fichier)
+    lots = [(debut, min(debut + PAGES_PAR_TACHE, nb_pages)) for debut in range(0, nb_pages, PAGES_PAR_TACHE)]
+    nb_processus = min(nb_processus or os.cpu_count() or 1, len(lots))
+    if nb_processus <= 1:
+        resultats = [_texte_pages(fichier, debut, fin) for debut, fin in lots]
+    else:
+        # 'spawn' : le PDF peut être lu depuis un thread de chargement (SessionDonnees.precharger),
+        # et un fork depuis un processus multithread peut bloquer sur un verrou tenu par un autre thread.
+        with ProcessPoolExecutor(max_workers=nb_processus, mp_context=multiprocessing.get_context('spawn')) as pool:
+            resultats = list(pool.map(_texte_pages, [fichier] * len(lots), *zip(*lots)))
+    return [texte for lot in resultats for texte in lot]
+
+
+def _assembler_lignes(textes, nb_colonnes):
+    """
+    Recolle les lignes CSV des pages dans l'ordre. Une ligne coupée par un saut de page laisse
+    moins de `nb_colonnes` champs en bas d'une page ou en haut de la suivante : les deux morceaux sont réunis.
+    """
+    lignes = []
+    for texte in textes:
+        lignes_page = [ligne.strip() for ligne in texte.splitlines() if ligne.strip()]
+        if lignes and lignes_page and (lignes[-1].count(',') < nb_colonnes - 1
+                                       or lignes_page[0].count(',') < nb_colonnes - 1):
+            lignes[-1] += lignes_page.pop(0)
+        lignes.extend(lignes_page)
+    return lignes
+
+
+def _lire_meteo(fichier, nb_processus=None):
+    """
+    Le tableau du PDF n'a pas de cadre exploitable par l'extraction de tableaux : chaque page contient
+    des lignes CSV (l'en-tête seulement sur la première), relues ensuite avec le schéma météo.
+    Les valeurs manquantes y sont écrites ' ', d'où skipinitialspace.
+    """
+    lignes = _assembler_lignes(_extraire_textes(fichier, nb_processus), len(SCHEMA_METEO))
+    if not lignes or not lignes[0].startswith('origin,'):
+        raise ValueError(f"Le PDF '{fichier}' ne contient pas le tableau météo attendu.")
+    return _lire_csv_type(io.StringIO('\n'.join(lignes)), SCHEMA_METEO, skipinitialspace=True)
+
+
+def charger_aeroports(fichier='data/airports.csv', utiliser_cache=True):
+    """Charge les données des aéroports depuis un fichier CSV."""
+    try:
+        return _charger_avec_cache(fichier, _lire_aeroports, utiliser_cache)
     except FileNotFoundError:
         print(f" ERREUR: Le fichier '{fichier}' est introuvable.")
         return None
 
-def charger_vols(fichier='data/flights.csv'):
+def charger_vols(fichier='data/flights.csv', utiliser_cache=True):
     """Charge les données des vols depuis un fichier CSV."""
     try:
-        df = pd.read_csv(fichier, encoding='latin1')
-        print(f" Fichier '{fichier}' chargé avec succès.")
-        return df
+        return _charger_avec_cache(fichier, _lire_vols, utiliser_cache)
     except FileNotFoundError:
         print(f" ERREUR: Le fichier '{fichier}' est introuvable.")
         return None
 
-def charger_compagnies(fichier='data/airlines.json'):
+def charger_compagnies(fichier='data/airlines.json', utiliser_cache=True):
     """Charge les données des compagnies aériennes depuis un fichier JSON."""
     try:
-        df = pd.read_json(fichier)
-        print(f" Fichier '{fichier}' chargé avec succès.")
-        return df
+        return _charger_avec_cache(fichier, _lire_compagnies, utiliser_cache)
     except FileNotFoundError:
         print(f" ERREUR: Le fichier '{fichier}' est introuvable.")
         return None
 
-def charger_avions(fichier='data/planes.html'):
+def charger_avions(fichier='data/planes.html', utiliser_cache=True):
     """Charge les données des avions depuis un fichier HTML."""
     try:
-        tables = pd.read_html(fichier, index_col=0)
-        df = tables[0]
-        print(f" Fichier '{fichier}' chargé avec succès.")
-        return df
+        return _charger_avec_cache(fichier, _lire_avions, utiliser_cache)
     except FileNotFoundError:
         print(f" ERREUR: Le fichier '{fichier}' est introuvable.")
         return None
@@ -44,7 +426,16 @@ def charger_avions(fichier='data/planes.html'):
         print(f" ERREUR: Aucun tableau n'a été trouvé dans le fichier '{fichier}'.")
         return None
 
-def charger_meteo(fichier='data/weather.pdf'):
-    """Placeholder"""
-    print(f" Le chargement du PDF '{fichier}' n'est pas encore implémenté.")
-    return None
+def charger_meteo(fichier='data/weather.pdf', utiliser_cache=True):
+    """Charge les relevés météo horaires depuis un fichier PDF (extraction en parallèle page par page)."""
+    try:
+        return _charger_avec_cache(fichier, _lire_meteo, utiliser_cache)
+    except FileNotFoundError:
+        print(f" ERREUR: Le fichier '{fichier}' est introuvable.")
+        return None
+    except ImportError:
+        print(f" ERREUR: Le module 'pdfplumber' est nécessaire pour lire le fichier '{fichier}'.")
+        return None
+    except ValueError as e:
+        print(f" ERREUR: {e}")
+        return None
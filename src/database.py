@@ -1,67 +1,547 @@
+import hashlib
+import io
 import os
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
 import pandas as pd
-from sqlalchemy import create_engine, text
-from dotenv import load_dotenv, find_dotenv
 
-from src.data_loader import charger_aeroports, charger_vols, charger_compagnies, charger_avions
+# SQLAlchemy et dotenv sont importés par les fonctions qui s'en servent : préparer les données
+# (preparer_donnees) ne demande pas de les charger.
+from src.instrumentation import etape
+from src.schemas import COLONNES_DATES
+from src.session import SessionDonnees
+from src.validation import Regle, valider_tables
+
+# Clés naturelles des tables, dans l'ordre des clés étrangères (les tables référencées d'abord).
+CLES_TABLES = {
+    'airlines': ['carrier'],
+    'airports': ['faa'],
+    'planes': ['tailnum'],
+    'weather': ['origin', 'year', 'month', 'day', 'hour'],
+    'flights': ['year', 'month', 'day', 'carrier', 'flight'],
+}
+TABLE_FAITS = 'flights'
+# Tables qui référencent une table de dimensions : chargées après les dimensions, avec les partitions de vols.
+TABLES_SECONDAIRES = ('weather',)
+
+# Chargement parallèle : nombre de connexions du pool (= threads d'insertion) et taille des partitions de vols.
+TAILLE_POOL = 4
+TAILLE_PARTITION_VOLS = 50_000
+
+# Table de contrôle des chargements : une ligne par table de dimensions ou partition de vols validée.
+TABLE_POINTS_CONTROLE = 'chargement_points_controle'
+
+def get_db_engine(taille_pool=TAILLE_POOL):
+    from dotenv import load_dotenv, find_dotenv
+    from sqlalchemy import create_engine
 
-def get_db_engine():
     load_dotenv(find_dotenv('.env.local'))
     db_url = os.getenv("DB_CONNECTION_STRING")
     if not db_url:
         raise ValueError("L'URL de connexion à la base de données n'est pas définie.")
     try:
-        engine = create_engine(db_url)
+        engine = create_engine(db_url, pool_size=taille_pool, max_overflow=0, pool_pre_ping=True)
         print(" Connexion à la base de données Supabase réussie.")
         return engine
     except Exception as e:
         print(f" Erreur de connexion à la base de données : {e}")
         return None
 
+def _preparer_csv(df):
+    """
+    Prépare un bloc pour COPY ... FORMAT csv : COPY refuse '12.0' dans une colonne entière,
+    les colonnes décimales qui ne contiennent que des entiers sont donc écrites en entiers.
+    """
+    df = df.copy(deep=False)  # seules les colonnes converties sont remplacées, la partition reste intacte
+    for col in df.columns:
+        if pd.api.types.is_float_dtype(df[col]):
+            valeurs = df[col].dropna()
+            if (valeurs % 1 == 0).all():
+                df[col] = df[col].astype('Int64')
+    return df
+
+
+def _copier_postgresql(df, nom_table, engine, taille_lot, requete_finale=None):
+    """Envoie le DataFrame par blocs CSV via COPY FROM STDIN, dans une seule transaction."""
+    colonnes = ', '.join(f'"{col}"' for col in df.columns)
+    requete = f'COPY "{nom_table}" ({colonnes}) FROM STDIN WITH (FORMAT csv)'
+    connexion = engine.raw_connection()
+    try:
+        curseur = connexion.cursor()
+        for debut in range(0, len(df), taille_lot):
+            tampon = io.StringIO()
+            _preparer_csv(df.iloc[debut:debut + taille_lot]).to_csv(tampon, index=False, header=False)
+            tampon.seek(0)
+            if hasattr(curseur, 'copy_expert'):  # psycopg2
+                curseur.copy_expert(requete, tampon)
+            else:  # psycopg 3
+                with curseur.copy(requete) as copie:
+                    copie.write(tampon.getvalue())
+        if requete_finale:
+            curseur.execute(requete_finale)
+        curseur.close()
+        connexion.commit()
+    except Exception:
+        connexion.rollback()
+        raise
+    finally:
+        connexion.close()
+
+
+_MARQUEURS = {'qmark': '?', 'format': '%s', 'pyformat': '%s'}
+
+
+def _inserer_executemany(df, nom_table, engine, taille_lot, requete_finale=None):
+    """
+    Insère le DataFrame par lots de paramètres (executemany) sur les bases sans COPY.
+    Les lignes sont passées en tuples directement au pilote DBAPI, sans passer par l'ORM.
+    """
+    from sqlalchemy import column, table
+
+    marqueur = _MARQUEURS.get(engine.dialect.paramstyle)
+    if marqueur is None:
+        requete = table(nom_table, *[column(col) for col in df.columns]).insert()
+        with engine.begin() as connexion:
+            for debut in range(0, len(df), taille_lot):
+                lot = df.iloc[debut:debut + taille_lot].astype(object)
+                connexion.execute(requete, lot.where(lot.notna(), None).to_dict('records'))
+            if requete_finale:
+                connexion.exec_driver_sql(requete_finale)
+        return
+
+    colonnes = ', '.join(f'"{col}"' for col in df.columns)
+    marqueurs = ', '.join([marqueur] * len(df.columns))
+    requete = f'INSERT INTO "{nom_table}" ({colonnes}) VALUES ({marqueurs})'
+    connexion = engine.raw_connection()
+    try:
+        curseur = connexion.cursor()
+        for debut in range(0, len(df), taille_lot):
+            lot = df.iloc[debut:debut + taille_lot].astype(object)
+            curseur.executemany(requete, list(lot.where(lot.notna(), None).itertuples(index=False, name=None)))
+        if requete_finale:
+            curseur.execute(requete_finale)
+        curseur.close()
+        connexion.commit()
+    except Exception:
+        connexion.rollback()
+        raise
+    finally:
+        connexion.close()
+
+
+def inserer_table(df, nom_table, engine, taille_lot=None, verbeux=True, requete_finale=None):
+    """
+    Insère un DataFrame dans une table existante par la voie la plus rapide disponible :
+    COPY FROM STDIN sur PostgreSQL, executemany sur les autres bases. Renvoie le débit en lignes/s.
+    `requete_finale` est exécutée dans la même transaction, juste avant sa validation.
+    """
+    debut = time.perf_counter()
+    with etape(f'insertion {nom_table}', 'base', lignes=len(df)):
+        if engine.dialect.name == 'postgresql':
+            _copier_postgresql(df, nom_table, engine, taille_lot or 100_000, requete_finale)
+        else:
+            _inserer_executemany(df, nom_table, engine, taille_lot or 10_000, requete_finale)
+    duree = time.perf_counter() - debut
+    debit = len(df) / duree if duree > 0 else float('inf')
+    if verbeux:
+        print(f" Table '{nom_table}' : {len(df)} lignes en {duree:.2f} s ({debit:.0f} lignes/s).")
+    return debit
+
+
+def partitionner(df, taille_partition=TAILLE_PARTITION_VOLS):
+    """Découpe un DataFrame en partitions consécutives de `taille_partition` lignes."""
+    return [df.iloc[debut:debut + taille_partition] for debut in range(0, len(df), taille_partition)]
+
+
+def _nb_threads(engine, nb_threads):
+    """Nombre de threads d'insertion : un par connexion du pool, et un seul sur SQLite qui n'accepte qu'un écrivain."""
+    if engine.dialect.name == 'sqlite':
+        return 1
+    if nb_threads:
+        return nb_threads
+    taille = getattr(engine.pool, 'size', None)
+    return taille() if callable(taille) else TAILLE_POOL
+
+
+def empreinte_donnees(tables, taille_partition=TAILLE_PARTITION_VOLS):
+    """Empreinte courte du contenu des tables à charger et du découpage en partitions."""
+    sha = hashlib.sha256(str(taille_partition).encode())
+    for nom_table, df in tables.items():
+        sha.update(f'{nom_table}:{len(df)}'.encode())
+        sha.update(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes())
+    return sha.hexdigest()[:16]
+
+
+def _requete_point_controle(nom_table, num_partition, empreinte):
+    # Valeurs produites par le programme (nom de table connu, entier, hexadécimal) : pas de paramètres nécessaires.
+    return (f"INSERT INTO {TABLE_POINTS_CONTROLE} (nom_table, num_partition, empreinte) "
+            f"VALUES ('{nom_table}', {int(num_partition)}, '{empreinte}')")
+
+
+def _creer_points_controle(connexion):
+    from sqlalchemy import text
+
+    connexion.execute(text(
+        f"CREATE TABLE IF NOT EXISTS {TABLE_POINTS_CONTROLE} ("
+        "nom_table VARCHAR(64) NOT NULL, num_partition INTEGER NOT NULL, empreinte VARCHAR(64) NOT NULL, "
+        "PRIMARY KEY (nom_table, num_partition))"))
+
+
+def lire_points_controle(engine, empreinte):
+    """Crée au besoin la table de contrôle et renvoie les (table, partition) déjà validés pour cette empreinte."""
+    from sqlalchemy import text
+
+    with engine.begin() as connexion:
+        _creer_points_controle(connexion)
+        lignes = connexion.execute(text(
+            f"SELECT nom_table, num_partition FROM {TABLE_POINTS_CONTROLE} WHERE empreinte = :empreinte"),
+            {'empreinte': empreinte}).fetchall()
+    return {(nom_table, num_partition) for nom_table, num_partition in lignes}
+
+
+def effacer_points_controle(connexion, empreinte=None):
+    """
+    Supprime les points de contrôle de `empreinte` (tous si None) : ils ne servent qu'à reprendre un chargement
+    interrompu, et ne doivent pas faire sauter les partitions d'un chargement ultérieur.
+    """
+    from sqlalchemy import text
+
+    _creer_points_controle(connexion)
+    if empreinte is None:
+        connexion.execute(text(f"DELETE FROM {TABLE_POINTS_CONTROLE}"))
+    else:
+        connexion.execute(text(f"DELETE FROM {TABLE_POINTS_CONTROLE} WHERE empreinte = :empreinte"),
+                          {'empreinte': empreinte})
+
+
+def vider_tables(engine, noms_tables=tuple(CLES_TABLES)):
+    """Vide les tables de données et les points de contrôle avant un chargement complet."""
+    from sqlalchemy import text
+
+    with engine.begin() as connexion:
+        if engine.dialect.name == 'postgresql':
+            connexion.execute(text("TRUNCATE TABLE flights, airlines, airports, planes, weather RESTART IDENTITY CASCADE"))
+        else:
+            for nom_table in reversed(list(noms_tables)):
+                connexion.execute(text(f'DELETE FROM "{nom_table}"'))
+        connexion.execute(text(f"DELETE FROM {TABLE_POINTS_CONTROLE}"))
+
+
+class _Progression:
+    """Suivi de l'avancement d'une table chargée par partitions, avec estimation du temps restant."""
+
+    def __init__(self, nom_table, nb_lignes, nb_lignes_deja_chargees):
+        self.nom_table = nom_table
+        self.nb_lignes = nb_lignes
+        self.chargees = nb_lignes_deja_chargees
+        self.chargees_cette_fois = 0
+        self.debut = time.perf_counter()
+
+    def avancer(self, nb_lignes):
+        self.chargees += nb_lignes
+        self.chargees_cette_fois += nb_lignes
+        ecoule = time.perf_counter() - self.debut
+        restantes = self.nb_lignes - self.chargees
+        eta = ecoule / self.chargees_cette_fois * restantes if self.chargees_cette_fois else 0
+        print(f"   {self.nom_table} : {self.chargees}/{self.nb_lignes} lignes "
+              f"({self.chargees / max(self.nb_lignes, 1):.0%}), {ecoule:.1f} s écoulées, reste ~{eta:.0f} s")
+
+
+def charger_tables_en_parallele(tables, engine, nb_threads=None, taille_partition=TAILLE_PARTITION_VOLS,
+                                empreinte=None, deja_chargees=frozenset()):
+    """
+    Insère les tables sur un pool de threads borné, une connexion du pool par thread :
+    d'abord les tables de dimensions en même temps (elles ne dépendent pas les unes des autres),
+    puis les TABLES_SECONDAIRES et les partitions de la table des vols, qui référencent les dimensions.
+    Chaque table de dimensions et chaque partition est validée dans sa propre transaction ; en cas d'échec,
+    l'erreur est relevée après l'arrêt des partitions en attente.
+    Si `empreinte` est fournie, chaque transaction enregistre aussi son point de contrôle dans
+    TABLE_POINTS_CONTROLE, et les éléments de `deja_chargees` ((table, partition)) sont sautés.
+    Renvoie la durée de chargement de chaque table.
+    """
+    nb_threads = _nb_threads(engine, nb_threads)
+    durees = {}
+
+    def point_controle(nom_table, num_partition):
+        return _requete_point_controle(nom_table, num_partition, empreinte) if empreinte else None
+
+    with ThreadPoolExecutor(max_workers=nb_threads) as pool:
+        def soumettre_tables(noms_tables):
+            taches = {}
+            for nom_table in noms_tables:
+                if (nom_table, 0) in deja_chargees:
+                    print(f" Table '{nom_table}' déjà chargée lors d'une exécution précédente.")
+                    continue
+                taches[pool.submit(inserer_table, tables[nom_table], nom_table, engine,
+                                   requete_finale=point_controle(nom_table, 0))] = nom_table
+            return taches
+
+        def attendre_tables(taches, debut):
+            for tache in as_completed(taches):
+                tache.result()
+                durees[taches[tache]] = time.perf_counter() - debut
+
+        debut = time.perf_counter()
+        attendre_tables(soumettre_tables([nom for nom in tables
+                                          if nom != TABLE_FAITS and nom not in TABLES_SECONDAIRES]), debut)
+
+        debut_secondaires = time.perf_counter()
+        taches_secondaires = soumettre_tables([nom for nom in tables if nom in TABLES_SECONDAIRES])
+
+        if TABLE_FAITS in tables:
+            debut = time.perf_counter()
+            partitions = partitionner(tables[TABLE_FAITS], taille_partition)
+            a_charger = [num for num in range(len(partitions)) if (TABLE_FAITS, num) not in deja_chargees]
+            deja = sum(len(partitions[num]) for num in range(len(partitions)) if num not in a_charger)
+            if deja:
+                print(f" Table '{TABLE_FAITS}' : reprise après {len(partitions) - len(a_charger)} partition(s) "
+                      f"déjà validée(s) ({deja} lignes).")
+            progression = _Progression(TABLE_FAITS, len(tables[TABLE_FAITS]), deja)
+            taches = {pool.submit(inserer_table, partitions[num], TABLE_FAITS, engine, verbeux=False,
+                                  requete_finale=point_controle(TABLE_FAITS, num)): num for num in a_charger}
+            try:
+                for tache in as_completed(taches):
+                    tache.result()
+                    progression.avancer(len(partitions[taches[tache]]))
+            except Exception:
+                for tache in taches:
+                    tache.cancel()
+                raise
+            durees[TABLE_FAITS] = time.perf_counter() - debut
+            nb_lignes = len(tables[TABLE_FAITS]) - deja
+            print(f" Table '{TABLE_FAITS}' : {nb_lignes} lignes en {len(a_charger)} partitions sur {nb_threads} "
+                  f"thread(s), {durees[TABLE_FAITS]:.2f} s ({nb_lignes / max(durees[TABLE_FAITS], 1e-9):.0f} lignes/s).")
+        attendre_tables(taches_secondaires, debut_secondaires)
+    return durees
+
+
 def validate_data_integrity(df_aeroports, df_compagnies, df_avions):
-    """Vérifie le format des clés primaires avec des regex, comme demandé."""
-    print("\n--- Validation de l'intégrité des données (Regex) ---")
-    if df_aeroports['faa'].str.match(r'^[A-Z0-9]{3,5}$', na=False).all():
-        print(" Format des codes 'faa' (aéroports) est valide.")
-    if df_compagnies['carrier'].str.match(r'^[A-Z0-9]{2}$', na=False).all():
-        print(" Format des codes 'carrier' (compagnies) est valide.")
-    if df_avions['tailnum'].str.match(r'^N[A-Z0-9]+$', na=False).all():
-        print(" Format des codes 'tailnum' (avions) est valide.")
+    """Vérifie les référentiels (format des clés primaires, unicité, valeurs plausibles) et affiche chaque règle."""
+    print("\n--- Validation de l'intégrité des données ---")
+    with etape('validate_data_integrity', 'validation'):
+        rapport = valider_tables({'airports': df_aeroports, 'airlines': df_compagnies, 'planes': df_avions})
+    rapport.afficher()
+    return rapport
 
 def verify_and_clean_keys(df_vols, df_avions):
-    """Vérifie les clés, nettoie les doublons et les clés étrangères invalides."""
+    """
+    Vérifie les clés, nettoie les doublons et les clés étrangères invalides.
+    Renvoie une nouvelle table sans modifier `df_vols` : les colonnes inchangées restent partagées
+    avec elle (copie à l'écriture de pandas), seule 'tailnum' est remplacée.
+    """
     print("\n--- Vérification et Nettoyage des Clés ---")
     
-   
-    key_cols = ['year', 'month', 'day', 'carrier', 'flight']
-    doublons_avant = df_vols.duplicated(subset=key_cols).sum()
-    print(f" ▪️ Nombre de doublons trouvés dans les données brutes : {doublons_avant}")
-    if doublons_avant > 0:
-        df_vols.drop_duplicates(subset=key_cols, inplace=True)
-        print(" Doublons de la clé primaire supprimés.")
+    key_cols = tuple(CLES_TABLES['flights'])
+    regles = {'flights': [Regle(key_cols, 'unique'), Regle('tailnum', 'reference', ('planes', 'tailnum'))]}
+    with etape('verify_and_clean_keys', 'validation'):
+        rapport = valider_tables({'flights': df_vols, 'planes': df_avions}, regles)
+        doublons = rapport.masque('flights', key_cols, 'unique')
+        avions_inconnus = rapport.masque('flights', 'tailnum', 'reference')
 
+        print(f" ▪️ Nombre de doublons trouvés dans les données brutes : {doublons.sum()}")
+        print(f" ▪️ Nombre de vols avec un avion inconnu : {(avions_inconnus & ~doublons).sum()}")
     
-    avions_connus = set(df_avions['tailnum'])
-
-    vols_avec_avions_inconnus = ~df_vols['tailnum'].isin(avions_connus)
-    print(f" ▪️ Nombre de vols avec un avion inconnu : {vols_avec_avions_inconnus.sum()}")
+        df_nettoye = df_vols.copy(deep=False)
+        if doublons.any():
+            df_nettoye = df_nettoye[~doublons]
+            avions_inconnus = avions_inconnus[~doublons]
+            print(" Doublons de la clé primaire supprimés.")
    
-    df_vols.loc[vols_avec_avions_inconnus, 'tailnum'] = None
-    print(" Avions inconnus mis à NULL pour respecter la clé étrangère.")
+        if avions_inconnus.any():
+            df_nettoye = df_nettoye.assign(tailnum=df_nettoye['tailnum'].mask(avions_inconnus))
+        print(" Avions inconnus mis à NULL pour respecter la clé étrangère.")
     
-    return df_vols
+    return df_nettoye
 
-def populate_database():
-    """Fonction principale pour charger, valider, préparer et insérer toutes les données."""
-    engine = get_db_engine()
-    if engine is None: return
+def _instants_utc(serie):
+    """
+    Instants d'une colonne de dates (texte, catégories ou datetime) en nanosecondes UTC flottantes, NaN si absente.
+    Une date sans fuseau est lue comme UTC ; '2013-01-01 05:00:00' et '2013-01-01 05:00:00+00' sont donc égales.
+    """
+    dates = pd.to_datetime(serie.astype(object), utc=True).dt.tz_localize(None)
+    nanos = pd.Series(dates.to_numpy('datetime64[ns]').view('int64').astype('float64'), index=serie.index)
+    return nanos.where(dates.notna())
 
-   
+
+def _normaliser(entrant, existant):
+    """
+    Ramène une colonne du DataFrame et la même colonne lue en base à une représentation comparable :
+    flottants pour les nombres (517 et 517.0 sont égaux), nanosecondes UTC pour les dates (COLONNES_DATES
+    ou colonnes datetime), texte sinon.
+    """
+    if (entrant.name in COLONNES_DATES or pd.api.types.is_datetime64_any_dtype(existant)
+            or pd.api.types.is_datetime64_any_dtype(entrant)):
+        return _instants_utc(entrant), _instants_utc(existant)
+    if pd.api.types.is_numeric_dtype(entrant) and not pd.api.types.is_bool_dtype(entrant):
+        # + 0.0 ramène -0.0 à 0.0, sinon les empreintes des deux zéros diffèrent
+        return tuple(pd.to_numeric(s, errors='coerce').astype('float64') + 0.0 for s in (entrant, existant))
+    return tuple(s.astype(object).where(s.notna(), None).astype(str) for s in (entrant, existant))
+
+
+def calculer_differences(df, existant, cles):
+    """
+    Compare un DataFrame au contenu d'une table (déjà lu dans `existant`) sur ses clés naturelles.
+    Renvoie (a_inserer, a_mettre_a_jour, cles_a_supprimer) : les deux premiers sont des lignes de `df`,
+    le dernier ne contient que les colonnes clés des lignes absentes de `df`.
+    """
+    colonnes = list(df.columns)
+    entrant_norm, existant_norm = pd.DataFrame(index=df.index), pd.DataFrame(index=existant.index)
+    for col in colonnes:
+        entrant_norm[col], existant_norm[col] = _normaliser(df[col], existant[col])
+
+    valeurs = [col for col in colonnes if col not in cles]
+    entrant_norm['_empreinte'] = pd.util.hash_pandas_object(entrant_norm[valeurs], index=False)
+    existant_norm['_empreinte'] = pd.util.hash_pandas_object(existant_norm[valeurs], index=False)
+    entrant_norm['_position'] = range(len(df))
+    existant_norm['_position'] = range(len(existant))
+
+    fusion = entrant_norm[cles + ['_empreinte', '_position']].merge(
+        existant_norm[cles + ['_empreinte', '_position']], on=cles, how='outer',
+        suffixes=('', '_base'), indicator=True)
+
+    nouveaux = fusion['_merge'] == 'left_only'
+    modifies = (fusion['_merge'] == 'both') & (fusion['_empreinte'] != fusion['_empreinte_base'])
+    supprimes = fusion['_merge'] == 'right_only'
+
+    a_inserer = df.iloc[fusion.loc[nouveaux, '_position'].astype('int64')]
+    a_mettre_a_jour = df.iloc[fusion.loc[modifies, '_position'].astype('int64')]
+    cles_a_supprimer = existant.iloc[fusion.loc[supprimes, '_position_base'].astype('int64')][cles]
+    return a_inserer, a_mettre_a_jour, cles_a_supprimer
+
+
+def _lire_table(nom_table, colonnes, engine):
+    """Lit les colonnes d'une table ; sur PostgreSQL, via COPY TO STDOUT, bien plus rapide qu'un SELECT ligne à ligne."""
+    from sqlalchemy import text
+
+    liste_colonnes = ', '.join(f'"{col}"' for col in colonnes)
+    if engine.dialect.name != 'postgresql':
+        return pd.read_sql(text(f'SELECT {liste_colonnes} FROM "{nom_table}"'), engine)
+
+    requete = f'COPY (SELECT {liste_colonnes} FROM "{nom_table}") TO STDOUT WITH (FORMAT csv, HEADER)'
+    tampon = io.StringIO()
+    connexion = engine.raw_connection()
+    try:
+        curseur = connexion.cursor()
+        if hasattr(curseur, 'copy_expert'):  # psycopg2
+            curseur.copy_expert(requete, tampon)
+        else:  # psycopg 3
+            with curseur.copy(requete) as copie:
+                for bloc in copie:
+                    tampon.write(bytes(bloc).decode())
+        curseur.close()
+    finally:
+        connexion.close()
+    tampon.seek(0)
+    return pd.read_csv(tampon)
+
+
+def _parametres(df):
+    """Lignes d'un DataFrame en dictionnaires de paramètres SQL (NaN/NA -> NULL)."""
+    df = df.astype(object)
+    return df.where(df.notna(), None).to_dict('records')
+
+
+def _supprimer_lignes(cles_a_supprimer, nom_table, cles, connexion):
+    from sqlalchemy import text
+
+    if cles_a_supprimer.empty:
+        return
+    condition = ' AND '.join(f'"{col}" = :{col}' for col in cles)
+    connexion.execute(text(f'DELETE FROM "{nom_table}" WHERE {condition}'), _parametres(cles_a_supprimer))
+
+
+def _appliquer_upsert(lignes, nom_table, cles, connexion):
+    """Insère ou met à jour des lignes avec INSERT ... ON CONFLICT (PostgreSQL et SQLite >= 3.24)."""
+    from sqlalchemy import text
+
+    if lignes.empty:
+        return
+    colonnes = list(lignes.columns)
+    valeurs = [col for col in colonnes if col not in cles]
+    liste_colonnes = ', '.join(f'"{col}"' for col in colonnes)
+    marqueurs = ', '.join(f':{col}' for col in colonnes)
+    conflit = ', '.join(f'"{col}"' for col in cles)
+    if valeurs:
+        action = 'DO UPDATE SET ' + ', '.join(f'"{col}" = excluded."{col}"' for col in valeurs)
+    else:
+        action = 'DO NOTHING'
+    requete = f'INSERT INTO "{nom_table}" ({liste_colonnes}) VALUES ({marqueurs}) ON CONFLICT ({conflit}) {action}'
+    connexion.execute(text(requete), _parametres(lignes))
+
+
+def _appliquer_mises_a_jour(lignes, nom_table, cles, connexion):
+    """Met à jour des lignes existantes par UPDATE, pour les bases sans ON CONFLICT."""
+    from sqlalchemy import text
+
+    if lignes.empty:
+        return
+    valeurs = [col for col in lignes.columns if col not in cles]
+    affectations = ', '.join(f'"{col}" = :{col}' for col in valeurs)
+    condition = ' AND '.join(f'"{col}" = :{col}' for col in cles)
+    connexion.execute(text(f'UPDATE "{nom_table}" SET {affectations} WHERE {condition}'), _parametres(lignes))
+
+
+def synchroniser_tables(tables, engine):
+    """
+    Met les tables au niveau des DataFrames sans tout recharger : seules les lignes nouvelles,
+    modifiées ou disparues (d'après les clés de CLES_TABLES) sont écrites, dans une seule transaction.
+    Les suppressions se font des tables dépendantes vers les tables référencées, les écritures dans l'ordre inverse.
+    Les points de contrôle d'un chargement complet interrompu sont effacés dans la même transaction :
+    les tables ne correspondent plus à ce chargement.
+    Renvoie, par table, le nombre de lignes insérées, mises à jour et supprimées.
+    """
+    from sqlalchemy import column, table
+
+    upsert = engine.dialect.name in ('postgresql', 'sqlite')
+    differences = {}
+    for nom_table, df in tables.items():
+        cles = CLES_TABLES[nom_table]
+        existant = _lire_table(nom_table, list(df.columns), engine)
+        differences[nom_table] = calculer_differences(df, existant, cles)
+
+    bilan = {}
+    with engine.begin() as connexion:
+        effacer_points_controle(connexion)
+        for nom_table in reversed(list(tables)):
+            _supprimer_lignes(differences[nom_table][2], nom_table, CLES_TABLES[nom_table], connexion)
+        for nom_table in tables:
+            a_inserer, a_mettre_a_jour, cles_a_supprimer = differences[nom_table]
+            cles = CLES_TABLES[nom_table]
+            if upsert:
+                _appliquer_upsert(pd.concat([a_inserer, a_mettre_a_jour]), nom_table, cles, connexion)
+            else:
+                _appliquer_mises_a_jour(a_mettre_a_jour, nom_table, cles, connexion)
+                if not a_inserer.empty:
+                    connexion.execute(table(nom_table, *[column(col) for col in a_inserer.columns]).insert(),
+                                      _parametres(a_inserer))
+            bilan[nom_table] = {'insertions': len(a_inserer), 'mises_a_jour': len(a_mettre_a_jour),
+                                'suppressions': len(cles_a_supprimer)}
+            print(f" Table '{nom_table}' synchronisée : {len(a_inserer)} insertion(s), "
+                  f"{len(a_mettre_a_jour)} mise(s) à jour, {len(cles_a_supprimer)} suppression(s).")
+    return bilan
+
+
+def preparer_donnees(dossier_donnees='data', session=None):
+    """
+    Charge, valide et nettoie les fichiers de `dossier_donnees` (ou ceux de `session`) ;
+    renvoie les DataFrames par table, dans l'ordre des clés étrangères.
+    Avec une session partagée, les fichiers déjà lus ne sont pas relus et les tables préparées
+    sont gardées pour les appels suivants ; les tables brutes de la session ne sont pas modifiées.
+    """
+    if session is None:
+        session = SessionDonnees(dossier_donnees)
+    return session.obtenir('tables_preparees', lambda: _preparer_tables(session))
+
+
+def _preparer_tables(session):
     print("\n--- Chargement des données ---")
-    df_aeroports = charger_aeroports()
-    df_vols = charger_vols()
-    df_compagnies = charger_compagnies()
-    df_avions = charger_avions()
+    session.precharger()
+    df_aeroports = session.brut('airports')
+    df_vols = session.brut('flights')
+    df_compagnies = session.brut('airlines')
+    df_avions = session.brut('planes')
+    df_meteo = session.brut('weather')
    
     validate_data_integrity(df_aeroports, df_compagnies, df_avions)
 
@@ -69,13 +549,8 @@ def populate_database():
 
   
     print("\n--- Préparation et nettoyage final des données ---")
- 
-    numeric_cols = ['dep_time', 'dep_delay', 'arr_time', 'arr_delay', 'air_time', 'distance', 'minute']
-    for col in numeric_cols:
-        df_vols[col] = pd.to_numeric(df_vols[col], errors='coerce')
-    print(" Types de données numériques des vols corrigés.")
-    
-   
+    # Les types numériques des vols et des avions sont déjà fixés à la lecture par les schémas de src/schemas.py.
+
     aeroports_manquants = pd.DataFrame({
         'faa': ['BQN', 'PSE', 'SJU', 'STT'], 'name': ['Rafael Hernandez', 'Mercedita Airport', 'Luis Munoz Marin Intl', 'Cyril E. King Airport'],
         'lat': [18.4949, 18.0083, 18.4394, 18.3373], 'lon': [-67.1294, -66.5633, -66.0018, -64.9734],
@@ -84,26 +559,67 @@ def populate_database():
     })
     df_aeroports = pd.concat([df_aeroports, aeroports_manquants], ignore_index=True)
     print(" 4 aéroports manquants ajoutés avec succès.")
-    df_avions['year'] = df_avions['year'].astype('Int64')
-    print(" Types de données des avions corrigés.")
 
-  
+    tables = {'airlines': df_compagnies, 'airports': df_aeroports, 'planes': df_avions, 'weather': df_meteo,
+              'flights': df_vols}
+    if df_meteo is None:
+        del tables['weather']  # PDF illisible : le reste des tables est tout de même chargé
+    rapport = valider_tables(tables)
+    if rapport.est_valide():
+        print(" Validation finale : toutes les règles sont respectées.")
+    else:
+        print(f" Validation finale : {len(rapport.violations)} règle(s) en échec.")
+        rapport.afficher()
+    return tables
+
+
+def populate_database(engine=None, mode='complet', dossier_donnees='data', session=None):
+    """
+    Fonction principale pour charger, valider, préparer et insérer toutes les données de `dossier_donnees`.
+    mode='complet' vide les tables puis recharge tout ; mode='synchro' n'écrit que les différences
+    avec le contenu actuel de la base (voir synchroniser_tables). Les tables de résumé de la Mission 1
+    sont ensuite reconstruites (voir analyse_sql.rafraichir_resumes).
+    Avec une `session` (voir SessionDonnees), les fichiers sont lus depuis celle-ci et restent disponibles
+    pour la Mission 1 sans être relus.
+    """
+    from src.analyse_sql import rafraichir_resumes
+
+    if engine is None:
+        engine = get_db_engine()
+    if engine is None: return
+
+    tables = preparer_donnees(dossier_donnees, session)
+
+    if mode == 'synchro':
+        print("\n--- Synchronisation incrémentale des tables ---")
+        try:
+            synchroniser_tables(tables, engine)
+            rafraichir_resumes(engine)
+            print(" Mission accomplie ! La base de données est à jour.")
+        except Exception as e:
+            print(f" Une erreur est survenue lors de la synchronisation : {e}")
+        return
+
     print("\n--- Démarrage de l'insertion des données dans Supabase ---")
     try:
-        with engine.connect() as connection:
-            connection.execute(text("TRUNCATE TABLE flights, airlines, airports, planes, weather RESTART IDENTITY CASCADE"))
-            connection.commit()
-        print(" Tables vidées avant insertion.")
+        # Les points de contrôle d'un chargement interrompu avec les mêmes données permettent de reprendre
+        # là où il s'était arrêté, sans vider les tables.
+        empreinte = empreinte_donnees(tables)
+        deja_chargees = lire_points_controle(engine, empreinte)
+        if deja_chargees:
+            print(f" Reprise d'un chargement interrompu : {len(deja_chargees)} élément(s) déjà validé(s).")
+        else:
+            vider_tables(engine, list(tables))
+            print(" Tables vidées avant insertion.")
         
-        df_compagnies.to_sql('airlines', engine, if_exists='append', index=False)
-        print("1/4 - Table 'airlines' peuplée avec succès.")
-        df_aeroports.to_sql('airports', engine, if_exists='append', index=False)
-        print("2/4 - Table 'airports' peuplée avec succès.")
-        df_avions.to_sql('planes', engine, if_exists='append', index=False)
-        print("3/4 - Table 'planes' peuplée avec succès.")
-        df_vols.to_sql('flights', engine, if_exists='append', index=False, chunksize=10000)
-        print("4/4 - Table 'flights' peuplée avec succès.")
+        charger_tables_en_parallele(tables, engine, empreinte=empreinte, deja_chargees=deja_chargees)
+        with engine.begin() as connexion:
+            effacer_points_controle(connexion, empreinte)
+        for numero, nom_table in enumerate(tables, start=1):
+            print(f"{numero}/{len(tables)} - Table '{nom_table}' peuplée avec succès.")
+        rafraichir_resumes(engine)
         print(" Mission accomplie ! La base de données a été entièrement peuplée.")
 
     except Exception as e:
-        print(f" Une erreur est survenue lors de l'insertion : {e}")
\ No newline at end of file
+        print(f" Une erreur est survenue lors de l'insertion : {e}")
+        print(" Relancer populate_database() reprendra le chargement à partir des partitions déjà validées.")
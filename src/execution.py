@@ -0,0 +1,174 @@
+import contextlib
+import io
+import os
+import shutil
+import tempfile
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+from src.analysis import (analyses_comptages_simples, analyses_classements, analyses_comptages_suite,
+                          analyse_par_compagnie, analyses_filtrage_et_tri,
+                          couverture_compagnies, destinations_exclusives,
+                          vols_principales_compagnies)
+from src.contexte import ContexteAnalyse, afficher_compteurs
+from src.instrumentation import activer, ajouter_spans, etape, est_active, spans
+
+# Questions de la Mission 1 dans l'ordre d'affichage : (libellé, fonction, DataFrames passés en arguments).
+# Chaque fonction reçoit en plus le contexte partagé en dernier argument.
+QUESTIONS = [
+    ('Q1', analyses_comptages_simples, ('aeroports', 'compagnies', 'avions', 'vols')),
+    ('Q1 (suite)', analyses_comptages_suite, ('vols', 'aeroports')),
+    ('Q2', analyses_classements, ('vols', 'aeroports')),
+    ('Q3', analyse_par_compagnie, ('vols', 'compagnies')),
+    ('Q4/Q5', analyses_filtrage_et_tri, ('vols', 'aeroports', 'compagnies')),
+    ('Q6', couverture_compagnies, ('vols', 'compagnies')),
+    ('Q7', destinations_exclusives, ('vols', 'compagnies')),
+    ('Q8', vols_principales_compagnies, ('vols', 'compagnies')),
+]
+
+# Lots de questions exécutés dans un même processus du pool, regroupés d'après les agrégats du contexte
+# qu'elles partagent, pour que chaque agrégat ne soit calculé qu'une fois même en parallèle. Seule la table
+# des noms de compagnies (quelques lignes, Q3/Q6/Q7 et Q8) est construite dans les deux processus.
+LOTS_PARALLELES = [
+    ('Q1', 'Q1 (suite)', 'Q2', 'Q4/Q5', 'Q8'),  # comptes par origine/destination/avion, index des vols
+    ('Q3', 'Q6', 'Q7'),                         # matrices d'incidence compagnies × aéroports
+]
+
+# État d'un processus du pool : DataFrames relus depuis les fichiers Arrow.
+_DONNEES = {}
+
+
+def _executer_question(numero, donnees, contexte):
+    """
+    Exécute une question en capturant ce qu'elle affiche ;
+    renvoie (numéro, résultat, sortie, durée, agrégats calculés).
+    """
+    libelle, fonction, arguments = QUESTIONS[numero]
+    compteurs_avant = Counter(contexte.compteurs)
+    sortie = io.StringIO()
+    lignes = None if donnees['vols'] is None else len(donnees['vols'])
+    debut = time.perf_counter()
+    with contextlib.redirect_stdout(sortie), etape(f'{libelle} {fonction.__name__}', 'analyse', lignes=lignes):
+        resultat = fonction(*(donnees[nom] for nom in arguments), contexte)
+    duree = time.perf_counter() - debut
+    return numero, resultat, sortie.getvalue(), duree, contexte.compteurs - compteurs_avant
+
+
+def _ecrire_arrow(donnees, dossier):
+    """
+    Écrit chaque DataFrame au format Arrow IPC (Feather v2) non compressé, en un seul bloc d'enregistrements
+    pour que chaque colonne soit contiguë dans le fichier et lisible sans copie (voir _lire_arrow).
+    """
+    from pyarrow import feather
+
+    chemins = {}
+    for nom, df in donnees.items():
+        if df is None:
+            chemins[nom] = None
+            continue
+        chemins[nom] = os.path.join(dossier, f'{nom}.arrow')
+        feather.write_feather(df, chemins[nom], compression='uncompressed', chunksize=max(len(df), 1))
+    return chemins
+
+
+def _lire_arrow(chemin):
+    """
+    Relit un DataFrame écrit par _ecrire_arrow en projetant le fichier en mémoire. Les colonnes numériques
+    et les codes des catégories sans valeur manquante sont des vues sur les pages du fichier, partagées
+    entre les processus ; les autres colonnes (textes, entiers nullables...) sont converties, donc copiées.
+    """
+    import pyarrow as pa
+    from pyarrow import feather
+
+    table = feather.read_table(chemin, memory_map=True)
+    types = table.slice(0, 0).to_pandas().dtypes  # types pandas d'origine, d'après les métadonnées
+    vues = {}
+    for nom, colonne in zip(table.column_names, table.columns):
+        if nom not in types or colonne.num_chunks != 1 or colonne.null_count:
+            continue
+        morceau = colonne.chunk(0)
+        try:
+            if isinstance(types[nom], pd.CategoricalDtype) and pa.types.is_dictionary(morceau.type):
+                vues[nom] = pd.Categorical.from_codes(morceau.indices.to_numpy(zero_copy_only=True),
+                                                      dtype=types[nom], validate=False)
+            elif types[nom].kind in 'iuf' and morceau.type.to_pandas_dtype() == types[nom]:
+                vues[nom] = morceau.to_numpy(zero_copy_only=True)
+        except pa.ArrowInvalid:
+            continue
+    reste = table.drop_columns(list(vues)).to_pandas()
+    vues.update({nom: reste[nom] for nom in reste.columns})
+    return pd.DataFrame({nom: vues[nom] for nom in types.index}, index=reste.index, copy=False)
+
+
+def _initialiser_processus(chemins, instrumentation):
+    """
+    Initialisation d'un processus du pool : les DataFrames sont relus depuis les fichiers Arrow projetés
+    en mémoire (voir _lire_arrow) au lieu d'être transmis à chaque processus sous forme picklée.
+    """
+    if instrumentation:
+        activer()
+    for nom, chemin in chemins.items():
+        _DONNEES[nom] = None if chemin is None else _lire_arrow(chemin)
+
+
+def _lot_dans_processus(numeros):
+    """
+    Exécute un lot de questions dans le pool, avec un contexte neuf pour que deux lots exécutés à la suite
+    par le même processus ne se partagent pas leurs agrégats ; les spans enregistrés sont renvoyés au parent.
+    """
+    deja = len(spans())
+    contexte = ContexteAnalyse(_DONNEES['vols'], _DONNEES['aeroports'], _DONNEES['compagnies'])
+    resultats = [_executer_question(numero, _DONNEES, contexte) for numero in numeros]
+    return resultats, [tuple(span) for span in spans()[deja:]]
+
+
+def executer_analyses(donnees, nb_processus=1):
+    """
+    Exécute les questions de QUESTIONS sur `donnees` (dict 'vols', 'aeroports', 'compagnies', 'avions').
+    Par défaut, elles s'exécutent ici en partageant un même contexte, chaque agrégat n'étant calculé qu'une fois.
+    Avec plusieurs processus, les lots de LOTS_PARALLELES sont répartis sur un pool qui lit les DataFrames
+    depuis des fichiers Arrow temporaires (au plus un processus par lot).
+    Les sorties sont affichées dans l'ordre des questions, suivies du temps de chaque question.
+    Renvoie les résultats des questions (objets de src/resultats.py, dans l'ordre de QUESTIONS)
+    et les durées par libellé de question.
+    """
+    nb_processus = min(nb_processus or 1, len(LOTS_PARALLELES))
+    resultats = []
+    if nb_processus > 1:
+        numeros = {libelle: numero for numero, (libelle, _, _) in enumerate(QUESTIONS)}
+        lots = [[numeros[libelle] for libelle in lot] for lot in LOTS_PARALLELES]
+        dossier = tempfile.mkdtemp(prefix='analyses_')
+        try:
+            chemins = _ecrire_arrow(donnees, dossier)
+            with ProcessPoolExecutor(max_workers=nb_processus, initializer=_initialiser_processus,
+                                     initargs=(chemins, est_active())) as pool:
+                for resultats_lot, spans_lot in pool.map(_lot_dans_processus, lots):
+                    resultats.extend(resultats_lot)
+                    ajouter_spans(spans_lot)
+        except ImportError:
+            print(" Avertissement : pyarrow est nécessaire pour l'exécution en parallèle, exécution séquentielle.")
+            nb_processus = 1
+        finally:
+            shutil.rmtree(dossier, ignore_errors=True)
+
+    if nb_processus == 1:
+        contexte = ContexteAnalyse(donnees['vols'], donnees['aeroports'], donnees['compagnies'])
+        resultats = [_executer_question(numero, donnees, contexte) for numero in range(len(QUESTIONS))]
+
+    compteurs = Counter()
+    durees = {}
+    objets = []
+    for numero, resultat, sortie, duree, compteurs_question in sorted(resultats, key=lambda r: r[0]):
+        print(sortie, end='')
+        objets.append(resultat)
+        compteurs.update(compteurs_question)
+        durees[QUESTIONS[numero][0]] = duree
+
+    afficher_compteurs(compteurs)
+    print(f"\n--- Temps par question ({nb_processus} processus) ---")
+    for libelle, duree in durees.items():
+        print(f"  - {libelle} : {duree:.3f} s")
+    return objets, durees
@@ -0,0 +1,158 @@
+import json
+import os
+import threading
+import time
+from collections import namedtuple
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# Mesure d'étapes (chargement, validation, analyse, insertion) par des spans :
+#
+#     with etape('charger_vols', 'chargement') as span:
+#         df = ...
+#         span.lignes = len(df)
+#
+# Désactivée par défaut : etape() renvoie alors un span inerte partagé, sans lecture d'horloge ni
+# allocation. Une fois activée, chaque span enregistre son temps écoulé, le temps CPU de son thread,
+# la hausse du pic de mémoire résidente du processus (ru_maxrss, nulle tant que le pic précédent n'est
+# pas dépassé) et le nombre de lignes traitées.
+Span = namedtuple('Span', ['nom', 'categorie', 'debut', 'duree', 'cpu', 'pic_rss_mo', 'lignes', 'pid', 'thread'])
+
+_ACTIF = False
+_SPANS = []
+_VERROU = threading.Lock()
+_ORIGINE = time.perf_counter()
+
+
+def pic_rss_mo():
+    """Pic de mémoire résidente du processus en Mo, ou None si la plateforme ne le fournit pas."""
+    if resource is None:
+        return None
+    # ru_maxrss est en Ko sous Linux et en octets sous macOS
+    pic = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return pic / 1e6 if os.uname().sysname == 'Darwin' else pic / 1e3
+
+
+class _SpanInactif:
+    """Span renvoyé quand l'instrumentation est désactivée : n'enregistre rien."""
+
+    lignes = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def __setattr__(self, nom, valeur):
+        pass
+
+
+_INACTIF = _SpanInactif()
+
+
+class _SpanActif:
+    __slots__ = ('nom', 'categorie', 'lignes', '_debut', '_cpu', '_pic')
+
+    def __init__(self, nom, categorie, lignes):
+        self.nom, self.categorie, self.lignes = nom, categorie, lignes
+
+    def __enter__(self):
+        self._pic = pic_rss_mo()
+        self._cpu = time.thread_time()
+        self._debut = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        fin = time.perf_counter()
+        cpu = time.thread_time() - self._cpu
+        pic = pic_rss_mo()
+        span = Span(self.nom, self.categorie, self._debut - _ORIGINE, fin - self._debut, cpu,
+                    None if pic is None else pic - self._pic, self.lignes, os.getpid(), threading.get_ident())
+        with _VERROU:
+            _SPANS.append(span)
+        return False
+
+
+def etape(nom, categorie='', lignes=None):
+    """Span de mesure à utiliser dans un bloc with ; `lignes` peut aussi être fixé dans le bloc."""
+    if not _ACTIF:
+        return _INACTIF
+    return _SpanActif(nom, categorie, lignes)
+
+
+def activer():
+    global _ACTIF
+    _ACTIF = True
+
+
+def desactiver():
+    global _ACTIF
+    _ACTIF = False
+
+
+def est_active():
+    return _ACTIF
+
+
+def reinitialiser():
+    """Oublie les spans enregistrés."""
+    with _VERROU:
+        _SPANS.clear()
+
+
+def spans():
+    """Copie des spans enregistrés, dans l'ordre de fin."""
+    with _VERROU:
+        return list(_SPANS)
+
+
+def ajouter_spans(nouveaux):
+    """Ajoute des spans enregistrés ailleurs, par exemple dans un processus du pool d'analyses."""
+    with _VERROU:
+        _SPANS.extend(Span(*span) for span in nouveaux)
+
+
+def afficher_resume():
+    """Affiche, par étape, le nombre d'appels, les temps cumulés, le plus grand pic mémoire et les lignes traitées."""
+    totaux = {}
+    for span in spans():
+        total = totaux.setdefault((span.categorie, span.nom), [0, 0.0, 0.0, None, None])
+        total[0] += 1
+        total[1] += span.duree
+        total[2] += span.cpu
+        if span.pic_rss_mo is not None:
+            total[3] = max(total[3] or 0.0, span.pic_rss_mo)
+        if span.lignes is not None:
+            total[4] = (total[4] or 0) + span.lignes
+    print("\n--- Temps par étape ---")
+    print(f"  {'catégorie':<12}{'étape':<40}{'appels':>7}{'durée (s)':>11}{'CPU (s)':>9}{'pic (Mo)':>10}{'lignes':>12}")
+    for (categorie, nom), (nb, duree, cpu, pic, lignes) in totaux.items():
+        print(f"  {categorie:<12}{nom:<40}{nb:>7}{duree:>11.3f}{cpu:>9.3f}"
+              f"{'' if pic is None else f'{pic:.1f}':>10}{'' if lignes is None else lignes:>12}")
+
+
+def _evenements_chrome():
+    """Événements complets ('X') du format Trace Event, lisibles par chrome://tracing et Perfetto."""
+    return [{'name': span.nom, 'cat': span.categorie, 'ph': 'X', 'ts': span.debut * 1e6, 'dur': span.duree * 1e6,
+             'pid': span.pid, 'tid': span.thread,
+             'args': {'cpu_s': span.cpu, 'pic_rss_mo': span.pic_rss_mo, 'lignes': span.lignes}}
+            for span in spans()]
+
+
+def exporter(chemin, format='chrome'):
+    """
+    Écrit les spans enregistrés dans `chemin` : format 'chrome' (Trace Event, à ouvrir dans
+    chrome://tracing ou ui.perfetto.dev) ou 'json' (une entrée par span, durées en secondes).
+    """
+    if format == 'chrome':
+        contenu = {'traceEvents': _evenements_chrome(), 'displayTimeUnit': 'ms'}
+    elif format == 'json':
+        contenu = [span._asdict() for span in spans()]
+    else:
+        raise ValueError(f"Format de trace inconnu : {format}")
+    with open(chemin, 'w', encoding='utf-8') as f:
+        json.dump(contenu, f, ensure_ascii=False, indent=1)
@@ -1,45 +1,84 @@
-from src.data_loader import charger_aeroports, charger_vols, charger_compagnies, charger_avions, charger_meteo
-from src.analysis import (analyses_comptages_simples, analyses_classements, analyses_comptages_suite, 
-                         analyse_par_compagnie, analyses_filtrage_et_tri, 
-                         couverture_compagnies, destinations_exclusives, 
-                         vols_principales_compagnies)
-from src.database import populate_database
-
-def run_analysis_mission():
+import os
+
+from src import instrumentation
+from src.execution import executer_analyses
+from src.rendu import exporter
+from src.session import SessionDonnees
+
+def run_analysis_mission(nb_processus=1, dossier_export=None, formats_export=('json', 'csv'), source='fichiers',
+                         session=None):
     """
     Exécute la Mission 1 : charger les données depuis les fichiers et répondre à toutes les questions d'analyse.
+    Les questions s'exécutent sur `nb_processus` processus (par défaut un seul, voir executer_analyses).
+    Avec source='base', les questions sont calculées par la base peuplée par la Mission 2, à partir de ses
+    tables de résumé (voir analyse_sql), sans charger les fichiers. Sinon les fichiers sont lus depuis `session`
+    (voir SessionDonnees) : ceux déjà lus par la Mission 2 dans la même session ne sont pas relus.
+    Si `dossier_export` est fourni, les résultats y sont aussi écrits dans les `formats_export` (voir rendu.exporter).
+    Renvoie les résultats des questions.
     """
     print("--- Lancement de la Mission 1 : Analyse des Données ---\n")
 
-    
-    df_aeroports = charger_aeroports()
-    df_vols = charger_vols()
-    df_compagnies = charger_compagnies()
-    df_avions = charger_avions()
-    df_meteo = charger_meteo()
+    if source == 'base':
+        from src.analyse_sql import executer_analyses_sql
+        from src.database import get_db_engine
+
+        engine = get_db_engine()
+        if engine is None: return None
+        print("\n--- Début de l'analyse (tables de résumé de la base) ---")
+        resultats = executer_analyses_sql(engine)
+        _exporter_resultats(resultats, dossier_export, formats_export)
+        return resultats
+
+    if session is None:
+        session = SessionDonnees()
+    # Fichiers lus en parallèle, chacun attendu au moment de son utilisation ; la météo ne sert pas aux questions.
+    session.precharger(('airports', 'flights', 'airlines', 'planes'))
+    df_aeroports = session.brut('airports')
+    df_vols = session.brut('flights')
+    df_compagnies = session.brut('airlines')
+    df_avions = session.brut('planes')
 
     print("\n--- Début de l'analyse ---")
 
     
-    analyses_comptages_simples(df_aeroports, df_compagnies, df_avions, df_vols) #Q1
-    analyses_comptages_suite(df_vols, df_aeroports) #Q1
-    analyses_classements(df_vols, df_aeroports) #Q2
-    analyse_par_compagnie(df_vols, df_compagnies) #Q3
-    analyses_filtrage_et_tri(df_vols, df_aeroports, df_compagnies) #Q4 et Q5
-    couverture_compagnies(df_vols, df_compagnies) #Q6
-    destinations_exclusives(df_vols, df_compagnies) #Q7
-    vols_principales_compagnies(df_vols, df_compagnies) #Q8
+    # Q1 à Q8 ne font que lire les DataFrames : elles peuvent s'exécuter en parallèle, leurs sorties
+    # sont réaffichées dans l'ordre des questions. En séquentiel, elles partagent un même contexte d'agrégats.
+    donnees = {'vols': df_vols, 'aeroports': df_aeroports, 'compagnies': df_compagnies, 'avions': df_avions}
+    resultats, _ = executer_analyses(donnees, nb_processus)
+    _exporter_resultats(resultats, dossier_export, formats_export)
+    return resultats
+
+
+def _exporter_resultats(resultats, dossier_export, formats_export):
+    if dossier_export is not None:
+        chemins = exporter(resultats, dossier_export, formats_export)
+        print(f" {len(chemins)} fichier(s) de résultats écrits dans '{dossier_export}'.")
     
-def run_database_mission():
+def run_database_mission(session=None):
     """
     Exécute la Mission 2 : peupler la base de données sur Supabase.
     """
+    # Import différé : SQLAlchemy et le reste de la couche base ne sont chargés que pour la Mission 2.
+    from src.database import populate_database
+
     print("--- Lancement de la Mission 2 : Création et Peuplement de la DB ---")
-    populate_database()
+    populate_database(session=session)
     
 
 if __name__ == "__main__":
-    run_database_mission()
+    # FICHIER_TRACE=trace.json active la mesure des étapes et écrit la trace (FORMAT_TRACE : 'chrome' ou 'json').
+    fichier_trace = os.getenv('FICHIER_TRACE')
+    if fichier_trace:
+        instrumentation.activer()
+
+    # Une seule lecture des fichiers pour les deux missions.
+    session = SessionDonnees()
+    run_database_mission(session)
     
     print("\n" + "="*50 + "\n")
-    run_analysis_mission()
\ No newline at end of file
+    run_analysis_mission(session=session)
+
+    if fichier_trace:
+        instrumentation.afficher_resume()
+        instrumentation.exporter(fichier_trace, os.getenv('FORMAT_TRACE', 'chrome'))
+        print(f" Trace des étapes écrite dans '{fichier_trace}'.")
\ No newline at end of file
@@ -0,0 +1,270 @@
+import io
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from src.resultats import (AnalyseParCompagnie, Classements, ComptagesSimples, ComptagesSuite,
+                           CouvertureCompagnies, DestinationsExclusives, FiltrageEtTri, PrincipalesCompagnies)
+
+# Mise en forme des résultats de src/resultats.py : texte (tableaux et graphiques ASCII de la Mission 1),
+# JSON, CSV et Parquet. Aucun calcul ici, uniquement de la présentation.
+
+SEPARATEUR = "-" * 40
+
+
+def _barre(valeur, maximum, largeur, caractere):
+    return caractere * int(valeur * largeur / maximum)
+
+
+def _texte_comptages_simples(r):
+    lignes = ["--- 1. Statistiques de base ---"]
+    if r.nb_aeroports is not None:
+        lignes.append(f"Nombre total d'aéroports : {r.nb_aeroports}")
+    if r.nb_compagnies is not None:
+        lignes.append(f"Nombre total de compagnies : {r.nb_compagnies}")
+    if r.nb_avions is not None:
+        lignes.append(f"Nombre total d'avions uniques : {r.nb_avions}")
+    if r.nb_vols_annules is not None:
+        lignes.append(f"Nombre de vols annulés : {r.nb_vols_annules}")
+    lignes.append(SEPARATEUR)
+    return lignes
+
+
+def _texte_comptages_suite(r):
+    lignes = ["\n--- 1. (Suite) Statistiques de base ---"]
+    if r.nb_departs_uniques is not None:
+        lignes.append(f"Nombre d'aéroports de départ uniques : {r.nb_departs_uniques}")
+        lignes.append(f"Nombre d'aéroports de destination uniques : {r.nb_destinations_uniques}")
+    if r.nb_aeroports_sans_heure_ete is not None:
+        lignes.append(f"Nombre d'aéroports sans heure d'été : {r.nb_aeroports_sans_heure_ete}")
+        lignes.append(f"Nombre de fuseaux horaires uniques : {r.nb_fuseaux_horaires}")
+    lignes.append(SEPARATEUR)
+    return lignes
+
+
+def _texte_classements(r):
+    lignes = ["\n--- 2. Aéroport de départ le plus fréquenté ---",
+              f"L'aéroport de départ le plus emprunté est : {r.aeroport_top}",
+              SEPARATEUR]
+    if r.destinations is not None:
+        destinations = r.destinations.assign(pourcentage=r.destinations['pourcentage'].map('{:.2f}%'.format))
+        destinations = destinations[['name', 'nombre_vols', 'pourcentage']]
+        lignes += ["\n--- Top 10 des destinations les plus prisées ---",
+                   destinations.head(10).to_string(index=False),
+                   "\n--- Top 10 des destinations les moins prisées ---",
+                   destinations.tail(10).to_string(index=False),
+                   SEPARATEUR]
+    lignes += ["\n--- Top 10 des avions ayant le plus décollé ---",
+               str(r.vols_par_avion.head(10)),
+               "\n--- Top 10 des avions ayant le moins décollé ---",
+               str(r.vols_par_avion.tail(10)),
+               SEPARATEUR]
+    return lignes
+
+
+def _texte_par_compagnie(r):
+    destinations = r.destinations
+    lignes = ["\n--- 3. Nombre de destinations desservies par compagnie ---",
+              destinations[['name', 'nombre_destinations_uniques']].to_string(index=False),
+              SEPARATEUR,
+              "\n--- GRAPHIQUE 1 : Destinations par compagnie (Top 10) ---"]
+    top_10 = destinations.head(10)
+    maximum = top_10['nombre_destinations_uniques'].max()
+    for nom, nb_dest in zip(top_10['name'], top_10['nombre_destinations_uniques']):
+        lignes.append(f"{nom[:20].ljust(20)} |{_barre(nb_dest, maximum, 40, '█')} {nb_dest}")
+    lignes += [SEPARATEUR,
+               "\n--- Destinations par compagnie et par aéroport d'origine (Top 15) ---",
+               str(r.destinations_par_origine.head(15)),
+               SEPARATEUR,
+               "\n--- GRAPHIQUE 2 : Top 15 Compagnie-Aéroport ---"]
+    top_15 = r.destinations_par_origine.head(15)
+    maximum = top_15['dest'].max()
+    for nom, origine, nb_dest in zip(top_15['name'], top_15['origin'], top_15['dest']):
+        lignes.append(f"{f'{nom[:15]}-{origine}'.ljust(20)} |{_barre(nb_dest, maximum, 30, '▓')} {nb_dest}")
+    lignes += [SEPARATEUR,
+               "\n--- TABLEAU DE SYNTHÈSE : Statistiques par compagnie ---",
+               destinations.head(10)[['name', 'nombre_destinations_uniques', 'pourcentage_destinations']]
+               .to_string(index=False),
+               SEPARATEUR]
+    return lignes
+
+
+def _texte_filtrage_et_tri(r):
+    lignes = ["\n--- 4/5. Vols à destination de Houston (IAH ou HOU) ---",
+              f"Nombre de vols trouvés pour Houston : {len(r.vols_houston)}",
+              r.vols_houston.head().to_string(),
+              SEPARATEUR,
+              "\n--- Nombre de vols par destination ---",
+              "Top 15 des destinations les plus fréquentées :",
+              str(r.vols_par_destination.head(15)),
+              "\n--- Graphique ASCII : Top 10 destinations ---"]
+    top_10 = r.vols_par_destination.head(10)
+    maximum = top_10.max()
+    for destination, nb_vols in top_10.items():
+        lignes.append(f"{destination.ljust(4)} |{_barre(nb_vols, maximum, 30, '█')} {nb_vols}")
+    lignes += [SEPARATEUR,
+               "\n--- Analyse des vols de NYC vers Seattle (SEA) ---",
+               f"Nombre de vols de NYC vers Seattle : {r.nb_vols_nyc_sea}",
+               f"Nombre de compagnies desservant cette destination : {r.nb_compagnies_nyc_sea}",
+               f"Nombre d'avions uniques sur cette route : {r.nb_avions_nyc_sea}",
+               SEPARATEUR]
+    if r.vols_tries is not None:
+        lignes += ["\n--- Aperçu des vols triés (Destination, Origine, Compagnie) ---",
+                   r.vols_tries.to_string(index=False),
+                   SEPARATEUR]
+    return lignes
+
+
+def _texte_couverture(r):
+    tableau = r.tableau
+    lignes = ["\n--- 6. Analyse des compagnies et de leur couverture ---",
+              f"Nombre total d'aéroports d'origine : {r.nb_aeroports_origine}",
+              f"Nombre total de destinations : {r.nb_destinations}"]
+
+    pas_toutes_origines = tableau[~tableau['couvre_toutes_origines']]
+    lignes.append(f"\nCompagnies qui n'opèrent PAS sur tous les aéroports d'origine ({len(pas_toutes_origines)}) :")
+    for nom, nb_origines in zip(pas_toutes_origines['name'], pas_toutes_origines['nb_origines']):
+        lignes.append(f"  - {nom} : {nb_origines}/{r.nb_aeroports_origine} aéroports")
+
+    toutes_destinations = tableau[tableau['couvre_toutes_destinations']]
+    lignes.append(f"\nCompagnies qui desservent TOUTES les destinations ({len(toutes_destinations)}) :")
+    for nom, nb_destinations in zip(toutes_destinations['name'], toutes_destinations['nb_destinations']):
+        lignes.append(f"  - {nom} : {nb_destinations} destinations")
+
+    recap = tableau[['name', 'nb_origines', 'nb_destinations']].sort_values('nb_destinations', ascending=False)
+    lignes += ["\n--- TABLEAU RÉCAPITULATIF : Couverture par compagnie ---",
+               recap.to_string(index=False),
+               SEPARATEUR]
+    return lignes
+
+
+def _texte_exclusives(r):
+    lignes = ["\n--- 7. Destinations exclusives à certaines compagnies ---",
+              f"Nombre de destinations exclusives : {len(r.exclusives)}",
+              "Destinations exclusives :"]
+    for dest, compagnies in sorted(r.exclusives.items()):
+        lignes.append(f"  - {dest} : exclusivement desservie par {compagnies[0]}")
+    lignes.append(f"\nDestinations peu desservies (2-3 compagnies) : {r.nb_peu_desservies}")
+    for dest, compagnies in sorted(r.peu_desservies.items()):
+        lignes.append(f"  - {dest} : {len(compagnies)} compagnies ({', '.join(compagnies)})")
+    lignes.append(SEPARATEUR)
+    return lignes
+
+
+def _texte_principales_compagnies(r):
+    lignes = ["\n--- 8. Vols exploités par United, American ou Delta ---"]
+    for nom_compagnie, codes in r.codes.items():
+        lignes.append(f"Code trouvé pour {nom_compagnie} : {codes}")
+
+    if r.repartition is None:
+        lignes.append("Aucune des compagnies principales trouvée dans les données.")
+    else:
+        lignes += [f"\nNombre total de vols pour United/American/Delta : {r.nb_vols}",
+                   "\nRépartition par compagnie :"]
+        for ligne in r.repartition.itertuples(index=False):
+            lignes.append(f"  - {ligne.name} ({ligne.carrier}) : {ligne.nb_vols} vols ({ligne.pourcentage:.1f}%)")
+        lignes.append("\n--- Graphique ASCII : Répartition United/American/Delta ---")
+        maximum = r.repartition['nb_vols'].max()
+        for ligne in r.repartition.itertuples(index=False):
+            lignes.append(f"{ligne.name[:15].ljust(15)} |{_barre(ligne.nb_vols, maximum, 30, '█')} {ligne.nb_vols}")
+        lignes += [f"\n--- Échantillon des vols filtrés (10 premiers) ---",
+                   r.echantillon.to_string(index=False)]
+    lignes.append(SEPARATEUR)
+    return lignes
+
+
+RENDUS_TEXTE = {
+    ComptagesSimples: _texte_comptages_simples,
+    ComptagesSuite: _texte_comptages_suite,
+    Classements: _texte_classements,
+    AnalyseParCompagnie: _texte_par_compagnie,
+    FiltrageEtTri: _texte_filtrage_et_tri,
+    CouvertureCompagnies: _texte_couverture,
+    DestinationsExclusives: _texte_exclusives,
+    PrincipalesCompagnies: _texte_principales_compagnies,
+}
+
+
+def texte(resultat):
+    """Rendu texte d'un résultat : tableaux et graphiques ASCII tels qu'affichés par la Mission 1."""
+    return '\n'.join(RENDUS_TEXTE[type(resultat)](resultat))
+
+
+def afficher(resultat):
+    print(texte(resultat))
+
+
+def _vers_python(valeur):
+    """Convertit une valeur de résultat en types sérialisables en JSON."""
+    if isinstance(valeur, pd.DataFrame):
+        return json.loads(valeur.to_json(orient='records', force_ascii=False))
+    if isinstance(valeur, pd.Series):
+        return {str(cle): _vers_python(v) for cle, v in valeur.items()}
+    if isinstance(valeur, dict):
+        return {str(cle): _vers_python(v) for cle, v in valeur.items()}
+    if isinstance(valeur, (list, tuple, set)):
+        return [_vers_python(v) for v in (sorted(valeur) if isinstance(valeur, set) else valeur)]
+    if isinstance(valeur, np.generic):
+        return valeur.item()
+    if valeur is pd.NA:
+        return None
+    return valeur
+
+
+def vers_dict(resultat):
+    """Résultat sous forme de dictionnaire de types Python simples (une entrée par champ)."""
+    return {nom: _vers_python(getattr(resultat, nom)) for nom in resultat.__dataclass_fields__}
+
+
+def vers_json(resultat, indent=2):
+    return json.dumps({'question': resultat.NOM, **vers_dict(resultat)}, ensure_ascii=False, indent=indent)
+
+
+def vers_csv(resultat):
+    """Tables du résultat au format CSV : dictionnaire nom de table -> texte CSV."""
+    sorties = {}
+    for nom, table in resultat.tables().items():
+        tampon = io.StringIO()
+        table.to_csv(tampon, index=False)
+        sorties[nom] = tampon.getvalue()
+    return sorties
+
+
+FORMATS = ('texte', 'json', 'csv', 'parquet')
+
+
+def exporter(resultats, dossier, formats=FORMATS):
+    """
+    Écrit les résultats dans `dossier` : un fichier .txt et .json par question, un fichier .csv et .parquet
+    par table de chaque question (nommés <question>.<table>.<extension>). Renvoie les chemins écrits.
+    """
+    inconnus = set(formats) - set(FORMATS)
+    if inconnus:
+        raise ValueError(f"Format(s) d'export inconnu(s) : {sorted(inconnus)}")
+    os.makedirs(dossier, exist_ok=True)
+    chemins = []
+
+    def ecrire(nom_fichier, contenu):
+        chemin = os.path.join(dossier, nom_fichier)
+        with open(chemin, 'w', encoding='utf-8') as f:
+            f.write(contenu)
+        chemins.append(chemin)
+
+    for resultat in resultats:
+        if resultat is None:
+            continue
+        if 'texte' in formats:
+            ecrire(f'{resultat.NOM}.txt', texte(resultat) + '\n')
+        if 'json' in formats:
+            ecrire(f'{resultat.NOM}.json', vers_json(resultat))
+        if 'csv' in formats:
+            for nom_table, contenu in vers_csv(resultat).items():
+                ecrire(f'{resultat.NOM}.{nom_table}.csv', contenu)
+        if 'parquet' in formats:
+            for nom_table, table in resultat.tables().items():
+                chemin = os.path.join(dossier, f'{resultat.NOM}.{nom_table}.parquet')
+                table.to_parquet(chemin, index=False)
+                chemins.append(chemin)
+    return chemins
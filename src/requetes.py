@@ -0,0 +1,278 @@
+import numpy as np
+import pandas as pd
+
+# Index disponibles et critères de `IndexVols.filtrer` qu'ils servent.
+INDEX_CRITERES = {
+    'route': ('origin', 'dest'),
+    'carrier': ('carrier',),
+    'tailnum': ('tailnum',),
+    'date': ('date', 'date_min', 'date_max'),
+}
+
+
+def _codes_et_valeurs(serie):
+    """Codes entiers et valeurs distinctes d'une colonne ; pour un catégoriel, les codes existants sont réutilisés."""
+    if isinstance(serie.dtype, pd.CategoricalDtype):
+        return serie.cat.codes.to_numpy(), np.asarray(serie.cat.categories)
+    codes, valeurs = pd.factorize(serie)
+    return codes, np.asarray(valeurs)
+
+
+def _liste(valeurs):
+    """Un critère peut être une valeur seule ou une liste de valeurs."""
+    if isinstance(valeurs, (list, tuple, set, frozenset, np.ndarray, pd.Index, pd.Series)):
+        return list(valeurs)
+    return [valeurs]
+
+
+def _cle_date(date):
+    """Clé entière aaaammjj d'une date (tout ce que pd.Timestamp accepte : '2013-01-31', datetime.date...)."""
+    date = pd.Timestamp(date)
+    return date.year * 10000 + date.month * 100 + date.day
+
+
+class _IndexTrie:
+    """
+    Positions des lignes triées par une clé entière : les lignes d'une même clé sont contiguës,
+    une recherche dichotomique donne donc leur intervalle en O(log n).
+    Les clés négatives (valeur manquante) ne sont jamais trouvées.
+    """
+
+    def __init__(self, cles):
+        self.ordre = np.argsort(cles, kind='stable')
+        self.cles_triees = cles[self.ordre]
+
+    def bornes(self, cle_min, cle_max):
+        """Intervalles [debut, fin) de `ordre` dont les clés sont comprises entre cle_min et cle_max (inclus)."""
+        # Clés recherchées au type de l'index : sinon numpy convertit tout le tableau trié à chaque recherche.
+        cle_min = np.asarray(cle_min, dtype=self.cles_triees.dtype)
+        cle_max = np.asarray(cle_max, dtype=self.cles_triees.dtype)
+        debuts = np.searchsorted(self.cles_triees, cle_min, side='left')
+        fins = np.searchsorted(self.cles_triees, cle_max, side='right')
+        return debuts, np.maximum(fins, debuts)
+
+    def positions(self, debuts, fins):
+        """Positions des lignes couvertes par les intervalles, sans boucle Python."""
+        longueurs = fins - debuts
+        total = int(longueurs.sum())
+        if total == 0:
+            return np.empty(0, dtype=np.intp)
+        decalages = np.repeat(debuts - (np.cumsum(longueurs) - longueurs), longueurs)
+        return self.ordre[decalages + np.arange(total)]
+
+
+class IndexVols:
+    """
+    Index des vols par route (origin, dest), compagnie, avion et date, construits à la première requête
+    qui en a besoin. Une requête coûte O(log n + k) pour k vols trouvés au lieu d'un masque sur toute la table.
+    Les index décrivent `df_vols` au moment de leur construction : en cas de modification, recréer l'objet.
+    """
+
+    def __init__(self, df_vols):
+        self.df_vols = df_vols
+        self._codes = {}
+        self._index = {}
+
+    def construire(self):
+        """Construit tous les index d'un coup (sinon ils le sont à la demande)."""
+        for nom in INDEX_CRITERES:
+            self._obtenir_index(nom)
+        return self
+
+    def _codes_colonne(self, colonne):
+        if colonne not in self._codes:
+            codes, valeurs = _codes_et_valeurs(self.df_vols[colonne])
+            self._codes[colonne] = codes.astype(np.int64), pd.Index(valeurs)
+        return self._codes[colonne]
+
+    def _codes_recherches(self, colonne, valeurs):
+        """Codes des valeurs recherchées présentes dans les vols (toutes les valeurs si `valeurs` vaut None)."""
+        codes, index_valeurs = self._codes_colonne(colonne)
+        if valeurs is None:
+            return np.arange(len(index_valeurs), dtype=np.int64)
+        codes_recherches = index_valeurs.get_indexer(_liste(valeurs))
+        return np.unique(codes_recherches[codes_recherches >= 0]).astype(np.int64)
+
+    def _cles_date(self):
+        """Clé aaaammjj de chaque vol, calculée une fois."""
+        if 'date' not in self._codes:
+            df = self.df_vols
+            self._codes['date'] = (df['year'].to_numpy(np.int32) * 10000 + df['month'].to_numpy(np.int32) * 100
+                                   + df['day'].to_numpy(np.int32))
+        return self._codes['date']
+
+    def _cles_route(self):
+        codes_origines, _ = self._codes_colonne('origin')
+        codes_destinations, destinations = self._codes_colonne('dest')
+        cles = codes_origines * len(destinations) + codes_destinations
+        cles[(codes_origines < 0) | (codes_destinations < 0)] = -1
+        return cles
+
+    def _obtenir_index(self, nom):
+        if nom not in self._index:
+            if nom == 'route':
+                cles = self._cles_route()
+            elif nom == 'date':
+                cles = self._cles_date()
+            else:
+                cles = self._codes_colonne(nom)[0]
+            self._index[nom] = _IndexTrie(cles)
+        return self._index[nom]
+
+    def _intervalles(self, nom, criteres):
+        """Intervalles de l'index `nom` qui répondent aux critères qui le concernent."""
+        if nom == 'date':
+            if criteres.get('date') is not None:
+                cles = np.unique([_cle_date(d) for d in _liste(criteres['date'])])
+                return cles, cles
+            cle_min = _cle_date(criteres['date_min']) if criteres.get('date_min') is not None else 0
+            cle_max = _cle_date(criteres['date_max']) if criteres.get('date_max') is not None else 99991231
+            return np.array([cle_min]), np.array([cle_max])
+
+        if nom == 'route':
+            origines = self._codes_recherches('origin', criteres.get('origin'))
+            destinations = self._codes_recherches('dest', criteres.get('dest'))
+            nb_destinations = len(self._codes_colonne('dest')[1])
+            cles = (origines[:, None] * nb_destinations + destinations[None, :]).ravel()
+            return cles, cles
+
+        cles = self._codes_recherches(nom, criteres[nom])
+        return cles, cles
+
+    def _masque(self, nom, criteres, positions):
+        """Masque des lignes `positions` qui respectent les critères de l'index `nom` (filtrage des candidats)."""
+        if nom == 'date':
+            cles = self._cles_date()[positions]
+            cle_min, cle_max = self._intervalles('date', criteres)
+            if criteres.get('date') is not None:
+                return np.isin(cles, cle_min)
+            return (cles >= cle_min[0]) & (cles <= cle_max[0])
+
+        colonnes = INDEX_CRITERES[nom]
+        masque = np.ones(len(positions), dtype=bool)
+        for colonne in colonnes:
+            if criteres.get(colonne) is not None:
+                codes = self._codes_colonne(colonne)[0][positions]
+                masque &= np.isin(codes, self._codes_recherches(colonne, criteres[colonne]))
+        return masque
+
+    def positions(self, trier=True, **criteres):
+        """
+        Positions (au sens de iloc, dans l'ordre de la table) des vols qui respectent tous les critères :
+        origin, dest, carrier, tailnum (valeur ou liste de valeurs), date (une date ou une liste de dates),
+        date_min / date_max (bornes incluses).
+        Seul l'index le plus sélectif est parcouru ; les autres critères filtrent ses k lignes candidates.
+        trier=False renvoie les positions dans l'ordre de l'index (évite le tri des k positions).
+        """
+        inconnus = set(criteres) - {c for noms in INDEX_CRITERES.values() for c in noms}
+        if inconnus:
+            raise ValueError(f"Critère(s) de recherche inconnu(s) : {sorted(inconnus)}")
+        utilises = [nom for nom, noms in INDEX_CRITERES.items() if any(criteres.get(c) is not None for c in noms)]
+        if not utilises:
+            return np.arange(len(self.df_vols))
+
+        intervalles = {}
+        for nom in utilises:
+            cle_min, cle_max = self._intervalles(nom, criteres)
+            intervalles[nom] = self._obtenir_index(nom).bornes(cle_min, cle_max)
+        plus_selectif = min(utilises, key=lambda nom: int((intervalles[nom][1] - intervalles[nom][0]).sum()))
+
+        positions = self._index[plus_selectif].positions(*intervalles[plus_selectif])
+        for nom in utilises:
+            if nom != plus_selectif and len(positions):
+                positions = positions[self._masque(nom, criteres, positions)]
+        return positions if not trier else np.sort(positions)
+
+    def filtrer(self, **criteres):
+        """Vols qui respectent les critères (voir `positions`), dans l'ordre de la table."""
+        return self.df_vols.iloc[self.positions(**criteres)]
+
+    def compter(self, **criteres):
+        """Nombre de vols qui respectent les critères, sans extraire les lignes."""
+        return len(self.positions(trier=False, **criteres))
+
+
+def _rangs_par_code(valeurs, noms):
+    """
+    Tableau de correspondance code -> rang du nom dans l'ordre alphabétique, pour les `valeurs` d'une colonne
+    codée (catégories). `noms` est une Series valeur -> nom ; une valeur sans nom reçoit le rang -1.
+    La dernière case sert au code -1 (valeur manquante) et vaut aussi -1.
+    """
+    noms = noms[~noms.index.duplicated()].reindex(valeurs)
+    rangs = np.full(len(valeurs) + 1, -1, dtype=np.int64)
+    connus = noms.notna().to_numpy()
+    noms_distincts, rangs_connus = np.unique(noms[connus].astype(str).to_numpy(), return_inverse=True)
+    rangs[:-1][connus] = rangs_connus
+    return rangs, noms_distincts
+
+
+class VueTrieeVols:
+    """
+    Vols triés par nom de destination, nom d'origine puis nom de compagnie, sans joindre les tables :
+    chaque code de vol est remplacé par le rang de son nom via un petit tableau de correspondance, et les trois
+    rangs forment une seule clé entière. Comme une jointure interne, les vols dont l'origine, la destination
+    ou la compagnie est absente des référentiels sont écartés. À clé égale, l'ordre de la table est conservé.
+    """
+
+    COLONNES = ['dest_name', 'origin_name', 'name', 'flight', 'tailnum']
+    _ABSENT = np.iinfo(np.int64).max  # clé des vols écartés : ils se placent après tous les autres
+
+    def __init__(self, df_vols, df_aeroports, df_compagnies):
+        self.df_vols = df_vols
+        noms_aeroports = df_aeroports.set_index('faa')['name']
+        noms_compagnies = df_compagnies.set_index('carrier')['name']
+
+        # Seuls une clé par vol et des tableaux de la taille des référentiels sont gardés en mémoire.
+        self._cles = np.zeros(len(df_vols), dtype=np.int64)
+        absents = np.zeros(len(df_vols), dtype=bool)
+        self._correspondances = {}
+        for colonne, noms, nom_sortie in (('dest', noms_aeroports, 'dest_name'),
+                                          ('origin', noms_aeroports, 'origin_name'),
+                                          ('carrier', noms_compagnies, 'name')):
+            codes, valeurs = _codes_et_valeurs(df_vols[colonne])
+            rangs, noms_distincts = _rangs_par_code(valeurs, noms)
+            rangs_vols = rangs.astype(np.int32)[codes]  # le code -1 pointe sur la dernière case
+            absents |= rangs_vols < 0
+            self._cles *= max(len(noms_distincts), 1)
+            self._cles += rangs_vols
+            self._correspondances[nom_sortie] = (colonne, pd.Index(valeurs), rangs, noms_distincts)
+        self._cles[absents] = self._ABSENT
+        self._nb_vols = len(df_vols) - int(absents.sum())
+        self._ordre_complet = None
+
+    def __len__(self):
+        return self._nb_vols
+
+    def _positions_triees(self, fin):
+        """Positions des `fin` premiers vols de l'ordre trié."""
+        fin = min(fin, self._nb_vols)
+        if self._ordre_complet is not None:
+            return self._ordre_complet[:fin]
+        if fin == 0:
+            return np.empty(0, dtype=np.intp)
+        if fin * 8 >= len(self._cles):
+            # Grande partie de la table demandée : on trie tout une fois pour les pages suivantes.
+            self._ordre_complet = np.argsort(self._cles, kind='stable')
+            return self._ordre_complet[:fin]
+        # argpartition ne garde pas l'ordre des ex aequo : la frontière est élargie à toutes les clés
+        # égales à la k-ième, puis le petit ensemble retenu est trié de façon stable.
+        kieme = self._cles[np.argpartition(self._cles, fin - 1)[fin - 1]]
+        candidats = np.flatnonzero(self._cles <= kieme)
+        return candidats[np.argsort(self._cles[candidats], kind='stable')][:fin]
+
+    def _extraire(self, positions):
+        lignes = self.df_vols.iloc[positions]
+        colonnes = {}
+        for nom_sortie, (colonne, valeurs, rangs, noms_distincts) in self._correspondances.items():
+            colonnes[nom_sortie] = noms_distincts[rangs[valeurs.get_indexer(lignes[colonne])]]
+        colonnes['flight'] = lignes['flight'].to_numpy()
+        colonnes['tailnum'] = lignes['tailnum'].to_numpy()
+        return pd.DataFrame(colonnes, columns=self.COLONNES)
+
+    def tete(self, k=10):
+        """Les k premiers vols de l'ordre trié, en O(n) grâce à une sélection partielle."""
+        return self._extraire(self._positions_triees(k))
+
+    def page(self, numero, taille=10):
+        """Page `numero` (à partir de 0) de l'ordre trié complet."""
+        return self._extraire(self._positions_triees((numero + 1) * taille)[numero * taille:])
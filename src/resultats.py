@@ -0,0 +1,129 @@
+from dataclasses import dataclass, field, fields
+from typing import Optional
+
+import pandas as pd
+
+# Résultats typés des questions de la Mission 1. Les fonctions de src/analysis.py les calculent,
+# src/rendu.py les met en forme (texte, JSON, CSV, Parquet). Un champ vaut None quand la donnée
+# nécessaire à son calcul manquait.
+
+
+class _Resultat:
+    """Méthodes communes : découpage du résultat en tables pour les exports tabulaires."""
+
+    NOM = ''
+
+    def tables(self):
+        """
+        Tables du résultat : chaque champ DataFrame ou Series donne une table, les valeurs simples
+        sont regroupées dans une table 'resume' d'une ligne. Les champs à None sont omis.
+        """
+        tables, resume = {}, {}
+        for champ in fields(self):
+            valeur = getattr(self, champ.name)
+            if valeur is None:
+                continue
+            if isinstance(valeur, pd.DataFrame):
+                tables[champ.name] = valeur
+            elif isinstance(valeur, pd.Series):
+                tables[champ.name] = valeur.rename(valeur.name or champ.name).reset_index()
+            elif isinstance(valeur, dict):
+                tables[champ.name] = pd.DataFrame({'cle': list(valeur),
+                                                   'valeurs': [', '.join(map(str, v)) if isinstance(v, list) else v
+                                                               for v in valeur.values()]})
+            else:
+                resume[champ.name] = valeur
+        if resume:
+            tables = {'resume': pd.DataFrame([resume]), **tables}
+        return tables
+
+
+@dataclass
+class ComptagesSimples(_Resultat):
+    """Question 1 : comptages de base."""
+    NOM = 'q1_comptages_simples'
+    nb_aeroports: Optional[int] = None
+    nb_compagnies: Optional[int] = None
+    nb_avions: Optional[int] = None
+    nb_vols_annules: Optional[int] = None
+
+
+@dataclass
+class ComptagesSuite(_Resultat):
+    """Question 1 (suite) : aéroports de départ et de destination, heure d'été, fuseaux horaires."""
+    NOM = 'q1_comptages_suite'
+    nb_departs_uniques: Optional[int] = None
+    nb_destinations_uniques: Optional[int] = None
+    nb_aeroports_sans_heure_ete: Optional[int] = None
+    nb_fuseaux_horaires: Optional[int] = None
+
+
+@dataclass
+class Classements(_Resultat):
+    """Question 2 : aéroport de départ le plus fréquenté, destinations et avions classés par nombre de vols."""
+    NOM = 'q2_classements'
+    aeroport_top: str
+    vols_par_avion: pd.Series
+    # name, nombre_vols, pourcentage (en %) par destination, de la plus à la moins prisée
+    destinations: Optional[pd.DataFrame] = None
+
+
+@dataclass
+class AnalyseParCompagnie(_Resultat):
+    """Question 3 : destinations desservies par compagnie, et par couple compagnie / aéroport d'origine."""
+    NOM = 'q3_par_compagnie'
+    # carrier, nombre_destinations_uniques, name, pourcentage_destinations, par ordre décroissant
+    destinations: pd.DataFrame
+    # carrier, origin, dest (nombre de destinations), name, par ordre décroissant
+    destinations_par_origine: pd.DataFrame
+
+
+@dataclass
+class FiltrageEtTri(_Resultat):
+    """Questions 4 et 5 : vols vers Houston, vols par destination, route NYC -> Seattle, vols triés."""
+    NOM = 'q4_q5_filtrage_et_tri'
+    vols_houston: pd.DataFrame
+    vols_par_destination: pd.Series
+    nb_vols_nyc_sea: int
+    nb_compagnies_nyc_sea: int
+    nb_avions_nyc_sea: int
+    # dest_name, origin_name, name, flight, tailnum : début de l'ordre trié
+    vols_tries: Optional[pd.DataFrame] = None
+
+
+@dataclass
+class CouvertureCompagnies(_Resultat):
+    """Question 6 : couverture des aéroports d'origine et des destinations par compagnie."""
+    NOM = 'q6_couverture'
+    nb_aeroports_origine: int
+    nb_destinations: int
+    # carrier, name, nb_origines, nb_destinations, couvre_toutes_origines, couvre_toutes_destinations,
+    # origines, destinations (ensembles de codes)
+    tableau: pd.DataFrame
+
+    def tables(self):
+        tables = super().tables()
+        tables['tableau'] = self.tableau.assign(
+            origines=self.tableau['origines'].map(lambda codes: ', '.join(sorted(codes))),
+            destinations=self.tableau['destinations'].map(lambda codes: ', '.join(sorted(codes))))
+        return tables
+
+
+@dataclass
+class DestinationsExclusives(_Resultat):
+    """Question 7 : destinations desservies par une seule compagnie, et par deux ou trois."""
+    NOM = 'q7_destinations_exclusives'
+    exclusives: dict  # destination -> [nom de la compagnie]
+    nb_peu_desservies: int
+    peu_desservies: dict = field(default_factory=dict)  # 10 premières : destination -> [noms des compagnies]
+
+
+@dataclass
+class PrincipalesCompagnies(_Resultat):
+    """Question 8 : vols exploités par United, American ou Delta."""
+    NOM = 'q8_principales_compagnies'
+    codes: dict  # nom recherché -> codes trouvés
+    nb_vols: int = 0
+    # carrier, name, nb_vols, pourcentage
+    repartition: Optional[pd.DataFrame] = None
+    echantillon: Optional[pd.DataFrame] = None
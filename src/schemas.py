@@ -0,0 +1,113 @@
+import pandas as pd
+
+# Schémas déclarés des jeux de données : les codes (aéroports, compagnies, avions) sont
+# catégoriels, les entiers sont réduits au plus petit type suffisant (nullable quand la
+# colonne peut être vide) et les retards/durées passent en float32. Les mesures météo, décimales,
+# restent en float64 pour être écrites en base sans erreur d'arrondi.
+
+SCHEMA_AEROPORTS = {
+    'faa': 'string',
+    'name': 'string',
+    'lat': 'float64',
+    'lon': 'float64',
+    'alt': 'int32',
+    'tz': 'int8',
+    'dst': 'category',
+    'tzone': 'category',
+}
+
+SCHEMA_VOLS = {
+    'year': 'int16',
+    'month': 'int8',
+    'day': 'int8',
+    'dep_time': 'Int16',
+    'sched_dep_time': 'int16',
+    'dep_delay': 'float32',
+    'arr_time': 'Int16',
+    'sched_arr_time': 'int16',
+    'arr_delay': 'float32',
+    'carrier': 'category',
+    'flight': 'int32',
+    'tailnum': 'category',
+    'origin': 'category',
+    'dest': 'category',
+    'air_time': 'float32',
+    'distance': 'float32',
+    'hour': 'int8',
+    'minute': 'int8',
+    'time_hour': 'category',
+}
+
+SCHEMA_COMPAGNIES = {
+    'carrier': 'string',
+    'name': 'string',
+}
+
+SCHEMA_AVIONS = {
+    'tailnum': 'string',
+    'year': 'Int16',
+    'type': 'category',
+    'manufacturer': 'category',
+    'model': 'category',
+    'engines': 'int8',
+    'seats': 'int16',
+    'speed': 'Int16',
+    'engine': 'category',
+}
+
+SCHEMA_METEO = {
+    'origin': 'category',
+    'year': 'int16',
+    'month': 'int8',
+    'day': 'int8',
+    'hour': 'int8',
+    'temp': 'float64',
+    'dewp': 'float64',
+    'humid': 'float64',
+    'wind_dir': 'Int16',
+    'wind_speed': 'float64',
+    'wind_gust': 'float64',
+    'precip': 'float64',
+    'pressure': 'float64',
+    'visib': 'float64',
+    'time_hour': 'category',
+}
+
+_TYPES_TEXTE = ('string', 'category')
+
+# Colonnes de dates : gardées en catégories au chargement (peu de valeurs distinctes), mais comparées
+# comme des instants UTC quand la base les rend dans un autre format (timestamp PostgreSQL...).
+COLONNES_DATES = frozenset({'time_hour'})
+
+
+def dtypes_lecture(schema):
+    """
+    Version du schéma passée à `pd.read_csv(dtype=...)`.
+    Les entiers nullables (Int16...) sont lus en float64, beaucoup plus rapide à analyser,
+    puis convertis par `appliquer_schema`.
+    """
+    return {col: ('float64' if dtype.startswith('Int') else dtype) for col, dtype in schema.items()}
+
+
+def appliquer_schema(df, schema):
+    """
+    Convertit les colonnes d'un DataFrame vers les types du schéma.
+    Les valeurs non numériques deviennent NaN, et un entier non nullable qui contient des
+    valeurs manquantes est gardé dans sa variante nullable (Int16, Int32...).
+    """
+    for col, dtype in schema.items():
+        if col not in df.columns or df[col].dtype == dtype:
+            continue
+        if dtype in _TYPES_TEXTE:
+            df[col] = df[col].astype(dtype)
+            continue
+        valeurs = pd.to_numeric(df[col], errors='coerce')
+        if dtype.startswith('int') and valeurs.isna().any():
+            dtype = dtype.capitalize()
+        df[col] = valeurs.astype(dtype)
+    return df
+
+
+def memoire_mo(df):
+    """Mémoire occupée par un DataFrame, en Mo (chaînes comprises)."""
+    return df.memory_usage(deep=True).sum() / 1e6
@@ -0,0 +1,78 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from src.data_loader import charger_aeroports, charger_avions, charger_compagnies, charger_meteo, charger_vols
+
+# Fichier source et fonction de chargement de chaque table, dans l'ordre de chargement historique.
+SOURCES = {
+    'airports': (charger_aeroports, 'airports.csv'),
+    'flights': (charger_vols, 'flights.csv'),
+    'airlines': (charger_compagnies, 'airlines.json'),
+    'planes': (charger_avions, 'planes.html'),
+    'weather': (charger_meteo, 'weather.pdf'),
+}
+
+
+class SessionDonnees:
+    """
+    Données sources partagées par les missions d'un même processus.
+    Chaque fichier de `dossier_donnees` est lu au plus une fois (variante brute, `brut`) ; les variantes
+    dérivées, comme les tables nettoyées de preparer_donnees, sont calculées une fois puis gardées (`obtenir`).
+    Les DataFrames d'une session ne doivent pas être modifiés en place : les variantes dérivées partagent
+    les colonnes qu'elles ne changent pas avec les tables brutes (copie à l'écriture de pandas).
+    `precharger` lance la lecture de plusieurs fichiers en parallèle ; `brut` attend alors la fin de celle
+    qui le concerne.
+    """
+
+    def __init__(self, dossier_donnees='data', utiliser_cache=True):
+        self.dossier_donnees = dossier_donnees
+        self.utiliser_cache = utiliser_cache
+        self._brutes = {}
+        self._en_cours = {}
+        self._derivees = {}
+        self._verrou = threading.Lock()
+
+    def _charger(self, nom):
+        chargeur, fichier = SOURCES[nom]
+        return chargeur(os.path.join(self.dossier_donnees, fichier), self.utiliser_cache)
+
+    def precharger(self, noms=tuple(SOURCES), nb_threads=None):
+        """
+        Lance la lecture des tables `noms` pas encore lues sur un pool de threads et renvoie, pour chacune,
+        le Future de son DataFrame. Les lecteurs CSV, JSON, HTML et Parquet passent l'essentiel de leur temps
+        dans du code C (pandas, lxml, pyarrow) qui relâche le GIL : les fichiers se lisent en même temps.
+        """
+        with self._verrou:
+            a_lire = [nom for nom in noms if nom not in self._brutes and nom not in self._en_cours]
+            if a_lire:
+                pool = ThreadPoolExecutor(max_workers=nb_threads or len(a_lire), thread_name_prefix='chargement')
+                for nom in a_lire:
+                    self._en_cours[nom] = pool.submit(self._charger, nom)
+                pool.shutdown(wait=False)  # les threads s'arrêtent d'eux-mêmes une fois leurs lectures finies
+            return {nom: self._en_cours[nom] for nom in noms if nom in self._en_cours}
+
+    def brut(self, nom):
+        """Table `nom` telle que lue dans son fichier (None si le fichier est illisible)."""
+        with self._verrou:
+            tache = self._en_cours.get(nom)
+        if tache is not None:
+            df = tache.result()
+            with self._verrou:
+                self._brutes[nom] = df
+                self._en_cours.pop(nom, None)
+        if nom not in self._brutes:
+            self._brutes[nom] = self._charger(nom)
+        return self._brutes[nom]
+
+    def obtenir(self, nom, calcul):
+        """Variante dérivée `nom`, calculée par `calcul()` à la première demande."""
+        if nom not in self._derivees:
+            self._derivees[nom] = calcul()
+        return self._derivees[nom]
+
+    def oublier(self):
+        """Oublie toutes les tables : les prochaines demandes relisent les fichiers."""
+        self._brutes.clear()
+        self._en_cours.clear()
+        self._derivees.clear()
@@ -0,0 +1,139 @@
+import glob
+import os
+
+import pandas as pd
+
+from src.schemas import SCHEMA_VOLS, appliquer_schema
+
+# Seules ces colonnes sont nécessaires aux comptages : les autres ne sont même pas analysées.
+COLONNES_FLUX = ['dep_time', 'carrier', 'tailnum', 'origin', 'dest']
+TAILLE_BLOC = 100_000
+
+
+def fichiers_vols(source):
+    """Liste les fichiers de vols d'une source : un fichier CSV, ou un dossier de fichiers CSV (un par mois)."""
+    if os.path.isdir(source):
+        fichiers = sorted(glob.glob(os.path.join(source, '*.csv')))
+        if not fichiers:
+            raise FileNotFoundError(f"Aucun fichier CSV dans le dossier '{source}'.")
+        return fichiers
+    if not os.path.exists(source):
+        raise FileNotFoundError(source)
+    return [source]
+
+
+def iterer_vols(source, taille_bloc=TAILLE_BLOC, colonnes=COLONNES_FLUX):
+    """
+    Lit les vols par blocs de `taille_bloc` lignes, fichier après fichier.
+    Chaque bloc reçoit les mêmes conversions que `charger_vols` pour que les comptages soient identiques.
+    """
+    schema = {col: SCHEMA_VOLS[col] for col in colonnes}
+    for fichier in fichiers_vols(source):
+        with pd.read_csv(fichier, encoding='latin1', usecols=colonnes, chunksize=taille_bloc) as lecteur:
+            for bloc in lecteur:
+                yield appliquer_schema(bloc, schema)
+
+
+def _ajouter_comptes(total, comptes):
+    """Additionne deux séries de comptages indexées par code."""
+    comptes = comptes[comptes > 0]
+    comptes.index = comptes.index.astype(str)
+    if total is None:
+        return comptes
+    return total.add(comptes, fill_value=0).astype('int64')
+
+
+class AgregateurVols:
+    """
+    Agrégats incrémentaux des vols, alimentés bloc par bloc.
+    La mémoire occupée dépend du nombre de codes distincts (aéroports, compagnies, avions) et pas du nombre de vols.
+    """
+
+    def __init__(self):
+        self.nb_vols = 0
+        self.vols_annules = 0
+        self.comptes_origines = None
+        self.comptes_destinations = None
+        self.comptes_avions = None
+        self.triplets = None  # triplets distincts (carrier, origin, dest)
+
+    def ajouter(self, bloc):
+        """Intègre un bloc de vols aux agrégats."""
+        self.nb_vols += len(bloc)
+        self.vols_annules += int(bloc['dep_time'].isnull().sum())
+        self.comptes_origines = _ajouter_comptes(self.comptes_origines, bloc['origin'].value_counts())
+        self.comptes_destinations = _ajouter_comptes(self.comptes_destinations, bloc['dest'].value_counts())
+        self.comptes_avions = _ajouter_comptes(self.comptes_avions, bloc['tailnum'].value_counts())
+
+        triplets = bloc[['carrier', 'origin', 'dest']].dropna().astype(str).drop_duplicates()
+        if self.triplets is not None:
+            triplets = pd.concat([self.triplets, triplets]).drop_duplicates()
+        self.triplets = triplets.reset_index(drop=True)
+        return self
+
+    def departs_uniques(self):
+        return len(self.comptes_origines)
+
+    def destinations_uniques(self):
+        return len(self.comptes_destinations)
+
+    def aeroport_top(self):
+        return self.comptes_origines.idxmax()
+
+    def vols_par_destination(self):
+        return self.comptes_destinations.sort_values(ascending=False)
+
+    def vols_par_avion(self):
+        return self.comptes_avions.sort_values(ascending=False)
+
+    def destinations_par_compagnie(self):
+        """Nombre de destinations distinctes par compagnie, comme `analyse_par_compagnie`."""
+        return self.triplets.groupby('carrier')['dest'].nunique().sort_values(ascending=False)
+
+    def destinations_par_compagnie_et_origine(self):
+        """Nombre de destinations distinctes par couple (compagnie, aéroport d'origine)."""
+        return self.triplets.groupby(['carrier', 'origin'])['dest'].nunique()
+
+
+def agreger_vols(source, taille_bloc=TAILLE_BLOC):
+    """Parcourt une source de vols en flux et renvoie l'agrégateur rempli."""
+    agregateur = AgregateurVols()
+    nb_blocs = 0
+    for bloc in iterer_vols(source, taille_bloc):
+        agregateur.ajouter(bloc)
+        nb_blocs += 1
+    print(f" Source '{source}' lue en flux : {agregateur.nb_vols} vols en {nb_blocs} blocs.")
+    return agregateur
+
+
+def analyses_en_flux(source, df_compagnies=None, taille_bloc=TAILLE_BLOC):
+    """
+    Répond aux comptages des questions 1, 2 et 3 sans charger tous les vols en mémoire.
+    Utile pour des historiques de plusieurs années qui ne tiennent pas en RAM.
+    """
+    try:
+        agregateur = agreger_vols(source, taille_bloc)
+    except FileNotFoundError:
+        print(f" ERREUR: La source '{source}' est introuvable.")
+        return None
+
+    print("\n--- 1. Statistiques de base (lecture en flux) ---")
+    print(f"Nombre de vols annulés : {agregateur.vols_annules}")
+    print(f"Nombre d'aéroports de départ uniques : {agregateur.departs_uniques()}")
+    print(f"Nombre d'aéroports de destination uniques : {agregateur.destinations_uniques()}")
+    print("-" * 40)
+
+    print("\n--- 2. Aéroport de départ le plus fréquenté ---")
+    print(f"L'aéroport de départ le plus emprunté est : {agregateur.aeroport_top()}")
+    print("\n--- Top 10 des destinations les plus prisées ---")
+    print(agregateur.vols_par_destination().head(10).to_string())
+    print("-" * 40)
+
+    print("\n--- 3. Nombre de destinations desservies par compagnie ---")
+    dest_par_compagnie = agregateur.destinations_par_compagnie()
+    if df_compagnies is not None:
+        noms = df_compagnies.set_index('carrier')['name']
+        dest_par_compagnie.index = dest_par_compagnie.index.map(lambda c: noms.get(c, c))
+    print(dest_par_compagnie.to_string())
+    print("-" * 40)
+    return agregateur
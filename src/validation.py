@@ -0,0 +1,183 @@
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+from src.instrumentation import etape
+
+# Une règle porte sur une colonne (ou un tuple de colonnes pour 'unique') :
+#   'non_nul'                          la valeur est renseignée
+#   'regex', motif                     la valeur respecte l'expression régulière (valeurs nulles ignorées)
+#   'plage', (min, max)                min <= valeur <= max, bornes incluses, None = pas de borne (valeurs nulles ignorées)
+#   'unique'                           pas de doublon ; seules les répétitions après la première occurrence sont en violation
+#   'reference', (table, colonne)      clé étrangère : la valeur existe dans l'autre table (valeurs nulles ignorées)
+Regle = namedtuple('Regle', ['colonnes', 'type', 'parametre'], defaults=[None])
+
+REGLES_DONNEES = {
+    'airlines': [
+        Regle('carrier', 'non_nul'),
+        Regle('carrier', 'regex', r'^[A-Z0-9]{2}$'),
+        Regle('carrier', 'unique'),
+    ],
+    'airports': [
+        Regle('faa', 'non_nul'),
+        Regle('faa', 'regex', r'^[A-Z0-9]{3,5}$'),
+        Regle('faa', 'unique'),
+        Regle('lat', 'plage', (-90, 90)),
+        Regle('lon', 'plage', (-180, 180)),
+    ],
+    'planes': [
+        Regle('tailnum', 'non_nul'),
+        Regle('tailnum', 'regex', r'^N[A-Z0-9]+$'),
+        Regle('tailnum', 'unique'),
+        Regle('year', 'plage', (1900, 2100)),
+        Regle('seats', 'plage', (0, None)),
+    ],
+    'weather': [
+        Regle(('origin', 'year', 'month', 'day', 'hour'), 'unique'),
+        Regle('origin', 'reference', ('airports', 'faa')),
+        Regle('month', 'plage', (1, 12)),
+        Regle('day', 'plage', (1, 31)),
+        Regle('hour', 'plage', (0, 23)),
+        Regle('humid', 'plage', (0, 100)),
+        Regle('wind_dir', 'plage', (0, 360)),
+    ],
+    'flights': [
+        Regle(('year', 'month', 'day', 'carrier', 'flight'), 'unique'),
+        Regle('month', 'plage', (1, 12)),
+        Regle('day', 'plage', (1, 31)),
+        Regle('hour', 'plage', (0, 24)),
+        Regle('minute', 'plage', (0, 59)),
+        Regle('carrier', 'reference', ('airlines', 'carrier')),
+        Regle('origin', 'reference', ('airports', 'faa')),
+        Regle('dest', 'reference', ('airports', 'faa')),
+        Regle('tailnum', 'reference', ('planes', 'tailnum')),
+    ],
+}
+
+
+class _Colonne:
+    """
+    Vue d'une colonne préparée une seule fois pour toutes ses règles.
+    Les colonnes de texte et catégorielles sont réduites à (codes, valeurs distinctes) : les règles
+    de valeur (regex, plage, référence) ne sont évaluées que sur les valeurs distinctes puis
+    propagées aux lignes par les codes.
+    """
+
+    def __init__(self, serie):
+        self.serie = serie
+        self.numerique = pd.api.types.is_numeric_dtype(serie) and not pd.api.types.is_bool_dtype(serie)
+        self._codes = None
+
+    def codes(self):
+        if self._codes is None:
+            if isinstance(self.serie.dtype, pd.CategoricalDtype):
+                self._codes = self.serie.cat.codes.to_numpy(), pd.Index(self.serie.cat.categories)
+            else:
+                codes, valeurs = pd.factorize(self.serie)
+                self._codes = codes, pd.Index(valeurs)
+        return self._codes
+
+    def nulle(self):
+        return self.serie.isna().to_numpy()
+
+    def violations_par_valeur(self, test_valeurs):
+        """Applique `test_valeurs` (Index -> tableau booléen de violations) aux valeurs distinctes."""
+        codes, valeurs = self.codes()
+        en_violation = np.append(np.asarray(test_valeurs(valeurs), dtype=bool), False)  # code -1 (nul) -> False
+        return en_violation[codes]
+
+
+def _evaluer(regle, table, colonnes, tables):
+    """Renvoie le masque booléen des lignes de `table` qui violent `regle`."""
+    if regle.type == 'unique':
+        cles = [regle.colonnes] if isinstance(regle.colonnes, str) else list(regle.colonnes)
+        return table.duplicated(subset=cles, keep='first').to_numpy()
+
+    colonne = colonnes[regle.colonnes]
+    if regle.type == 'non_nul':
+        return colonne.nulle()
+
+    if regle.type == 'regex':
+        return colonne.violations_par_valeur(
+            lambda valeurs: ~np.asarray(valeurs.astype(str).str.fullmatch(regle.parametre), dtype=bool))
+
+    if regle.type == 'plage':
+        minimum, maximum = regle.parametre
+
+        def hors_plage(valeurs):
+            valeurs = pd.to_numeric(pd.Series(valeurs), errors='coerce')
+            masque = np.zeros(len(valeurs), dtype=bool)
+            if minimum is not None:
+                masque |= (valeurs < minimum).fillna(False).to_numpy(dtype=bool)
+            if maximum is not None:
+                masque |= (valeurs > maximum).fillna(False).to_numpy(dtype=bool)
+            return masque
+
+        if colonne.numerique:
+            return hors_plage(colonne.serie.to_numpy())
+        return colonne.violations_par_valeur(hors_plage)
+
+    if regle.type == 'reference':
+        nom_reference, colonne_reference = regle.parametre
+        if nom_reference not in tables:
+            raise KeyError(f"Table de référence '{nom_reference}' absente pour la règle {regle}.")
+        # Recherche par table de hachage : Index.get_indexer renvoie -1 pour les valeurs absentes.
+        reference = pd.Index(tables[nom_reference][colonne_reference].dropna().astype(str).unique())
+        return colonne.violations_par_valeur(lambda valeurs: reference.get_indexer(valeurs.astype(str)) == -1)
+
+    raise ValueError(f"Type de règle inconnu : {regle.type}")
+
+
+class RapportValidation:
+    """Résultat d'une validation : une ligne par règle avec son nombre de violations et quelques exemples."""
+
+    def __init__(self, resultats, masques):
+        self.resultats = pd.DataFrame(resultats, columns=['table', 'colonnes', 'regle', 'parametre',
+                                                          'nb_violations', 'exemples'])
+        self._masques = masques
+
+    @property
+    def violations(self):
+        """Règles en échec uniquement."""
+        return self.resultats[self.resultats['nb_violations'] > 0]
+
+    def est_valide(self):
+        return self.violations.empty
+
+    def masque(self, table, colonnes, type_regle):
+        """Masque des lignes en violation pour une règle donnée (tableau booléen aligné sur la table)."""
+        return self._masques[(table, colonnes, type_regle)]
+
+    def afficher(self):
+        for ligne in self.resultats.itertuples(index=False):
+            colonnes = ', '.join(ligne.colonnes) if isinstance(ligne.colonnes, tuple) else ligne.colonnes
+            if ligne.nb_violations == 0:
+                print(f" OK   {ligne.table}.{colonnes} : {ligne.regle}")
+            else:
+                print(f" ÉCHEC {ligne.table}.{colonnes} : {ligne.regle} -> {ligne.nb_violations} violation(s), "
+                      f"ex. {ligne.exemples}")
+
+
+def valider_tables(tables, regles=REGLES_DONNEES, nb_exemples=5):
+    """
+    Évalue toutes les règles des tables fournies (dict nom -> DataFrame) et renvoie un RapportValidation.
+    Chaque colonne n'est préparée qu'une fois pour l'ensemble de ses règles. Les règles des tables
+    absentes de `tables` sont ignorées.
+    """
+    resultats, masques = [], {}
+    for nom_table, table in tables.items():
+        if table is None:
+            continue
+        with etape(f'validation {nom_table}', 'validation', lignes=len(table)):
+            colonnes = {}
+            for regle in regles.get(nom_table, []):
+                if regle.type != 'unique' and regle.colonnes not in colonnes:
+                    colonnes[regle.colonnes] = _Colonne(table[regle.colonnes])
+                masque = _evaluer(regle, table, colonnes, tables)
+                nb = int(masque.sum())
+                cibles = list(regle.colonnes) if isinstance(regle.colonnes, tuple) else [regle.colonnes]
+                exemples = table.loc[masque, cibles].head(nb_exemples).to_dict('records') if nb else []
+                resultats.append((nom_table, regle.colonnes, regle.type, regle.parametre, nb, exemples))
+                masques[(nom_table, regle.colonnes, regle.type)] = masque
+    return RapportValidation(resultats, masques)